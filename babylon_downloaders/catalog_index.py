@@ -0,0 +1,369 @@
+"""
+catalog_index.py — Índice local de catálogos de todos los sitios (SQLite FTS5).
+
+Una fila por (sitio, slug) con título, títulos alternativos, portada,
+última actualización según el sitio y el item crudo (JSON) para poder
+abrir la serie sin volver a la red. La tabla FTS5 (tokenizer trigram:
+sirve igual para chino/coreano sin espacios que para latín) se mantiene
+sincronizada con triggers.
+
+Se rellena de forma incremental con todo lo que ya pasa por el panel
+(páginas de catálogo, búsquedas remotas) y con recorridos en segundo plano
+por sitio (crawl_site), que solo se repiten cuando el índice del sitio
+tiene más de CRAWL_TTL.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from common import cache_path
+
+INDEX_DB = "catalog_index.sqlite3"
+CRAWL_TTL = 24 * 3600
+CRAWL_MAX_ITEMS = 5000
+SEARCH_LIMIT = 200
+
+# Claves habituales en los items crudos de los downloaders
+ALT_TITLE_KEYS = ("alt_titles", "aliases", "alias", "subtitle", "original_title")
+COVER_KEYS = ("cover", "cover_url", "thumb", "thumbnail", "image", "img")
+UPDATED_KEYS = ("updated", "updated_at", "update", "latest", "last_update")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS series ("
+    " site TEXT NOT NULL, slug TEXT NOT NULL, title TEXT NOT NULL,"
+    " alt_titles TEXT NOT NULL DEFAULT '', cover TEXT NOT NULL DEFAULT '',"
+    " updated TEXT NOT NULL DEFAULT '', raw TEXT NOT NULL, seen REAL NOT NULL,"
+    " PRIMARY KEY (site, slug))",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS series_fts USING fts5("
+    " title, alt_titles, slug, content='series', content_rowid='rowid',"
+    " tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS series_ai AFTER INSERT ON series BEGIN"
+    " INSERT INTO series_fts(rowid, title, alt_titles, slug)"
+    " VALUES (new.rowid, new.title, new.alt_titles, new.slug); END",
+    "CREATE TRIGGER IF NOT EXISTS series_ad AFTER DELETE ON series BEGIN"
+    " INSERT INTO series_fts(series_fts, rowid, title, alt_titles, slug)"
+    " VALUES ('delete', old.rowid, old.title, old.alt_titles, old.slug); END",
+    # Solo si cambia algo indexado: refrescar `seen` no toca el FTS
+    "CREATE TRIGGER IF NOT EXISTS series_au AFTER UPDATE OF title, alt_titles, slug"
+    " ON series BEGIN"
+    " INSERT INTO series_fts(series_fts, rowid, title, alt_titles, slug)"
+    " VALUES ('delete', old.rowid, old.title, old.alt_titles, old.slug);"
+    " INSERT INTO series_fts(rowid, title, alt_titles, slug)"
+    " VALUES (new.rowid, new.title, new.alt_titles, new.slug); END",
+    "CREATE TABLE IF NOT EXISTS crawls ("
+    " site TEXT PRIMARY KEY, ts REAL NOT NULL, items INTEGER NOT NULL,"
+    " complete INTEGER NOT NULL DEFAULT 0)",
+)
+
+_UPSERT = (
+    "INSERT INTO series (site, slug, title, alt_titles, cover, updated, raw, seen)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(site, slug) DO UPDATE SET"
+    " title = excluded.title,"
+    " alt_titles = CASE WHEN excluded.alt_titles != '' THEN excluded.alt_titles"
+    "   ELSE series.alt_titles END,"
+    " cover = CASE WHEN excluded.cover != '' THEN excluded.cover ELSE series.cover END,"
+    " updated = CASE WHEN excluded.updated != '' THEN excluded.updated"
+    "   ELSE series.updated END,"
+    " raw = excluded.raw, seen = excluded.seen"
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _first_str(raw: dict, keys: Iterable[str]) -> str:
+    for k in keys:
+        v = raw.get(k)
+        if isinstance(v, (list, tuple)):
+            v = " / ".join(str(x) for x in v if x)
+        if v:
+            return str(v).strip()
+    return ""
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Texto libre → consulta FTS5: cada palabra entre comillas (sin sintaxis
+    FTS del usuario) y todas obligatorias. None si alguna palabra tiene
+    menos de 3 caracteres (el tokenizer trigram no las encuentra).
+    """
+    words = _TOKEN_RE.findall(query)
+    if not words or any(len(w) < 3 for w in words):
+        return None
+    return " ".join('"' + w.replace('"', '""') + '"' for w in words)
+
+
+class CatalogIndex:
+    def __init__(self, db_name: str = INDEX_DB):
+        self._db_name = db_name
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_failed = False
+        self._lock = threading.Lock()
+
+    # ── SQLite (perezoso) ─────────────────────────────────────
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and not self._db_failed:
+            try:
+                db = sqlite3.connect(cache_path(self._db_name), check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                for stmt in _SCHEMA:
+                    db.execute(stmt)
+                db.commit()
+                self._db = db
+            except sqlite3.Error:
+                self._db_failed = True  # sin FTS5 o sin disco: índice desactivado
+        return self._db
+
+    @property
+    def available(self) -> bool:
+        with self._lock:
+            return self._conn() is not None
+
+    # ── escritura ─────────────────────────────────────────────
+    def upsert(self, site: str, entries: list[dict]) -> int:
+        """
+        Guarda entradas {"slug", "title", "_raw"} (formato display del panel).
+        Devuelve cuántas eran nuevas para el sitio.
+        """
+        now = time.time()
+        rows = []
+        for e in entries:
+            slug, title = str(e.get("slug") or ""), str(e.get("title") or "").strip()
+            if not slug or not title:
+                continue
+            raw = e.get("_raw") or {}
+            rows.append(
+                (
+                    site,
+                    slug,
+                    title,
+                    _first_str(raw, ALT_TITLE_KEYS),
+                    _first_str(raw, COVER_KEYS),
+                    _first_str(raw, UPDATED_KEYS),
+                    json.dumps(raw, ensure_ascii=False, default=str),
+                    now,
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return 0
+            try:
+                (before,) = db.execute(
+                    "SELECT COUNT(*) FROM series WHERE site = ?", (site,)
+                ).fetchone()
+                db.executemany(_UPSERT, rows)
+                (after,) = db.execute(
+                    "SELECT COUNT(*) FROM series WHERE site = ?", (site,)
+                ).fetchone()
+                db.commit()
+                return after - before
+            except sqlite3.Error:
+                return 0
+
+    def mark_crawled(self, site: str, items: int, complete: bool) -> None:
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO crawls (site, ts, items, complete)"
+                    " VALUES (?, ?, ?, ?)",
+                    (site, time.time(), items, int(complete)),
+                )
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    # ── lectura ───────────────────────────────────────────────
+    def last_crawl(self, site: str) -> tuple[float, bool]:
+        """(timestamp, catálogo completo) del último recorrido; (0, False) si no hubo."""
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return 0.0, False
+            row = db.execute(
+                "SELECT ts, complete FROM crawls WHERE site = ?", (site,)
+            ).fetchone()
+            return (float(row[0]), bool(row[1])) if row else (0.0, False)
+
+    def is_fresh(self, site: str, ttl: float = CRAWL_TTL) -> bool:
+        return time.time() - self.last_crawl(site)[0] < ttl
+
+    def covers(self, site: str, ttl: float = CRAWL_TTL) -> bool:
+        """Recorrido reciente y completo: una búsqueda local no se deja nada."""
+        ts, complete = self.last_crawl(site)
+        return complete and time.time() - ts < ttl
+
+    def count(self, site: Optional[str] = None) -> int:
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return 0
+            if site:
+                return db.execute(
+                    "SELECT COUNT(*) FROM series WHERE site = ?", (site,)
+                ).fetchone()[0]
+            return db.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+
+    @staticmethod
+    def _match_sql(
+        query: str, sites: Optional[Iterable[str]]
+    ) -> Optional[tuple[str, list, str]]:
+        """
+        (FROM … WHERE, sus argumentos, ORDER BY) de una búsqueda, o None si
+        no puede dar nada. search() y count_matches() comparten el filtro.
+        """
+        query = query.strip()
+        if not query:
+            return None
+        site_sql, site_args = "", []
+        if sites is not None:
+            site_list = list(sites)
+            if not site_list:
+                return None
+            site_sql = f" AND s.site IN ({','.join('?' * len(site_list))})"
+            site_args = site_list
+        match = fts_query(query)
+        if match is not None:
+            return (
+                " FROM series_fts JOIN series s ON s.rowid = series_fts.rowid"
+                f" WHERE series_fts MATCH ?{site_sql}",
+                [match, *site_args],
+                " ORDER BY (lower(s.title) = lower(?)) DESC,"
+                " bm25(series_fts, 10.0, 4.0, 1.0)",
+            )
+        # Palabras de 1-2 caracteres (p. ej. títulos chinos cortos): LIKE
+        like = "%" + query.replace("%", r"\%").replace("_", r"\_") + "%"
+        return (
+            " FROM series s WHERE (s.title LIKE ? ESCAPE '\\'"
+            f" OR s.alt_titles LIKE ? ESCAPE '\\'){site_sql}",
+            [like, like, *site_args],
+            " ORDER BY (lower(s.title) = lower(?)) DESC, length(s.title)",
+        )
+
+    def count_matches(self, query: str, sites: Optional[Iterable[str]] = None) -> int:
+        """Nº total de series que devolvería search() sin límite."""
+        parts = self._match_sql(query, sites)
+        if parts is None:
+            return 0
+        where, args, _order = parts
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return 0
+            try:
+                return db.execute(f"SELECT COUNT(*){where}", args).fetchone()[0]
+            except sqlite3.Error:
+                return 0
+
+    def search(
+        self,
+        query: str,
+        sites: Optional[Iterable[str]] = None,
+        limit: int = SEARCH_LIMIT,
+        offset: int = 0,
+    ) -> list[dict]:
+        """
+        Series de todos los sitios (o de `sites`) que contienen todas las
+        palabras de `query`: título exacto primero, luego bm25 (título pesa
+        más que alternativos, y estos más que el slug). `offset`/`limit`
+        paginan sobre ese orden.
+        Cada resultado: {"site", "slug", "title", "cover", "updated", "_raw"}.
+        """
+        parts = self._match_sql(query, sites)
+        if parts is None:
+            return []
+        where, args, order = parts
+        sql = (
+            f"SELECT s.site, s.slug, s.title, s.cover, s.updated, s.raw{where}"
+            f"{order} LIMIT ? OFFSET ?"
+        )
+        args = [*args, query.strip(), limit, max(0, offset)]
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                return []
+            try:
+                rows = db.execute(sql, args).fetchall()
+            except sqlite3.Error:
+                return []
+        out = []
+        for site, slug, title, cover, updated, raw in rows:
+            try:
+                raw_d = json.loads(raw)
+            except ValueError:
+                raw_d = {}
+            out.append(
+                {
+                    "site": site,
+                    "slug": slug,
+                    "title": title,
+                    "cover": cover,
+                    "updated": updated,
+                    "_raw": raw_d,
+                }
+            )
+        return out
+
+
+def crawl_site(
+    index: CatalogIndex,
+    site: str,
+    fetch_page: Callable[[int], tuple[list[dict], bool]],
+    max_items: int = CRAWL_MAX_ITEMS,
+    stop: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Recorre fetch_page(1), fetch_page(2)… (entradas display, hay_más) y las
+    va guardando. Para al agotar el catálogo, con max_items (0 = sin límite)
+    o si stop(); en este último caso, o si no llegó nada, no se registra el
+    recorrido.
+    Solo cuenta como completo si una página con entradas dice que no hay
+    más: una página vacía o que falla a mitad deja el recorrido incompleto
+    (covers() no lo dará por bueno y la búsqueda seguirá yendo a la red).
+    Devuelve el nº de entradas vistas.
+    """
+    seen = 0
+    page = 1
+    complete = False
+    while not max_items or seen < max_items:
+        if stop is not None and stop():
+            return seen
+        try:
+            entries, has_more = fetch_page(page)
+        except Exception:
+            break
+        if not entries:
+            break
+        index.upsert(site, entries)
+        seen += len(entries)
+        if not has_more:
+            complete = True
+            break
+        page += 1
+    if seen:  # nada (sin red, sitio caído): se reintenta en el próximo acceso
+        index.mark_crawled(site, seen, complete)
+    return seen
+
+
+_INDEX: Optional[CatalogIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> CatalogIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = CatalogIndex()
+        return _INDEX
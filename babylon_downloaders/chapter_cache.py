@@ -0,0 +1,109 @@
+"""
+chapter_cache.py — Ficha + lista de capítulos por serie, guardada en disco.
+
+Abrir una serie cuesta varias peticiones en algunos sitios (picacomic pagina
+los episodios, bakamh hace la llamada AJAX, baozimh la API de capítulos).
+Con esta caché el panel pinta al momento la última lista conocida y la
+revalida en segundo plano:
+
+  - Un JSON por (sitio, slug) con la ficha, los capítulos y su huella
+    (fingerprint): si la lista nueva tiene la misma huella no hay nada que
+    repintar.
+  - delta(): capítulos añadidos y quitados respecto a la lista guardada,
+    por clave de capítulo (id / key / url / título).
+  - Dentro de CHAPTERS_FRESH la copia se da por buena sin tocar la red.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Optional
+
+from common import load_json_cache, save_json_cache
+
+CHAPTERS_FRESH = 5 * 60
+CACHE_PREFIX = "chapters_"
+CHAPTER_KEYS = ("id", "key", "url", "href", "slug", "title")
+
+
+def series_slug(item: dict) -> str:
+    """
+    Clave de la serie en un item crudo. Si el sitio separa por modo (wfwf:
+    webtoon y manhwa comparten numeración) el modo va delante.
+    """
+    for k in ("slug", "id", "toon_id", "gid"):
+        v = item.get(k)
+        if v not in (None, ""):
+            mode = item.get("mode")
+            return f"{mode}_{v}" if mode else str(v)
+    return ""
+
+
+def chapter_key(ch: dict) -> str:
+    for k in CHAPTER_KEYS:
+        v = ch.get(k)
+        if v not in (None, ""):
+            return f"{k}:{v}"
+    return ""
+
+
+def fingerprint(chapters: list[dict]) -> str:
+    """Huella de la lista: claves y títulos en orden."""
+    h = hashlib.sha1()
+    for ch in chapters:
+        h.update(chapter_key(ch).encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(str(ch.get("title", "")).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def delta(old: list[dict], new: list[dict]) -> tuple[set[str], set[str]]:
+    """(claves añadidas, claves quitadas) de `old` a `new`."""
+    old_keys = {chapter_key(ch) for ch in old}
+    new_keys = {chapter_key(ch) for ch in new}
+    return new_keys - old_keys, old_keys - new_keys
+
+
+def _name(site: str, slug: str) -> str:
+    digest = hashlib.sha1(f"{site}\x1f{slug}".encode("utf-8")).hexdigest()[:20]
+    return f"{CACHE_PREFIX}{site}_{digest}.json"
+
+
+def load(site: str, slug: str) -> Optional[dict]:
+    """{"series", "chapters", "fingerprint", "ts"} guardado, o None."""
+    if not slug:
+        return None
+    data = load_json_cache(_name(site, slug))
+    if not data or data.get("slug") != slug:
+        return None
+    if not isinstance(data.get("chapters"), list) or not data["chapters"]:
+        return None
+    if not isinstance(data.get("series"), dict):
+        return None
+    return data
+
+
+def is_fresh(entry: dict, ttl: float = CHAPTERS_FRESH) -> bool:
+    ts = entry.get("ts")
+    return isinstance(ts, (int, float)) and time.time() - ts < ttl
+
+
+def store(site: str, slug: str, series: dict, chapters: list[dict]) -> str:
+    """Guarda ficha + capítulos; devuelve la huella ("" si no se pudo)."""
+    if not slug or not chapters:
+        return ""
+    fp = fingerprint(chapters)
+    data = {
+        "site": site,
+        "slug": slug,
+        "series": series,
+        "chapters": chapters,
+        "fingerprint": fp,
+        "ts": time.time(),
+    }
+    try:
+        return fp if save_json_cache(_name(site, slug), data) else ""
+    except (TypeError, ValueError):
+        return ""  # algún downloader mete objetos no serializables
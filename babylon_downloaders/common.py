@@ -6,15 +6,20 @@ Incluye: colores, guardado de imagen, empaquetado, worker de descarga,
 
 from __future__ import annotations
 
+import json
 import os
 import re
 import shutil
 import sys
+import threading
 import time
 import zipfile
+from collections import deque
+from contextlib import closing
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlsplit
 
 try:
     from PIL import Image
@@ -135,6 +140,408 @@ def pack_folder(src: str, out: str, fmt: Optional[str] = None) -> None:
                 zf.write(f, os.path.basename(f))
 
 
+# ══════════════════════════════════════════════════════════════
+#  CACHÉ EN DISCO
+#
+#  Misma carpeta de usuario que la app (config.USER_DATA_DIR);
+#  los downloaders no importan config para seguir siendo standalone.
+# ══════════════════════════════════════════════════════════════
+CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), "Documents", "BBSL_Proyectos", "downloaders_cache"
+)
+
+
+def cache_path(name: str) -> str:
+    """Ruta de un fichero de caché (crea la carpeta si hace falta)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_json_cache(name: str) -> Optional[dict]:
+    """Lee un JSON de la caché; None si no existe o está corrupto."""
+    try:
+        with open(os.path.join(CACHE_DIR, name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_json_cache(name: str, data: dict) -> bool:
+    """Escritura atómica (tmp + replace): nunca deja un JSON a medias."""
+    tmp = ""
+    try:
+        path = cache_path(name)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        return False
+    except (TypeError, ValueError):
+        # No serializable: fuera el tmp a medias; quien llama decide qué hacer
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# ══════════════════════════════════════════════════════════════
+#  LÍMITE DE PETICIONES
+# ══════════════════════════════════════════════════════════════
+class RateLimiter:
+    """
+    Token bucket compartido entre hilos: `rate` peticiones/s de media con
+    ráfagas de hasta `burst`. wait() reserva un hueco y duerme lo justo.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            self._tokens -= 1  # negativo = cola de espera para los siguientes
+        if delay > 0:
+            time.sleep(delay)
+
+
+HOST_RATE = 8.0
+HOST_BURST = 8
+_host_limits: dict[str, RateLimiter] = {}
+_host_limits_lock = threading.Lock()
+
+
+def host_limiter(
+    url: str, rate: float = HOST_RATE, burst: int = HOST_BURST
+) -> RateLimiter:
+    """
+    Limitador único por host (`url` puede ser la URL o el host): todas las
+    peticiones a un mismo sitio comparten cubo aunque vengan de hilos o
+    funciones distintas. rate/burst solo cuentan en la primera llamada.
+    """
+    host = urlsplit(url).netloc or url
+    with _host_limits_lock:
+        lim = _host_limits.get(host)
+        if lim is None:
+            lim = _host_limits[host] = RateLimiter(rate, burst)
+        return lim
+
+
+# ══════════════════════════════════════════════════════════════
+#  PAGINACIÓN ESPECULATIVA
+# ══════════════════════════════════════════════════════════════
+def crawl_pages(
+    fetch: Callable[[int], list],
+    pool: ThreadPoolExecutor,
+    first: int = 1,
+    last: int = 500,
+    window: int = 4,
+    max_empty: int = 3,
+) -> Iterator[tuple[int, list]]:
+    """
+    Recorre fetch(first), fetch(first+1)… pidiendo `window` páginas por
+    adelantado en `pool`, y las entrega EN ORDEN como (página, items).
+    Para tras `max_empty` páginas vacías seguidas o en `last`. El llamador
+    puede cortar antes (break): las páginas especulativas aún no empezadas
+    se cancelan.
+    """
+    pending: deque = deque()
+    nxt = first
+    empty = 0
+    try:
+        while True:
+            while nxt <= last and len(pending) < window:
+                pending.append((nxt, pool.submit(fetch, nxt)))
+                nxt += 1
+            if not pending:
+                return
+            page, fut = pending.popleft()
+            try:
+                items = fut.result() or []
+            except Exception:
+                items = []
+            if items:
+                empty = 0
+            else:
+                empty += 1
+                if empty >= max_empty:
+                    return
+            yield page, items
+    finally:
+        for _page, fut in pending:
+            fut.cancel()
+
+
+class CatalogCrawl:
+    """
+    Catálogo por páginas recorrido en segundo plano y servido mientras llega.
+
+    `sources` son funciones page → items (una por sección); se recorren en
+    orden, cada una con crawl_pages (`window` páginas en paralelo, cada
+    petición pasa por `limiter`). Una sección termina en la primera página
+    vacía o en la primera que solo repite items ya vistos (sitios que
+    ignoran ?page=N devuelven siempre la misma). Hasta la página
+    `repeat_grace` una repetida no corta: hay sitios que sirven la portada
+    otra vez como página 2.
+
+    El hilo solo avanza LOOKAHEAD items por delante de lo pedido: slice()
+    devuelve en cuanto hay bastantes y all() pide el catálogo entero.
+    Pasado TTL el recorrido se da por viejo (expired()): quien lo guarda
+    debe empezar otro para ver las novedades.
+    """
+
+    LOOKAHEAD = 100
+    TTL = 30 * 60
+
+    def __init__(
+        self,
+        sources: list[Callable[[int], list[dict]]],
+        window: int = 4,
+        max_pages: int = 500,
+        limiter: Optional[RateLimiter] = None,
+        key: str = "slug",
+        repeat_grace: int = 0,
+    ):
+        self.sources = sources
+        self.window = max(1, window)
+        self.max_pages = max_pages
+        self.limiter = limiter
+        self.key = key
+        self.repeat_grace = repeat_grace
+        self.started = time.time()
+        self.items: list[dict] = []
+        self.done = False
+        self._seen: set = set()
+        self._target = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch(self, source: Callable[[int], list[dict]], page: int) -> list[dict]:
+        if self.limiter is not None:
+            self.limiter.wait()
+        return source(page)
+
+    def _run(self) -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=self.window) as pool:
+                for source in self.sources:
+                    # closing(): al cortar, cancela las páginas especulativas
+                    # pendientes en vez de dejarlas en la cola del pool
+                    with closing(
+                        crawl_pages(
+                            lambda page, source=source: self._fetch(source, page),
+                            pool,
+                            last=self.max_pages,
+                            window=self.window,
+                            max_empty=1,
+                        )
+                    ) as pages:
+                        for page, batch in pages:
+                            with self._cond:
+                                fresh = [
+                                    it
+                                    for it in batch
+                                    if it.get(self.key) not in self._seen
+                                ]
+                                self._seen.update(it.get(self.key) for it in fresh)
+                                self.items.extend(fresh)
+                                self._cond.notify_all()
+                                while (
+                                    not self._stopped
+                                    and len(self.items) >= self._target
+                                ):
+                                    self._cond.wait()
+                                if self._stopped:
+                                    return
+                            if not fresh and page > self.repeat_grace:
+                                break  # página repetida: fin de la sección
+        finally:
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def _demand(self, n: float) -> None:
+        with self._cond:
+            self._target = max(self._target, n)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def slice(self, start: int, end: int) -> tuple[list[dict], bool]:
+        """items[start:end] en cuanto han llegado (o el recorrido terminó)."""
+        self._demand(end + self.LOOKAHEAD)
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.items) >= end or self.done)
+            return self.items[start:end], (not self.done) or end < len(self.items)
+
+    def all(self) -> list[dict]:
+        self._demand(float("inf"))
+        with self._cond:
+            self._cond.wait_for(lambda: self.done)
+            return list(self.items)
+
+    def expired(self) -> bool:
+        return time.time() - self.started > self.TTL
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+# ══════════════════════════════════════════════════════════════
+#  CATÁLOGOS INCREMENTALES
+#
+#  El catálogo completo se guarda en disco en el orden del sitio (más
+#  recientes primero). Para ponerlo al día basta con pedir páginas desde
+#  la 1 hasta la primera en la que ya se conoce todo, y anteponer esa
+#  cabeza a lo guardado: unas pocas peticiones en vez de cientos.
+# ══════════════════════════════════════════════════════════════
+CATALOG_FRESH = 10 * 60  # dentro de este plazo ni se mira la cabeza
+CATALOG_MAX_AGE = 7 * 24 * 3600  # recorrido completo: recoge bajas y reordenaciones
+HEAD_MAX_PAGES = 30  # si la cabeza no enlaza antes, se recorre entero
+
+_catalog_locks: dict[str, threading.Lock] = {}
+_catalog_locks_guard = threading.Lock()
+_revalidating: set[str] = set()
+
+
+def _item_id(item: dict):
+    return item.get("id")
+
+
+def merge_head(head: list[dict], known: list[dict], key=_item_id) -> list[dict]:
+    """La cabeza nueva (en su orden) y detrás lo guardado que no sale en ella."""
+    seen: set = set()
+    out: list[dict] = []
+    for it in head:
+        k = key(it)
+        if k not in seen:
+            seen.add(k)
+            out.append(it)
+    out.extend(it for it in known if key(it) not in seen)
+    return out
+
+
+def fetch_head(
+    fetch_page: Callable[[int], list[dict]],
+    known: set,
+    key=_item_id,
+    max_pages: int = HEAD_MAX_PAGES,
+) -> Optional[list[dict]]:
+    """
+    Páginas 1, 2… hasta la primera cuyas entradas se conocen todas (o hasta
+    que se acaba el catálogo). [] si la primera página falla; None si en
+    max_pages no se llega a lo conocido.
+    """
+    head: list[dict] = []
+    for page in range(1, max_pages + 1):
+        items = fetch_page(page)
+        if not items:
+            return head
+        head.extend(items)
+        if all(key(it) in known for it in items):
+            return head
+    return None
+
+
+def incremental_catalog(
+    name: str,
+    fetch_page: Callable[[int], list[dict]],
+    fetch_all: Callable[[], list[dict]],
+    key=_item_id,
+    sort_key: Optional[Callable[[dict], object]] = None,
+    max_pages: int = HEAD_MAX_PAGES,
+) -> list[dict]:
+    """
+    Catálogo guardado en CACHE_DIR/name, puesto al día por la cabeza:
+      - con menos de CATALOG_FRESH se devuelve tal cual, sin red;
+      - hasta CATALOG_MAX_AGE se piden solo las páginas nuevas (fetch_head);
+      - sin copia, con copia vieja o si la cabeza no enlaza: fetch_all().
+    sort_key: para catálogos que se guardan reordenados (p. ej. por título).
+    Si la red falla se devuelve la copia guardada.
+    """
+    with _catalog_locks_guard:
+        lock = _catalog_locks.setdefault(name, threading.Lock())
+    with lock:
+        data = load_json_cache(name) or {}
+        stored = data.get("items")
+        now = time.time()
+        if isinstance(stored, list) and stored:
+            full_ts = float(data.get("full_ts", 0))
+            if now - float(data.get("ts", 0)) < CATALOG_FRESH:
+                return stored
+            if now - full_ts < CATALOG_MAX_AGE:
+                head = fetch_head(fetch_page, {key(it) for it in stored}, key, max_pages)
+                if head == []:
+                    return stored
+                if head is not None:
+                    merged = merge_head(head, stored, key)
+                    if sort_key is not None:
+                        merged.sort(key=sort_key)
+                    save_json_cache(name, {"ts": now, "full_ts": full_ts, "items": merged})
+                    return merged
+        items = fetch_all()
+        if items:
+            save_json_cache(name, {"ts": now, "full_ts": now, "items": items})
+            return items
+        return stored if isinstance(stored, list) else []
+
+
+def stored_catalog(name: str) -> Optional[list[dict]]:
+    """Copia en disco de incremental_catalog, sin tocar la red (None si no hay)."""
+    items = (load_json_cache(name) or {}).get("items")
+    return items if isinstance(items, list) and items else None
+
+
+def catalog_swr(
+    name: str,
+    load: Callable[[], list[dict]],
+    on_update: Optional[Callable[[list[dict]], None]] = None,
+) -> list[dict]:
+    """
+    Stale-while-revalidate: devuelve al momento la copia en disco y ejecuta
+    load() (normalmente incremental_catalog sobre `name`) en un hilo; si
+    trae algo distinto llama a on_update(items) desde ese hilo. Sin copia,
+    load() en el acto. Una sola revalidación en curso por catálogo.
+    """
+    stored = stored_catalog(name)
+    if stored is None:
+        return load()
+    with _catalog_locks_guard:
+        if name in _revalidating:
+            return stored
+        _revalidating.add(name)
+
+    def _run() -> None:
+        try:
+            items = load()
+        except Exception:
+            items = None
+        finally:
+            with _catalog_locks_guard:
+                _revalidating.discard(name)
+        if items and items != stored and on_update is not None:
+            on_update(items)
+
+    threading.Thread(target=_run, name=f"swr-{name}", daemon=True).start()
+    return stored
+
+
 # ══════════════════════════════════════════════════════════════
 #  RUNNER GENÉRICO DE DESCARGA
 #
@@ -271,12 +678,22 @@ class BaseDownloader:
         Los downloaders con paginación real en el servidor lo sobreescriben.
         """
         cache_key = repr(sorted(kwargs.items()))
-        if getattr(self, "_cat_buf_key", None) != cache_key:
-            self._cat_buf: list[dict] = self.get_catalog(**kwargs)
-            self._cat_buf_key: str = cache_key
+        with self.catalog_lock():
+            if getattr(self, "_cat_buf_key", None) != cache_key:
+                self._cat_buf: list[dict] = self.get_catalog(**kwargs)
+                self._cat_buf_key: str = cache_key
+            buf = self._cat_buf
         start = (page - 1) * page_size
         end = start + page_size
-        return self._cat_buf[start:end], end < len(self._cat_buf)
+        return buf[start:end], end < len(buf)
+
+    def catalog_lock(self) -> threading.Lock:
+        """
+        Lock del buffer de catálogo de esta instancia: el panel pide páginas
+        desde varios hilos (carga, prefetch) sobre el mismo downloader.
+        """
+        # dict.setdefault es atómico: no hace falta __init__ en las subclases
+        return self.__dict__.setdefault("_cat_lock", threading.Lock())
 
     def get_referer(self, chapter: dict, series: dict) -> str:
         return ""
@@ -11,7 +11,8 @@ from urllib.parse import quote, urljoin
 
 import requests
 from bs4 import BeautifulSoup
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, CatalogCrawl, host_limiter
+from htmlparse import document, first, img_src, text
 
 SITE_URL = "https://18mh.org"
 REQUEST_DELAY = 0.4
@@ -29,6 +30,12 @@ _BASE_HEADERS = {
     "Referer": f"{SITE_URL}/",
 }
 
+# Catálogo: CATALOG_WINDOW páginas a la vez por sección. El sitio suele
+# ignorar ?page=N; la primera página repetida cierra la sección.
+CATALOG_PAGES = 50
+CATALOG_WINDOW = 2
+_CATALOG_LIMIT = host_limiter(SITE_URL, rate=4, burst=4)
+
 _EXCLUDE_IMG = ("/logo", "/icon", "/ads", "ad/", "cover/", "avatar", ".gif")
 
 
@@ -78,19 +85,52 @@ def _soup(html: str) -> BeautifulSoup:
 # ── Scraping ──────────────────────────────────────────────────────────────────
 
 
+_CARD_HREF_RE = re.compile(r"/manga/([^/?#]+)/?$")
+_RECO_KEYWORDS = ("您可能喜歡", "猜你喜歡", "推荐", "推薦")
+
+
 def _parse_cards(html: str) -> list[dict]:
+    doc = document(html)
+    if doc is None:
+        return _parse_cards_bs4(html)
+    # Destruir sección de recomendados
+    for h in list(doc.iter("h2", "h3")):
+        if any(kw in text(h) for kw in _RECO_KEYWORDS):
+            p = h.getparent()
+            (p if p is not None and p.tag == "div" else h).drop_tree()
+
+    results, seen = [], set()
+    for a in doc.iter("a"):
+        href = a.get("href")
+        if href is None or not _CARD_HREF_RE.search(href):
+            continue
+        slug = href.rstrip("/").split("/")[-1]
+        if slug in seen or slug == "get":
+            continue
+        h3 = first(a, "(.//*[self::h3 or self::h4 or self::p or self::span])[1]")
+        h3_text = text(h3) if h3 is not None else ""
+        img = first(a, "(.//img)[1]")
+        if h3_text:
+            title = h3_text
+        else:
+            title = img.get("alt", slug) if img is not None else slug
+        seen.add(slug)
+        results.append(
+            {"id": slug, "slug": slug, "title": title, "cover": img_src(img, SITE_URL)}
+        )
+    return results
+
+
+def _parse_cards_bs4(html: str) -> list[dict]:
     soup = _soup(html)
     # Destruir sección de recomendados
     for h in soup.find_all(["h2", "h3"]):
-        if any(
-            kw in h.get_text(strip=True)
-            for kw in ["您可能喜歡", "猜你喜歡", "推荐", "推薦"]
-        ):
+        if any(kw in h.get_text(strip=True) for kw in _RECO_KEYWORDS):
             p = h.parent
             (p if p and p.name == "div" else h).decompose()
 
     results, seen = [], set()
-    for a in soup.find_all("a", href=re.compile(r"/manga/([^/?#]+)/?$")):
+    for a in soup.find_all("a", href=_CARD_HREF_RE):
         href = a.get("href", "").rstrip("/")
         slug = href.split("/")[-1]
         if slug in seen or slug == "get":
@@ -105,7 +145,9 @@ def _parse_cards(html: str) -> list[dict]:
             else slug
         )
         seen.add(slug)
-        results.append({"id": slug, "slug": slug, "title": title})
+        results.append(
+            {"id": slug, "slug": slug, "title": title, "cover": img_src(img, SITE_URL)}
+        )
     return results
 
 
@@ -236,66 +278,34 @@ class Downloader18mh(BaseDownloader):
     def search(self, query: str) -> list[dict]:
         return _search(self._sess, query)
 
-    def get_catalog(self, max_pages: int = 50) -> list[dict]:
-        results, seen = [], set()
-        for section in self.CATALOG_SECTIONS:
-            page = 1
-            while page <= max_pages:
-                cards = _get_catalog_page(self._sess, f"/{section}", page)
-                if not cards:
-                    break
-                added = 0
-                for c in cards:
-                    if c["slug"] not in seen:
-                        seen.add(c["slug"])
-                        results.append(c)
-                        added += 1
-                if added == 0:
-                    break
-                page += 1
-        return results
+    def _catalog_crawl(self, max_pages: int = CATALOG_PAGES) -> CatalogCrawl:
+        return CatalogCrawl(
+            [
+                lambda page, path=f"/{section}": _get_catalog_page(self._sess, path, page)
+                for section in self.CATALOG_SECTIONS
+            ],
+            window=CATALOG_WINDOW,
+            max_pages=max_pages,
+            limiter=_CATALOG_LIMIT,
+        )
+
+    def get_catalog(self, max_pages: int = CATALOG_PAGES) -> list[dict]:
+        return self._catalog_crawl(max_pages).all()
 
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
     ) -> tuple[list, bool]:
-        """Carga el catálogo progresivamente: sección a sección, página a página."""
-        secs = list(self.CATALOG_SECTIONS.keys())
-        key = "18mh_all"
-        if getattr(self, "_cat_buf_key", None) != key:
-            self._cat_buf = []
-            self._cat_buf_key = key
-            self._cat_sec_idx = 0
-            self._cat_sec_pg = 0
-            self._cat_exhausted = False
-            self._cat_seen = set()
-
+        """Catálogo sección a sección, servido mientras se recorre en 2º plano."""
+        with self.catalog_lock():
+            crawl = getattr(self, "_crawl", None)
+            # Recorrido viejo: se rehace al volver a la página 1, nunca a
+            # mitad de paginar (los offsets cambiarían bajo los pies)
+            if crawl is None or (page == 1 and crawl.expired()):
+                if crawl is not None:
+                    crawl.stop()
+                crawl = self._crawl = self._catalog_crawl()
         start = (page - 1) * page_size
-        end = start + page_size
-
-        while len(self._cat_buf) < end and not self._cat_exhausted:
-            idx = self._cat_sec_idx
-            if idx >= len(secs):
-                self._cat_exhausted = True
-                break
-            self._cat_sec_pg += 1
-            cards = _get_catalog_page(self._sess, f"/{secs[idx]}", self._cat_sec_pg)
-            if not cards:
-                self._cat_sec_idx += 1
-                self._cat_sec_pg = 0
-            else:
-                added = 0
-                for c in cards:
-                    if c["slug"] not in self._cat_seen:
-                        self._cat_seen.add(c["slug"])
-                        self._cat_buf.append(c)
-                        added += 1
-                if added == 0:
-                    self._cat_sec_idx += 1
-                    self._cat_sec_pg = 0
-
-        chunk = self._cat_buf[start:end]
-        has_more = (not self._cat_exhausted) or (end < len(self._cat_buf))
-        return chunk, has_more
+        return crawl.slice(start, start + page_size)
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
         slug = item.get("slug") or item.get("id", "")
@@ -8,13 +8,14 @@ from __future__ import annotations
 import re
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from urllib.parse import parse_qs, urlparse
 
 import requests
 from bs4 import BeautifulSoup
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, incremental_catalog
+from htmlparse import document, text
 
 SITE_ORG = "https://baozimh.org"
 COM_MIRRORS = [
@@ -207,25 +208,19 @@ def fetch_catalog_api(
     if len(first) < 36:
         return all_items
 
+    def _page(pg: int) -> list[dict]:
+        return _fetch_api_page(sess_com, mirror, type_, region, state, pg)
+
+    # Lotes en paralelo, añadidos en orden de página: el catálogo guardado
+    # conserva el orden del sitio (lo necesita incremental_catalog)
     page = 2
-    empty = False
-    while not empty:
-        batch = list(range(page, page + workers))
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            futs = {
-                pool.submit(
-                    _fetch_api_page, sess_com, mirror, type_, region, state, pg
-                ): pg
-                for pg in batch
-            }
-            for fut in as_completed(futs):
-                items = fut.result()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for items in pool.map(_page, range(page, page + workers)):
                 if not items:
-                    empty = True
-                else:
-                    _add(items)
-        page += workers
-    return all_items
+                    return all_items
+                _add(items)
+            page += workers
 
 
 # ── Search (baozimh.org) ──────────────────────────────────────────────────────
@@ -293,12 +288,24 @@ def _resolve_com_slug(
     return org_slug
 
 
+_PAGE_DIRECT_RE = re.compile(r"page_direct")
+
+
+def _chapter_links(html: str):
+    """(href, título) de cada enlace page_direct; lxml o, sin él, BS4."""
+    doc = document(html)
+    if doc is None:
+        for a in _soup(html).find_all("a", href=_PAGE_DIRECT_RE):
+            yield a.get("href", ""), a.get_text(strip=True)
+        return
+    for a in doc.xpath("//a[contains(@href, 'page_direct')]"):
+        yield a.get("href"), text(a)
+
+
 def _parse_com_chapters(html: str, slug: str) -> list[dict]:
-    soup = _soup(html)
     chapters = []
     seen: set = set()
-    for a in soup.find_all("a", href=re.compile(r"page_direct")):
-        href = a.get("href", "")
+    for href, title in _chapter_links(html):
         if _NAV_HREFS.search(href):
             continue
         qs = parse_qs(urlparse(href).query)
@@ -307,7 +314,6 @@ def _parse_com_chapters(html: str, slug: str) -> list[dict]:
         cs = qs.get("chapter_slot", ["-1"])[0]
         if cs == "-1":
             continue
-        title = a.get_text(strip=True)
         if not title or title in _SKIP_TITLES:
             continue
         key = f"{ss}_{cs}"
@@ -475,7 +481,11 @@ class DownloaderBaozimh(BaseDownloader):
         self, type_: str = "all", region: str = "all", state: str = "all"
     ) -> list[dict]:
         mirror = self._mirror or COM_MIRRORS[0]
-        return fetch_catalog_api(self._sess_com, mirror, type_, region, state)
+        return incremental_catalog(
+            f"baozimh_catalog_{type_}_{region}_{state}.json",
+            lambda pg: _fetch_api_page(self._sess_com, mirror, type_, region, state, pg),
+            lambda: fetch_catalog_api(self._sess_com, mirror, type_, region, state),
+        )
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
         slug = item.get("slug") or item.get("id", "")
@@ -9,12 +9,15 @@ import base64
 import json
 import re
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, TypedDict
+from typing import Callable, Iterator, Optional
 
 import requests
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, crawl_pages, host_limiter
+from packer import unpack_script
+from xorcrypt import SeedStore, iter_decrypted
 
 BASE_URL = "https://dumanwu.com"
 TIMEOUT = (15, 45)
@@ -88,6 +91,11 @@ _DW_SORTS = {
     15: "连载",
     16: "完结",
 }
+# Catálogo completo: categorías en paralelo y, dentro de cada una, páginas
+# /sortmore pedidas por adelantado; todo bajo un único límite para el host.
+SORT_WORKERS = 4
+SORT_WINDOW = 4
+_HOST_LIMIT = host_limiter(BASE_URL)
 
 
 # ── Session ───────────────────────────────────────────────────────────────────
@@ -105,7 +113,8 @@ def _make_session() -> requests.Session:
 # ── Seeds (XOR) ───────────────────────────────────────────────────────────────
 
 
-def load_seeds(sess: requests.Session) -> list[bytes]:
+def fetch_seeds(sess: requests.Session) -> list[bytes]:
+    """Semillas de all2.js; [] si no se pueden extraer (el store pone las hardcoded)."""
     js_urls: list[str] = []
     try:
         r = sess.get(f"{BASE_URL}/", timeout=8)
@@ -136,56 +145,14 @@ def load_seeds(sess: requests.Session) -> list[bytes]:
         except Exception:
             continue
 
-    seeds = []
-    for h in _SEEDS_FALLBACK_HEX:
-        try:
-            seeds.append(bytes.fromhex(h))
-        except Exception:
-            pass
-    return seeds
-
-
-# ── Decryption ────────────────────────────────────────────────────────────────
-
-_B62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-
-
-def _b62_int(token: str, base: int = 62) -> int:
-    chars = _B62[:base] if base <= 62 else _B62
-    n = 0
-    try:
-        for ch in token:
-            n = n * base + chars.index(ch)
-    except ValueError:
-        return -1
-    return n
-
-
-def _decode_packer(p: str, base: int, k_str: str) -> str:
-    keys = k_str.split("|")
+    return []
 
-    def replace(m: re.Match) -> str:
-        idx = _b62_int(m.group(0), base)
-        return keys[idx] if 0 <= idx < len(keys) and keys[idx] else m.group(0)
 
-    return re.sub(r"\b[0-9A-Za-z]+\b", replace, p)
+# Persistidas en disco: el primer capítulo no espera a home + all2.js
+SEEDS = SeedStore("dumanwu", lambda: fetch_seeds(_make_session()), _SEEDS_FALLBACK_HEX)
 
 
-def _extract_packer_args(script: str):
-    try:
-        start = script.rindex("}(") + 2
-        args = script[start:]
-        parts = re.findall(r"'((?:[^'\\]|\\.)*)'|(\d+)", args)
-        vals = [int(n) if n else s for s, n in parts]
-        if len(vals) >= 4:
-            return str(vals[0]), int(vals[1]), int(vals[2]), str(vals[3])
-    except (ValueError, IndexError):
-        pass
-    return None
-
-
-def _xor(data: bytes, key: bytes) -> bytes:
-    return bytes(data[i] ^ key[i % len(key)] for i in range(len(data)))
+# ── Decryption ────────────────────────────────────────────────────────────────
 
 
 def decrypt_images(html: str, seeds: list[bytes]) -> list[str]:
@@ -195,28 +162,23 @@ def decrypt_images(html: str, seeds: list[bytes]) -> list[str]:
     for script in scripts:
         if "eval(function(p,a,c,k,e,d)" not in script:
             continue
-        args = _extract_packer_args(script)
-        if not args:
+        decoded = unpack_script(script)
+        if decoded is None:
             continue
-        p, base, _count, k = args
-        decoded = _decode_packer(p, base, k)
-        
+
         # Regex v5.5: Captura base64 con o sin asignación var
         matches = re.findall(r'["\']([A-Za-z0-9+/]{100,})["\']', decoded)
         if not matches:
             matches = re.findall(r'=\s*["\']?([A-Za-z0-9+/]{100,})', decoded)
-            
+
         for match_val in matches:
             try:
                 pad = (4 - len(match_val) % 4) % 4
                 raw = base64.b64decode(match_val + "=" * pad)
             except Exception:
                 continue
-            for seed in seeds:
-                try:
-                    xored = _xor(raw, seed)
-                    pad2 = (4 - len(xored) % 4) % 4
-                    final = base64.b64decode(xored + b"=="[:pad2]).decode("utf-8", errors="ignore")
+            # Solo llegan aquí las semillas que pasan el chequeo de prefijo
+            for final in iter_decrypted(raw, seeds):
                 if "http" not in final:
                     continue
                 try:
@@ -236,8 +198,6 @@ def decrypt_images(html: str, seeds: list[bytes]) -> list[str]:
                 ]
                 if urls2:
                     return urls2
-            except Exception:
-                continue
     return []
 
 
@@ -249,9 +209,7 @@ def _cap_sort_key(cap: dict) -> float:
     return float(m.group(1)) if m else 0.0
 
 
-def _parse_series_page(
-    sess: requests.Session, slug: str, seeds: list[bytes]
-) -> tuple[dict, list[dict]]:
+def _parse_series_page(sess: requests.Session, slug: str) -> tuple[dict, list[dict]]:
     url = f"{BASE_URL}/{slug}/"
     r = sess.get(url, timeout=15)
     if r.status_code != 200:
@@ -307,7 +265,7 @@ def _parse_series_page(
 
 
 def _get_chapter_images(
-    sess: requests.Session, chap_url: str, series_slug: str, seeds: list[bytes]
+    sess: requests.Session, chap_url: str, series_slug: str
 ) -> list[str]:
     referer = f"{BASE_URL}/{series_slug}/"
     html = None
@@ -323,7 +281,7 @@ def _get_chapter_images(
         time.sleep(1.5)
     if not html:
         return []
-    urls = decrypt_images(html, seeds)
+    urls = SEEDS.decrypt(lambda seeds: decrypt_images(html, seeds))
     if urls:
         return [
             u
@@ -373,6 +331,7 @@ def _parse_series_html(html: str) -> list[dict]:
 
 
 def _sortmore(sess: requests.Session, type_id: int, page: int) -> list[dict]:
+    _HOST_LIMIT.wait()
     try:
         r = sess.post(
             f"{BASE_URL}/sortmore",
@@ -405,51 +364,81 @@ def _sortmore(sess: requests.Session, type_id: int, page: int) -> list[dict]:
         return []
 
 
-def _load_sort(sess: requests.Session, sort_id: int) -> list[dict]:
-    items: list[dict] = []
-    seen: set = set()
+def _sort_first_page(sess: requests.Session, sort_id: int) -> list[dict]:
+    _HOST_LIMIT.wait()
     try:
         r = sess.get(f"{BASE_URL}/sort/{sort_id}", timeout=15, headers=HEADERS)
         if r.status_code == 200:
-            for it in _parse_series_html(r.text):
-                if it["slug"] not in seen:
-                    seen.add(it["slug"])
-                    items.append(it)
+            return _parse_series_html(r.text)
     except Exception:
         pass
-    page, consecutive_empty = 2, 0
-    while page <= 500:
-        more = _sortmore(sess, sort_id, page)
-        if not more:
-            consecutive_empty += 1
-            if consecutive_empty >= 3:
-                break
-            page += 1
-            continue
-        consecutive_empty = 0
-        added = 0
-        for it in more:
+    return []
+
+
+def _sort_batches(
+    sess: requests.Session, sort_id: int, pool: ThreadPoolExecutor
+) -> Iterator[list[dict]]:
+    """
+    Series nuevas de /sort/{sort_id}, lote a lote y en orden de página:
+    /sort/N y luego /sortmore 2, 3… (SORT_WINDOW por adelantado). Termina
+    tras 3 páginas vacías seguidas o con una que no aporta nada nuevo.
+    """
+    seen: set = set()
+
+    def _fresh(batch: list[dict]) -> list[dict]:
+        out = []
+        for it in batch:
             if it["slug"] not in seen:
                 seen.add(it["slug"])
-                items.append(it)
-                added += 1
-        if added == 0:
+                out.append(it)
+        return out
+
+    first = _fresh(_sort_first_page(sess, sort_id))
+    if first:
+        yield first
+    for _page, more in crawl_pages(
+        lambda page: _sortmore(sess, sort_id, page), pool, first=2, window=SORT_WINDOW
+    ):
+        if not more:
+            continue
+        fresh = _fresh(more)
+        if not fresh:
             break
-        page += 1
-        time.sleep(0.1)
-    return items
+        yield fresh
 
 
-def load_full_catalog(sess: requests.Session) -> list[dict]:
+def load_full_catalog(
+    sess: requests.Session,
+    on_batch: Optional[Callable[[list[dict]], None]] = None,
+) -> list[dict]:
+    """
+    Todas las categorías a la vez (SORT_WORKERS), deduplicando según llegan
+    los lotes. on_batch(nuevas) recibe cada lote ya deduplicado.
+    """
     all_items: list[dict] = []
     seen: set = set()
-    for sort_id, sort_name in _DW_SORTS.items():
-        sys.stdout.write(f"  [{sort_id}/{len(_DW_SORTS)}] {sort_name}…\r")
-        sys.stdout.flush()
-        for it in _load_sort(sess, sort_id):
-            if it["slug"] not in seen:
-                seen.add(it["slug"])
-                all_items.append(it)
+    lock = threading.Lock()
+
+    def _run(sort_id: int) -> int:
+        for batch in _sort_batches(sess, sort_id, page_pool):
+            with lock:
+                fresh = [it for it in batch if it["slug"] not in seen]
+                seen.update(it["slug"] for it in fresh)
+                all_items.extend(fresh)
+            if fresh and on_batch:
+                on_batch(fresh)
+        return sort_id
+
+    with ThreadPoolExecutor(max_workers=SORT_WORKERS * SORT_WINDOW) as page_pool:
+        with ThreadPoolExecutor(max_workers=SORT_WORKERS) as sort_pool:
+            futs = [sort_pool.submit(_run, sid) for sid in _DW_SORTS]
+            for done, fut in enumerate(as_completed(futs), 1):
+                sort_id = fut.result()
+                sys.stdout.write(
+                    f"  [{done}/{len(_DW_SORTS)}] {_DW_SORTS[sort_id]} — "
+                    f"{len(all_items)} total…\r"
+                )
+                sys.stdout.flush()
     print(f"  ✔ {len(all_items)} series cargadas   ")
     return all_items
 
@@ -492,9 +481,8 @@ class DownloaderDumanwu(BaseDownloader):
 
     def __init__(self):
         self._sess = _make_session()
-        print("  Cargando semillas XOR…", end=" ", flush=True)
-        self._seeds = load_seeds(self._sess)
-        print(f"{len(self._seeds)} semillas")
+        seeds = SEEDS.get()
+        print(f"  {len(seeds)} semillas XOR ({SEEDS.source})")
 
     def search(self, query: str) -> list[dict]:
         return _search(self._sess, query)
@@ -504,14 +492,14 @@ class DownloaderDumanwu(BaseDownloader):
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
         slug = item.get("slug") or item.get("id", "")
-        return _parse_series_page(self._sess, slug, self._seeds)
+        return _parse_series_page(self._sess, slug)
 
     def get_chapter_images(self, chapter: dict, series: dict) -> list[str]:
         url = chapter.get("url", "")
         slug = series.get("slug", series.get("id", ""))
         if not url:
             url = f"{BASE_URL}/{slug}/{chapter.get('id', '')}.html"
-        return _get_chapter_images(self._sess, url, slug, self._seeds)
+        return _get_chapter_images(self._sess, url, slug)
 
     def dl_image(self, url: str, referer: str = "") -> Optional[bytes]:
         for attempt in range(3):
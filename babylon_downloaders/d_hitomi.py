@@ -7,15 +7,20 @@ solo galerías con un ID numérico.
 
 from __future__ import annotations
 
+import json
 import re
-import struct
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import filterfalse
+from typing import Iterable, Optional
 
 import requests
 from common import CFG, BaseDownloader
+from hitomi_store import CONTENT_RANGE_RE, MetaCache, grows_at_front, mirror_fetch
+
+CDN = "https://ltn.gold-usergeneratedcontent.net"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -87,23 +92,100 @@ class HitomiGG:
 # ── Nozomi (binary index) ─────────────────────────────────────────────────────
 
 
-def _nozomi_ids(sess: requests.Session, url: str) -> list[int]:
+# Los .nozomi son arrays planos de uint32 big-endian. Se decodifican de una
+# vez con array + byteswap (sin struct.unpack por ID): ~100x más rápido y
+# 4 bytes por ID en memoria en vez de un int de Python en una lista.
+_ID_CODE = "I" if array("I").itemsize == 4 else "L"
+_SWAP = sys.byteorder == "little"
+
+
+def decode_nozomi(data: bytes) -> array:
+    ids = array(_ID_CODE)
+    ids.frombytes(memoryview(data)[: len(data) // 4 * 4])
+    if _SWAP:
+        ids.byteswap()
+    return ids
+
+
+def _answered_ids(sess: requests.Session, url: str) -> Optional[array]:
+    """
+    IDs del índice; vacío si el servidor respondió que no hay nada (404,
+    fichero vacío) y None si no hubo respuesta (red, 5xx).
+    """
+    # Índices que solo crecen por delante: espejo local incremental
+    if grows_at_front(url):
+        data = mirror_fetch(sess, url)
+        if data is None:
+            return None
+        return decode_nozomi(data) if data else array(_ID_CODE)
     try:
         r = sess.get(url, timeout=30)
-        if r.status_code != 200 or len(r.content) < 4:
-            return []
-        data = r.content
-        # IDs como unsigned int32 big-endian
-        return [
-            struct.unpack(">I", data[i * 4 : (i + 1) * 4])[0]
-            for i in range(len(data) // 4)
-        ]
     except Exception:
-        return []
+        return None
+    if r.status_code == 404:
+        return array(_ID_CODE)
+    if r.status_code != 200:
+        return None
+    return decode_nozomi(r.content) if len(r.content) >= 4 else array(_ID_CODE)
+
+
+def _nozomi_ids(sess: requests.Session, url: str) -> array:
+    ids = _answered_ids(sess, url)
+    return array(_ID_CODE) if ids is None else ids
+
+
+def nozomi_range(
+    sess: requests.Session, url: str, start: int, end: int
+) -> tuple[array, int]:
+    """
+    IDs [start, end) de un índice nozomi con un único Range request
+    (cada ID ocupa 4 bytes, una página es un rango fijo de bytes).
+    Devuelve (ids, total_de_ids_del_índice); total = -1 si el índice no
+    existe o el servidor no lo indica.
+    """
+    empty = array(_ID_CODE)
+    if end <= start:
+        return empty, -1
+    try:
+        r = sess.get(
+            url, headers={"Range": f"bytes={start * 4}-{end * 4 - 1}"}, timeout=15
+        )
+    except Exception:
+        return empty, -1
+    if r.status_code in (206, 416):  # 416: página más allá del final
+        m = CONTENT_RANGE_RE.search(r.headers.get("Content-Range", ""))
+        total = int(m.group(1)) // 4 if m else -1
+        return (decode_nozomi(r.content) if r.status_code == 206 else empty), total
+    if r.status_code == 200:  # el servidor ignoró el Range: vino entero
+        ids = decode_nozomi(r.content)
+        return ids[start:end], len(ids)
+    return empty, -1
+
+
+def intersect_ids(id_lists: list[array]) -> set[int]:
+    """
+    Intersección empezando por el índice más pequeño: solo ese se convierte
+    en set; el resto se recorre en C contra él (set.intersection con un
+    iterable no construye un set intermedio del índice grande).
+    """
+    if not id_lists:
+        return set()
+    ordered = sorted(id_lists, key=len)
+    acc = set(ordered[0])
+    for ids in ordered[1:]:
+        if not acc:
+            break
+        acc = acc.intersection(ids)
+    return acc
+
+
+def filter_ordered(ids: Iterable[int], keep: set[int]) -> list[int]:
+    """Elementos de `ids` presentes en `keep`, en el orden de `ids` (bucle en C)."""
+    return list(filter(keep.__contains__, ids))
 
 
 def _term_url(term: str) -> str:
-    base = "https://ltn.gold-usergeneratedcontent.net"
+    base = CDN
     term = term.replace("_", " ").strip()
     if ":" in term:
         ns, v = term.split(":", 1)
@@ -115,126 +197,167 @@ def _term_url(term: str) -> str:
     return f"{base}/n/tag/{term}-all.nozomi"
 
 
+# Orden del catálogo → índice nozomi ({lang} = idioma)
+ORDER_INDEX = {
+    "default": "index-{lang}.nozomi",
+    "date_published": "date-published-index-{lang}.nozomi",
+    "pop_today": "popular/today-index-{lang}.nozomi",
+    "pop_week": "popular/week-index-{lang}.nozomi",
+    "pop_month": "popular/month-index-{lang}.nozomi",
+    "pop_year": "popular/year-index-{lang}.nozomi",
+    "random": "index-{lang}.nozomi",
+}
+
+
+def order_url(language: str = "all", order: str = "default") -> str:
+    path = ORDER_INDEX.get(order, ORDER_INDEX["default"])
+    return f"{CDN}/{path.format(lang=language)}"
+
+
+def _catalog_urls(language: str, order: str) -> list[str]:
+    """Índice del orden pedido + alternativas si ese no existe."""
+    urls = [order_url(language, order)]
+    for alt in (f"{CDN}/index-{language}.nozomi", f"{CDN}/n/index-{language}.nozomi"):
+        if alt not in urls:
+            urls.append(alt)
+    return urls
+
+
 def fetch_catalog_ids(
     sess: requests.Session,
     language: str = "all",
     sort_terms: Optional[list[str]] = None,
-) -> list[int]:
-    base = "https://ltn.gold-usergeneratedcontent.net"
-    ids = _nozomi_ids(sess, f"{base}/index-{language}.nozomi")
+) -> array:
+    ids = _nozomi_ids(sess, f"{CDN}/index-{language}.nozomi")
     if not ids:
-        ids = _nozomi_ids(sess, f"{base}/n/index-{language}.nozomi")
+        ids = _nozomi_ids(sess, f"{CDN}/n/index-{language}.nozomi")
     if ids and sort_terms:
-        ids = _apply_sort(sess, ids, sort_terms)
+        return array(_ID_CODE, _apply_sort(sess, ids, sort_terms))
     return ids
 
 
+TERM_WORKERS = 8
+
+
+def _fetch_answered(
+    sess: requests.Session, terms: list[str]
+) -> dict[str, Optional[array]]:
+    """Índices de todos los términos a la vez (uno por hilo, sin repetir);
+    None para los que no obtuvieron respuesta."""
+    uniq = list(dict.fromkeys(terms))
+    if not uniq:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(TERM_WORKERS, len(uniq))) as exe:
+        found = exe.map(lambda t: _answered_ids(sess, _term_url(t)), uniq)
+        return dict(zip(uniq, found))
+
+
+def fetch_terms(sess: requests.Session, terms: list[str]) -> dict[str, array]:
+    """Como _fetch_answered, con índice vacío para los que fallaron."""
+    return {
+        t: array(_ID_CODE) if ids is None else ids
+        for t, ids in _fetch_answered(sess, terms).items()
+    }
+
+
 def _apply_sort(
-    sess: requests.Session, base_ids: list[int], sort_terms: list[str]
+    sess: requests.Session,
+    base_ids: Iterable[int],
+    sort_terms: list[str],
+    indexes: Optional[dict[str, array]] = None,
 ) -> list[int]:
     if not sort_terms:
-        return base_ids
-    base_set = set(base_ids)
-    sort_ordered = _nozomi_ids(sess, _term_url(sort_terms[0]))
-    for extra in sort_terms[1:]:
-        extra_set = {
-            struct.unpack(">i", r.content[i * 4 : (i + 1) * 4])[0]
-            for r in [sess.get(_term_url(extra), timeout=15)]
-            if r.status_code == 200
-            for i in range(len(r.content) // 4)
-        }
-        sort_ordered = [i for i in sort_ordered if i in extra_set]
-    seen: set = set()
-    result: list[int] = []
-    for gid in sort_ordered:
-        if gid in base_set:
-            result.append(gid)
-            seen.add(gid)
-    for gid in base_ids:
-        if gid not in seen:
-            result.append(gid)
-    return result
+        return list(base_ids)
+    if indexes is None or any(t not in indexes for t in sort_terms):
+        indexes = fetch_terms(sess, sort_terms)
+    base_set = base_ids if isinstance(base_ids, set) else set(base_ids)
+    sort_ordered = indexes[sort_terms[0]]
+    # Términos extra del orden: restringen qué IDs se adelantan
+    extras = [indexes[t] for t in sort_terms[1:]]
+    allowed = intersect_ids([*extras, base_set]) if extras else base_set
+    head = filter_ordered(sort_ordered, allowed)
+    seen = set(head)
+    return head + list(filterfalse(seen.__contains__, base_ids))
+
+
+def search_terms(
+    sess: requests.Session, query: str, sort_terms: Optional[list[str]] = None
+) -> tuple[list[int], list[str]]:
+    """
+    (IDs, términos_fallidos). Todos los índices (búsqueda + orden) se piden
+    en paralelo; la intersección empieza por el más pequeño. Solo un término
+    SIN RESPUESTA de la red se omite de la intersección (y se devuelve en
+    términos_fallidos para que la UI lo muestre); uno que respondió vacío
+    (errata, tag sin galerías, 404) sí cuenta y deja el resultado vacío.
+    """
+    parts = list(dict.fromkeys(query.split()))
+    if not parts:
+        return [], []
+    sort_terms = sort_terms or []
+    answered = _fetch_answered(sess, parts + sort_terms)
+    failed = [t for t, ids in answered.items() if ids is None]
+    indexes = {
+        t: array(_ID_CODE) if ids is None else ids for t, ids in answered.items()
+    }
+    usable = [indexes[p] for p in parts if answered[p] is not None]
+    if not usable:
+        return [], failed
+    ids = intersect_ids(usable)
+    if not ids:
+        return [], failed
+    if sort_terms:
+        return _apply_sort(sess, ids, sort_terms, indexes), failed
+    return sorted(ids, reverse=True), failed
 
 
 def search_ids(
     sess: requests.Session, query: str, sort_terms: Optional[list[str]] = None
 ) -> list[int]:
-    parts = query.split()
-    if not parts:
-        return []
-    ids: set[int] = set()
-    # Primer término inicializa el set
-    for url in [_term_url(parts[0])]:
-        try:
-            r = sess.get(url, timeout=15)
-            if r.status_code == 200 and len(r.content) >= 4:
-                ids = {
-                    struct.unpack(">I", r.content[i * 4 : (i + 1) * 4])[0]
-                    for i in range(len(r.content) // 4)
-                }
-                break
-        except Exception:
-            pass
-    if not ids:
-        return []
-    # Términos adicionales: intersección; si el request falla, se omite (no vacía el set)
-    for p in parts[1:]:
-        if not ids:
-            break
-        try:
-            r = sess.get(_term_url(p), timeout=15)
-            if r.status_code == 200 and len(r.content) >= 4:
-                extra = {
-                    struct.unpack(">I", r.content[i * 4 : (i + 1) * 4])[0]
-                    for i in range(len(r.content) // 4)
-                }
-                ids.intersection_update(extra)
-            # Si falla o está vacío, omitimos este término
-        except Exception:
-            pass
-    if not ids:
-        return []
-    if sort_terms:
-        return _apply_sort(sess, list(ids), sort_terms)
-    return sorted(ids, reverse=True)
+    return search_terms(sess, query, sort_terms)[0]
 
 
 # ── Metadata ──────────────────────────────────────────────────────────────────
-_META_CACHE: dict[str, dict] = {}
+# LRU acotado en memoria + SQLite en disco (solo título y hash/avif por página)
+META = MetaCache()
 
 
-def load_meta(sess: requests.Session, gid: int) -> None:
-    if str(gid) in _META_CACHE:
-        return
+def _fetch_meta(sess: requests.Session, gid: int) -> Optional[dict]:
     try:
-        r = sess.get(
-            f"https://ltn.gold-usergeneratedcontent.net/galleries/{gid}.js", timeout=5
-        )
-        import json
-
-        _META_CACHE[str(gid)] = json.loads(r.text.split("var galleryinfo = ")[1])
+        r = sess.get(f"{CDN}/galleries/{gid}.js", timeout=5)
+        return json.loads(r.text.split("var galleryinfo = ")[1])
     except Exception:
-        pass
+        return None
+
+
+def load_meta(sess: requests.Session, gid: int) -> None:
+    if META.get(gid) is not None:
+        return
+    info = _fetch_meta(sess, gid)
+    if info:
+        META.put(gid, info)
 
 
 def load_meta_batch(
     sess: requests.Session, gids: list[int], max_workers: int = 20
 ) -> None:
-    to_load = [g for g in gids if str(g) not in _META_CACHE]
+    gids = list(gids)
+    known = META.get_many(gids)
+    to_load = [g for g in gids if g not in known]
     if not to_load:
         return
     with ThreadPoolExecutor(max_workers=max_workers) as exe:
-        list(exe.map(lambda g: load_meta(sess, g), to_load))
+        infos = exe.map(lambda g: _fetch_meta(sess, g), to_load)
+        META.put_many({g: info for g, info in zip(to_load, infos) if info})
 
 
 def gallery_title(gid: int) -> str:
-    m = _META_CACHE.get(str(gid), {})
-    return str(m.get("title", str(gid)))[:55] if m else str(gid)
+    rec = META.get(gid)
+    return rec[0][:55] if rec else str(gid)
 
 
 def gallery_files(gid: int) -> list[dict]:
-    m = _META_CACHE.get(str(gid), {})
-    return [f for f in m.get("files", []) if isinstance(f, dict)] if m else []
+    rec = META.get(gid)
+    return [{"hash": h, "hasavif": avif} for h, avif in rec[1]] if rec else []
 
 
 # ── Image URLs ────────────────────────────────────────────────────────────────
@@ -273,15 +396,25 @@ class DownloaderHitomi(BaseDownloader):
 
     # items = [{"id": str(gid), "title": ...}]
     def search(self, query: str) -> list[dict]:
+        items, failed = self.search_partial(query)
+        if failed:
+            print(f"  ⚠ Términos omitidos (sin respuesta): {' '.join(failed)}")
+        return items
+
+    def search_partial(self, query: str) -> tuple[list[dict], list[str]]:
+        """
+        (items, términos_fallidos). Los fallidos van con el resultado y no
+        en la instancia: el downloader se comparte entre búsquedas a la vez.
+        """
         query = query.strip()
         # Si es un ID numérico puro, descarga directa
         if query.isdigit():
             gid = int(query)
             load_meta(self._sess, gid)
-            return [{"id": str(gid), "title": gallery_title(gid)}]
-        ids = search_ids(self._sess, query)
+            return [{"id": str(gid), "title": gallery_title(gid)}], []
+        ids, failed = search_terms(self._sess, query)
         load_meta_batch(self._sess, ids[:50])
-        return [{"id": str(g), "title": gallery_title(g)} for g in ids]
+        return [{"id": str(g), "title": gallery_title(g)} for g in ids], failed
 
     def get_catalog(self, language: str = "all") -> list[dict]:
         ids = fetch_catalog_ids(self._sess, language)
@@ -289,24 +422,41 @@ class DownloaderHitomi(BaseDownloader):
         load_meta_batch(self._sess, ids[:200])
         return [{"id": str(g), "title": gallery_title(g)} for g in ids]
 
+    def catalog_page(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        language: str = "all",
+        order: str = "default",
+    ) -> tuple[list, bool, int]:
+        """
+        Solo descarga el rango de bytes de la página pedida (Range), nunca
+        el índice completo. Devuelve (items, has_more, total), con el nº
+        total de galerías del índice (de Content-Range) o -1 si no se sabe.
+        """
+        start = (page - 1) * page_size
+        end = start + page_size
+
+        ids, total = array(_ID_CODE), -1
+        for url in _catalog_urls(language, order):
+            ids, total = nozomi_range(self._sess, url, start, end)
+            if ids or total >= 0:
+                break
+
+        load_meta_batch(self._sess, ids)
+        chunk = [{"id": str(g), "title": gallery_title(g)} for g in ids]
+        has_more = end < total if total >= 0 else len(ids) == page_size
+        return chunk, has_more, total
+
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
     ) -> tuple[list, bool]:
-        language = kwargs.get("language", "all")
-        key = f"hitomi_{language}"
-        if getattr(self, "_cat_buf_key", None) != key:
-            ids = fetch_catalog_ids(self._sess, language)
-            # Store all IDs; load metadata lazily per page
-            self._cat_ids: list[int] = ids
-            self._cat_buf_key: str = key
-
-        ids = self._cat_ids
-        start = (page - 1) * page_size
-        end = min(start + page_size, len(ids))
-        # Load metadata for this page
-        load_meta_batch(self._sess, ids[start:end])
-        chunk = [{"id": str(g), "title": gallery_title(g)} for g in ids[start:end]]
-        has_more = end < len(ids)
+        chunk, has_more, _total = self.catalog_page(
+            page,
+            page_size,
+            kwargs.get("language", "all"),
+            kwargs.get("order", "default"),
+        )
         return chunk, has_more
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
@@ -10,13 +10,16 @@ ACTUALIZACIÓN:
 from __future__ import annotations
 
 import re
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, CatalogCrawl, RateLimiter, host_limiter
+from htmlparse import document, first, has_class, img_src, text
 
 BASE_URL = "https://fanfox.net"
 MOBILE_URL = "https://m.fanfox.net"
@@ -35,6 +38,36 @@ HEADERS = {
 
 _CHAP_URL_RE = re.compile(r"/manga/[^/]+/(?:v([^/]+)/)?c([^/]+)/\d+\.html")
 
+# Páginas de capítulo (m.fanfox.net): límite compartido por todos los hilos y
+# concurrencia adaptativa (sube con cada tanda limpia, se parte a la mitad
+# ante 429/5xx/timeouts).
+PAGE_RATE = 8  # peticiones/s
+PAGE_BURST = 4
+PAGE_WORKERS_MIN = 2
+PAGE_WORKERS_MAX = 12
+PAGE_ATTEMPTS = 3
+_PAGE_LIMIT = RateLimiter(PAGE_RATE, PAGE_BURST)
+
+# Directorio (catálogo): CATALOG_WINDOW páginas a la vez bajo el límite del host
+CATALOG_PAGES = 143
+CATALOG_WINDOW = 4
+_CATALOG_LIMIT = host_limiter(BASE_URL, rate=4, burst=4)
+
+# capítulo → imágenes. Solo en memoria y con caducidad: las URLs del CDN
+# llevan firma temporal.
+CHAPTER_CACHE_SIZE = 64
+CHAPTER_CACHE_TTL = 30 * 60
+_chapter_cache: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+_chapter_cache_lock = threading.Lock()
+
+# Extracción dirigida sobre el HTML crudo (sin BeautifulSoup por página)
+_IMG_TAG_RE = re.compile(r"<img\b[^>]*>", re.I)
+_ATTR_RE = re.compile(r"""\b(id|class|src|data-src)\s*=\s*["']([^"']*)["']""", re.I)
+_PAGER_NUM_RE = re.compile(r"Page\s*\d+\s*of\s*(\d+)", re.I)
+_IMAGECOUNT_RE = re.compile(r"\bimagecount\s*=\s*(\d+)")
+_PAGER_FRACTION_RE = re.compile(r">\s*\d{1,3}\s*/\s*(\d{1,3})\s*<")
+_IMG_HINTS = ("compressed", "zjcdn", "mangafox")
+
 
 def _make_session() -> requests.Session:
     s = requests.Session()
@@ -94,19 +127,87 @@ def _extract_image_from_page(soup: BeautifulSoup) -> Optional[str]:
 # ─────────────────────────────────────────────
 # PARSERS ORIGINALES (Búsqueda y Directorio)
 # ─────────────────────────────────────────────
+_ML = re.compile(r"/manga/([a-z0-9_\-]+)/?$")
+_SERIES_HREF_RE = re.compile(r"/manga/[^/]+/?$")
+_SLUG_RE = re.compile(r"/manga/([^/?#]+)/?")
+
+ITEM_SELS = [
+    "ul.manga-list-4-list li",
+    "ul.manga-list-4 li",
+    "ul.manga-list-2 li",
+    "ul.manga-list li",
+    ".manga-list li",
+]
+# Los mismos selectores en XPath (lxml sin cssselect)
+ITEM_XPATHS = [
+    f"//ul[{has_class('manga-list-4-list')}]//li",
+    f"//ul[{has_class('manga-list-4')}]//li",
+    f"//ul[{has_class('manga-list-2')}]//li",
+    f"//ul[{has_class('manga-list')}]//li",
+    f"//*[{has_class('manga-list')}]//li",
+]
+# "p.manga-list-4-item-title a, p.title a, h3 a, .title a": el primero en
+# orden de documento
+ITEM_LINK_XPATH = (
+    f"(.//p[{has_class('manga-list-4-item-title')}]//a | .//p[{has_class('title')}]//a"
+    f" | .//h3//a | .//*[{has_class('title')}]//a)[1]"
+)
+
+
+def _add_item(
+    results: list[dict], seen: set, slug: str, title: str, cover: str = ""
+) -> None:
+    if slug not in seen:
+        seen.add(slug)
+        results.append({"id": slug, "slug": slug, "title": title, "cover": cover})
+
+
 def _parse_manga_list(html: str) -> list[dict]:
+    doc = document(html)
+    if doc is None:
+        return _parse_manga_list_bs4(html)
+    results: list[dict] = []
+    seen: set = set()
+
+    items = []
+    for xp in ITEM_XPATHS:
+        items = doc.xpath(xp)
+        if items:
+            break
+
+    for item in items:
+        a = first(item, ITEM_LINK_XPATH)
+        if a is None:
+            a = next(
+                (x for x in item.iter("a") if _SERIES_HREF_RE.search(x.get("href", ""))),
+                None,
+            )
+        if a is None:
+            continue
+        title = text(a)
+        m = _SLUG_RE.search(a.get("href", ""))
+        if not m or not title:
+            continue
+        cover = img_src(first(item, "(.//img)[1]"), BASE_URL)
+        _add_item(results, seen, m.group(1), title, cover)
+
+    if not results:
+        for a in doc.iter("a"):
+            m = _ML.search(a.get("href", ""))
+            if not m:
+                continue
+            title = (a.get("title") or text(a)).strip()
+            if not title or len(title) < 2:
+                continue
+            _add_item(results, seen, m.group(1), title)
+    return results
+
+
+def _parse_manga_list_bs4(html: str) -> list[dict]:
     soup = _soup(html)
     results: list[dict] = []
     seen: set = set()
-    _ML = re.compile(r"/manga/([a-z0-9_\-]+)/?$")
-
-    ITEM_SELS = [
-        "ul.manga-list-4-list li",
-        "ul.manga-list-4 li",
-        "ul.manga-list-2 li",
-        "ul.manga-list li",
-        ".manga-list li",
-    ]
+
     items = []
     for sel in ITEM_SELS:
         items = soup.select(sel)
@@ -116,19 +217,16 @@ def _parse_manga_list(html: str) -> list[dict]:
     for item in items:
         a = item.select_one(
             "p.manga-list-4-item-title a, p.title a, h3 a, .title a"
-        ) or item.find("a", href=re.compile(r"/manga/[^/]+/?$"))
+        ) or item.find("a", href=_SERIES_HREF_RE)
         if not a:
             continue
         href = a.get("href", "")
         title = a.get_text(strip=True)
-        m = re.search(r"/manga/([^/?#]+)/?", href)
+        m = _SLUG_RE.search(href)
         if not m or not title:
             continue
-        slug = m.group(1)
-        if slug in seen:
-            continue
-        seen.add(slug)
-        results.append({"id": slug, "slug": slug, "title": title})
+        cover = img_src(item.find("img"), BASE_URL)
+        _add_item(results, seen, m.group(1), title, cover)
 
     if not results:
         for a in soup.find_all("a", href=_ML):
@@ -137,11 +235,7 @@ def _parse_manga_list(html: str) -> list[dict]:
             m = _ML.search(href)
             if not m or not title or len(title) < 2:
                 continue
-            slug = m.group(1)
-            if slug in seen:
-                continue
-            seen.add(slug)
-            results.append({"id": slug, "slug": slug, "title": title})
+            _add_item(results, seen, m.group(1), title)
     return results
 
 
@@ -211,7 +305,128 @@ def _parse_series(sess: requests.Session, slug: str) -> Optional[dict]:
 # ─────────────────────────────────────────────
 # OBTENCIÓN DE IMÁGENES (Versión Móvil)
 # ─────────────────────────────────────────────
+def _abs_url(src: str) -> str:
+    if src.startswith("//"):
+        return "https:" + src
+    if not src.startswith("http"):
+        return BASE_URL + src
+    return src
+
+
+def _image_from_html(html: str) -> Optional[str]:
+    """
+    Imagen de la página con una pasada de regex sobre las <img>: primero
+    img#image / .reader-image / .manga-page, luego las del CDN. Si la
+    maqueta cambia, se recurre a los selectores de _extract_image_from_page.
+    """
+    fallback = None
+    for tag in _IMG_TAG_RE.findall(html):
+        attrs = {k.lower(): v for k, v in _ATTR_RE.findall(tag)}
+        src = attrs.get("data-src") or attrs.get("src") or ""
+        if not src:
+            continue
+        classes = attrs.get("class", "").split()
+        if attrs.get("id") == "image" or "reader-image" in classes or "manga-page" in classes:
+            return _abs_url(src)
+        if fallback is None and any(h in src for h in _IMG_HINTS):
+            fallback = src
+    if fallback:
+        return _abs_url(fallback)
+    return _extract_image_from_page(_soup(html))
+
+
+def _page_count(html: str, base_mobile: str) -> int:
+    """
+    Nº de páginas desde el paginador: enlaces/options a `{capítulo}/{n}.html`
+    (el <select> de páginas del móvil), `imagecount`, "Page x of N" o "x/N".
+    """
+    path = re.sub(r"^https?://[^/]+", "", base_mobile)
+    link_re = re.compile(re.escape(path) + r"/(\d+)\.html")
+    count = max((int(n) for n in link_re.findall(html)), default=1)
+    for rx in (_IMAGECOUNT_RE, _PAGER_NUM_RE, _PAGER_FRACTION_RE):
+        m = rx.search(html)
+        if m:
+            count = max(count, int(m.group(1)))
+    return min(count, 999)
+
+
+def _fetch_page(sess: requests.Session, url: str, referer: str) -> tuple[int, Optional[str]]:
+    """Un solo intento bajo el límite compartido: (status, html); 0 = error de red."""
+    _PAGE_LIMIT.wait()
+    try:
+        r = sess.get(url, timeout=TIMEOUT, headers={"Referer": referer})
+    except Exception:
+        return 0, None
+    return r.status_code, (r.text if r.status_code == 200 else None)
+
+
+def _fetch_page_images(
+    sess: requests.Session, base_mobile: str, pages: list[int], referer: str
+) -> dict[int, str]:
+    """
+    Descarga las páginas por tandas de `width` hilos. Tanda sin errores
+    transitorios → width+1; con alguno → width/2 y esas páginas se repiten
+    (hasta PAGE_ATTEMPTS veces). 403/404 o página sin imagen se descartan.
+    """
+    found: dict[int, str] = {}
+    tries = dict.fromkeys(pages, 0)
+    pending = list(pages)
+    width = PAGE_WORKERS_MIN * 2
+
+    def _one(p: int) -> tuple[int, int, Optional[str]]:
+        status, html = _fetch_page(sess, f"{base_mobile}/{p}.html", referer)
+        return p, status, (_image_from_html(html) if html else None)
+
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS_MAX) as exe:
+        while pending:
+            batch, pending = pending[:width], pending[width:]
+            retry: list[int] = []
+            for p, status, img in exe.map(_one, batch):
+                if img:
+                    found[p] = img
+                elif status == 0 or status == 429 or status >= 500:
+                    tries[p] += 1
+                    if tries[p] < PAGE_ATTEMPTS:
+                        retry.append(p)
+            if retry:
+                width = max(PAGE_WORKERS_MIN, width // 2)
+                time.sleep(RETRY)
+                pending = retry + pending
+            else:
+                width = min(PAGE_WORKERS_MAX, width + 1)
+    return found
+
+
+def _chapter_key(chap_url: str) -> str:
+    return re.sub(r"/\d+\.html$", "", chap_url.replace(MOBILE_URL, BASE_URL)).rstrip("/")
+
+
+def _cached_images(key: str) -> Optional[list[str]]:
+    with _chapter_cache_lock:
+        hit = _chapter_cache.get(key)
+        if hit is None:
+            return None
+        if time.time() - hit[0] > CHAPTER_CACHE_TTL:
+            del _chapter_cache[key]
+            return None
+        _chapter_cache.move_to_end(key)
+        return list(hit[1])
+
+
+def _remember_images(key: str, imgs: list[str]) -> None:
+    with _chapter_cache_lock:
+        _chapter_cache[key] = (time.time(), list(imgs))
+        _chapter_cache.move_to_end(key)
+        while len(_chapter_cache) > CHAPTER_CACHE_SIZE:
+            _chapter_cache.popitem(last=False)
+
+
 def _get_chapter_images(sess: requests.Session, chap_url: str) -> list[str]:
+    key = _chapter_key(chap_url)
+    cached = _cached_images(key)
+    if cached is not None:
+        return cached
+
     mobile_base = chap_url.replace(BASE_URL, MOBILE_URL)
     if not mobile_base.endswith(".html"):
         mobile_base = mobile_base.rstrip("/") + "/1.html"
@@ -222,60 +437,34 @@ def _get_chapter_images(sess: requests.Session, chap_url: str) -> list[str]:
     if not html:
         return []
 
-    soup = _soup(html)
-    page_count = 1
-
-    # Detección robusta de páginas
-    text = soup.get_text()
-    m = re.search(r"/\s*(\d+)", text)
-    if m:
-        page_count = int(m.group(1))
-
-    m = re.search(r"Page\s*\d+\s*of\s*(\d+)", text, re.I)
-    if m and int(m.group(1)) > page_count:
-        page_count = int(m.group(1))
-
-    select = soup.find("select", {"name": "page"}) or soup.find(
-        "select", id=re.compile(r"page", re.I)
-    )
-    if select:
-        opts = select.find_all("option")
-        if opts and len(opts) > page_count:
-            page_count = len(opts)
-
-    pagination_block = (
-        soup.select_one(".pager, .pagination, .page-nav, .chapter-page-nav") or soup
-    )
-    nums = [
-        int(t)
-        for t in re.findall(r"\b(\d{1,3})\b", pagination_block.get_text())
-        if 1 <= int(t) <= 999
-    ]
-    if nums:
-        max_num = max(nums)
-        if max_num > page_count:
-            page_count = max_num
-
     base_mobile = re.sub(r"/\d+\.html$", "", mobile_base)
-    imgs_by_page: dict = {}
+    page_count = _page_count(html, base_mobile)
+
+    # La página 1 ya está descargada: no se vuelve a pedir
+    imgs_by_page: dict[int, str] = {}
+    first = _image_from_html(html)
+    if first:
+        imgs_by_page[1] = first
+    imgs_by_page.update(
+        _fetch_page_images(sess, base_mobile, list(range(2, page_count + 1)), mobile_base)
+    )
 
-    def _get_page_img(p: int) -> Optional[str]:
-        pg_url = f"{base_mobile}/{p}.html"
-        ph = _fetch_html(sess, pg_url, mobile_base)
-        if ph:
-            return _extract_image_from_page(_soup(ph))
-        return None
+    imgs = [imgs_by_page[p] for p in sorted(imgs_by_page)]
+    # Solo capítulos completos: uno a medias se reintenta la próxima vez
+    if imgs and len(imgs) == page_count:
+        _remember_images(key, imgs)
+    return imgs
 
-    # Parseo concurrente para acelerar la extracción desde el sitio móvil
-    with ThreadPoolExecutor(max_workers=4) as exe:
-        futs = {exe.submit(_get_page_img, p): p for p in range(1, page_count + 1)}
-        for fut in as_completed(futs):
-            p = futs[fut]
-            img = fut.result()
-            if img:
-                imgs_by_page[p] = img
 
-    return [imgs_by_page[p] for p in sorted(imgs_by_page)]
+def _directory_page(sess: requests.Session, page: int) -> list[dict]:
+    for url in [
+        f"{BASE_URL}/directory/{page}.html",
+        f"{BASE_URL}/directory/?page={page}",
+    ]:
+        html = _fetch_html(sess, url)
+        if html:
+            return _parse_manga_list(html)
+    return []
 
 
 # ─────────────────────────────────────────────
@@ -310,72 +499,33 @@ class DownloaderMangafox(BaseDownloader):
             time.sleep(0.3)
         return results
 
-    def get_catalog(self, max_pages: int = 143) -> list[dict]:
-        results, seen = [], set()
-        for page in range(1, max_pages + 1):
-            html = None
-            for url in [
-                f"{BASE_URL}/directory/{page}.html",
-                f"{BASE_URL}/directory/?page={page}",
-            ]:
-                html = _fetch_html(self._sess, url)
-                if html:
-                    break
-            if not html:
-                break
-            batch = _parse_manga_list(html)
-            nuevos = 0
-            for it in batch:
-                if it["slug"] not in seen:
-                    seen.add(it["slug"])
-                    results.append(it)
-                    nuevos += 1
-            if nuevos == 0 and page > 2:
-                break
-            time.sleep(0.35)
-        return results
+    def _catalog_crawl(self, max_pages: int = CATALOG_PAGES) -> CatalogCrawl:
+        return CatalogCrawl(
+            [lambda page: _directory_page(self._sess, page)],
+            window=CATALOG_WINDOW,
+            max_pages=max_pages,
+            limiter=_CATALOG_LIMIT,
+            repeat_grace=2,  # el directorio a veces repite la 1 como 2
+        )
+
+    def get_catalog(self, max_pages: int = CATALOG_PAGES) -> list[dict]:
+        return self._catalog_crawl(max_pages).all()
 
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
     ) -> tuple[list, bool]:
-        key = "fanfox"
-        if getattr(self, "_cat_buf_key", None) != key:
-            self._cat_buf = []
-            self._cat_buf_key = key
-            self._cat_srv_page = 0
-            self._cat_exhausted = False
-            self._cat_seen = set()
-
+        # Un único recorrido en segundo plano: las primeras páginas se sirven
+        # en cuanto llegan y las siguientes ya suelen estar en el buffer
+        with self.catalog_lock():
+            crawl = getattr(self, "_crawl", None)
+            # Recorrido viejo: se rehace al volver a la página 1, nunca a
+            # mitad de paginar (los offsets cambiarían bajo los pies)
+            if crawl is None or (page == 1 and crawl.expired()):
+                if crawl is not None:
+                    crawl.stop()
+                crawl = self._crawl = self._catalog_crawl()
         start = (page - 1) * page_size
-        end = start + page_size
-
-        while len(self._cat_buf) < end and not self._cat_exhausted:
-            self._cat_srv_page += 1
-            html = None
-            for url in [
-                f"{BASE_URL}/directory/{self._cat_srv_page}.html",
-                f"{BASE_URL}/directory/?page={self._cat_srv_page}",
-            ]:
-                html = _fetch_html(self._sess, url)
-                if html:
-                    break
-            if not html:
-                self._cat_exhausted = True
-                break
-            batch = _parse_manga_list(html)
-            added = 0
-            for it in batch:
-                if it["slug"] not in self._cat_seen:
-                    self._cat_seen.add(it["slug"])
-                    self._cat_buf.append(it)
-                    added += 1
-            if added == 0:
-                self._cat_exhausted = True
-            time.sleep(0.25)
-
-        chunk = self._cat_buf[start:end]
-        has_more = (not self._cat_exhausted) or (end < len(self._cat_buf))
-        return chunk, has_more
+        return crawl.slice(start, start + page_size)
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
         slug = item.get("slug") or item.get("id", "")
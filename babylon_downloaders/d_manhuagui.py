@@ -5,17 +5,20 @@ p.a.c.k.e.r + LZString para extraer lista de imágenes.
 
 from __future__ import annotations
 
+import binascii
 import json
 import re
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from urllib.parse import quote
 
 import requests
 from bs4 import BeautifulSoup
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, incremental_catalog
+import packer
 
 BASE = "https://www.manhuagui.com"
 _BASE_ALTS = [
@@ -43,75 +46,124 @@ HEADERS = {
 # ── LZString ──────────────────────────────────────────────────────────────────
 
 _B64_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
-_B64_MAP = {ch: i for i, ch in enumerate(_B64_CHARS)}
+
+# Traducción a base64 estándar: los caracteres fuera del alfabeto (y el "="
+# final) valen 0 en el bit reader del JS → se normalizan a "A".
+_B64_NORM = bytearray(b"A" * 256)
+for _ch in _B64_CHARS[:64]:
+    _B64_NORM[ord(_ch)] = ord(_ch)
+_B64_NORM = bytes(_B64_NORM)
+del _ch
+
+# Inversión de bits por byte. LZString lee el stream MSB→LSB pero acumula cada
+# símbolo LSB-first: con los bytes invertidos el stream completo queda
+# "little-endian" y un símbolo de n bits es simplemente `acc & ((1 << n) - 1)`.
+_BITREV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+_WORD_BITS = 32
+_WORD_CODE = "I" if array("I").itemsize == 4 else "L"
+
+
+def _lz_words(compressed: str) -> list[int]:
+    """Stream base64 → palabras de 32 bits (LSB = primer bit que lee LZString)."""
+    raw = compressed.encode("ascii", "replace").translate(_B64_NORM)
+    raw += b"A" * (-len(raw) % 16)  # 16 chars → 12 bytes → 3 palabras exactas
+    words = array(_WORD_CODE, binascii.a2b_base64(raw).translate(_BITREV8))
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words.tolist()
 
 
 def lzstring_decompress_base64(compressed: str) -> str:
+    """
+    LZString.decompressFromBase64.
+
+    El stream se precalcula como lista de palabras de 32 bits y cada símbolo
+    se extrae con máscaras sobre un acumulador: sin closures ni llamadas por
+    bit. Devuelve lo mismo que el port directo del JS (incluido "" o el
+    resultado parcial cuando el stream está truncado/corrupto).
+    """
     if not compressed:
         return ""
-    safe = lambda i: _B64_MAP.get(compressed[i], 0) if i < len(compressed) else 0
-    dv, dp, di = safe(0), 32, 1
-    result: list[str] = []
-    dictionary: list = list(range(3))
-    enlargeIn, dictSize, numBits = 4, 4, 3
-
-    def rb(maxpower: int) -> int:
-        nonlocal dv, dp, di
-        bits, p = 0, 1
-        while p != maxpower:
-            resb = dv & dp
-            dp >>= 1
-            if dp == 0:
-                dp = 32
-                dv = safe(di)
-                di += 1
-            bits |= (1 if resb > 0 else 0) * p
-            p <<= 1
-        return bits
-
-    nxt = rb(4)
-    c = chr(rb(256) if nxt == 0 else rb(65536) if nxt == 1 else 0)
-    if nxt not in (0, 1):
+    total_bits = len(compressed) * 6
+    words = _lz_words(compressed)
+    # Relleno de ceros: una iteración lee como mucho numBits + 16 bits y
+    # numBits nunca supera el bit_length del diccionario máximo posible.
+    words.extend([0] * (((4 * len(compressed) + 8).bit_length() + 16) // _WORD_BITS + 2))
+
+    word_bits = _WORD_BITS
+    acc, nacc, wi = words[0], word_bits, 1
+    # Mientras wi < last_wi es imposible haber agotado el stream: el chequeo
+    # de fin de datos se reduce a una comparación de enteros pequeños.
+    last_wi = total_bits // word_bits
+
+    # Símbolo inicial: 2 bits de tipo + 8 ó 16 bits de carácter
+    nxt = acc & 3
+    acc >>= 2
+    nacc -= 2
+    if nxt == 0:
+        width = 8
+    elif nxt == 1:
+        width = 16
+    else:
         return ""
-    dictionary.append(c)
+    c = chr(acc & ((1 << width) - 1))
+    acc >>= width
+    nacc -= width
+
+    dictionary: list[str] = ["", "", "", c]
+    result: list[str] = [c]
+    append_out = result.append
+    append_dict = dictionary.append
     w = c
-    result.append(c)
+    enlarge_in, dict_size, num_bits = 4, 4, 3
+    mask = (1 << num_bits) - 1
 
     while True:
-        if di > len(compressed):
+        if wi >= last_wi and wi * word_bits - nacc >= total_bits:
             return ""
-        c = rb(1 << numBits)
-        if c == 0:
-            dictionary.append(chr(rb(256)))
-            c = dictSize
-            dictSize += 1
-            enlargeIn -= 1
-        elif c == 1:
-            dictionary.append(chr(rb(65536)))
-            c = dictSize
-            dictSize += 1
-            enlargeIn -= 1
-        elif c == 2:
+        while nacc < num_bits:
+            acc |= words[wi] << nacc
+            wi += 1
+            nacc += word_bits
+        code = acc & mask
+        acc >>= num_bits
+        nacc -= num_bits
+
+        if code < 2:
+            width = 8 if code == 0 else 16
+            if nacc < width:
+                acc |= words[wi] << nacc
+                wi += 1
+                nacc += word_bits
+            append_dict(chr(acc & ((1 << width) - 1)))
+            acc >>= width
+            nacc -= width
+            code = dict_size
+            dict_size += 1
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+                mask = (1 << num_bits) - 1
+        elif code == 2:
             return "".join(result)
-        if enlargeIn == 0:
-            enlargeIn = 1 << numBits
-            numBits += 1
-        entry = (
-            dictionary[c]
-            if c < len(dictionary)
-            else w + w[0]
-            if c == dictSize
-            else None
-        )
-        if entry is None:
+
+        if code < dict_size:
+            entry = dictionary[code]
+        elif code == dict_size:
+            entry = w + w[0]
+        else:
             return "".join(result)
-        result.append(entry)
-        dictionary.append(w + entry[0])
-        dictSize += 1
-        enlargeIn -= 1
-        if enlargeIn == 0:
-            enlargeIn = 1 << numBits
-            numBits += 1
+
+        append_out(entry)
+        append_dict(w + entry[0])
+        dict_size += 1
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+            mask = (1 << num_bits) - 1
         w = entry
 
 
@@ -122,52 +174,16 @@ class UnpackingError(Exception):
     pass
 
 
-class _Unbaser:
-    ALPHABET = {
-        62: "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
-        95: (
-            " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            "[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
-        ),
-    }
-
-    def __init__(self, base):
-        self.base = base
-        if 2 <= base <= 36:
-            self.unbase = lambda s: int(s, base)
-        else:
-            alphabet = self.ALPHABET.get(base, self.ALPHABET[62])
-            self.dictionary = {c: i for i, c in enumerate(alphabet)}
-            self.unbase = self._dictunbaser
-
-    def __call__(self, s):
-        return self.unbase(s)
-
-    def _dictunbaser(self, s):
-        ret = 0
-        for idx, ch in enumerate(s[::-1]):
-            ret += (self.base**idx) * self.dictionary.get(ch, 0)
-        return ret
-
-
-def _detect_packer(source: str) -> bool:
-    return bool(
-        re.search(
-            r"(eval|window\['eval'\])\s*\(\s*function\s*\(\s*p\s*,\s*a\s*,\s*c\s*,\s*k\s*,\s*e\s*,",
-            source,
-            re.I,
-        )
-    )
+_PACKER_ARGS_RE = re.compile(
+    r"}\s*\(\s*'((?:\\'|[^'])*)'\s*,\s*(\d+|\[\])\s*,\s*(\d+)\s*,"
+    r"\s*'((?:\\'|[^'])*)'[^,]*?,\s*0\s*,\s*\{\}\s*\)\)",
+    re.I,
+)
 
 
 def _unpack_packer(source: str) -> str:
     source = source.replace('window["\\x65\\x76\\x61\\x6c"]', "eval")
-    m = re.search(
-        r"}\s*\(\s*'((?:\\'|[^'])*)'\s*,\s*(\d+|\[\])\s*,\s*(\d+)\s*,"
-        r"\s*'((?:\\'|[^'])*)'[^,]*?,\s*0\s*,\s*\{\}\s*\)\)",
-        source,
-        re.I,
-    )
+    m = _PACKER_ARGS_RE.search(source)
     if not m:
         raise UnpackingError("Could not parse p.a.c.k.e.r.")
     a = list(m.groups())
@@ -182,20 +198,8 @@ def _unpack_packer(source: str) -> str:
     symtab = symtab_str.split("|")
     if count != len(symtab):
         raise UnpackingError("Malformed symtab")
-    unbase = _Unbaser(radix)
-
-    def lookup(mm: re.Match) -> str:
-        word = mm.group(0)
-        try:
-            val = unbase(word)
-            if val < len(symtab) and symtab[val]:
-                return symtab[val]
-        except Exception:
-            pass
-        return word
-
     payload = payload.replace("\\\\", "\\").replace("\\'", "'")
-    return re.sub(r"\b[0-9a-zA-Z]+\b", lookup, payload)
+    return packer.decode(payload, radix, symtab)
 
 
 # ── HTTP helpers ──────────────────────────────────────────────────────────────
@@ -319,10 +323,13 @@ def _load_all_pages(
     audience="",
     status="",
     workers: int = 8,
+    max_pages: Optional[int] = None,
 ) -> list[dict]:
     first, total = _browse_page(sess, 1, region, genre, audience, status)
     if not first:
         return []
+    if max_pages:
+        total = min(total, max_pages)
     all_series: list[dict] = []
     seen: set = set()
     for s in first:
@@ -336,10 +343,10 @@ def _load_all_pages(
         items, _ = _browse_page(sess, pg, region, genre, audience, status)
         return items
 
+    # map (no as_completed): en orden de página, como lo lista el sitio
     with ThreadPoolExecutor(max_workers=workers) as pool:
-        futs = {pool.submit(_fetch, pg): pg for pg in range(2, total + 1)}
-        for fut in as_completed(futs):
-            for s in fut.result():
+        for items in pool.map(_fetch, range(2, total + 1)):
+            for s in items:
                 if s["id"] not in seen:
                     seen.add(s["id"])
                     all_series.append(s)
@@ -469,13 +476,14 @@ def _get_images(sess: requests.Session, comic_id: str, chapter_id: str) -> list[
             content = script.string.strip().replace(
                 'window["\\x65\\x76\\x61\\x6c"]', "eval"
             )
-            if _detect_packer(content):
+            if packer.detect(content):
                 packed = content
                 break
     if not packed:
         return []
     try:
-        unpacked = _unpack_packer(packed)
+        # El mismo capítulo se resuelve varias veces (reintentos, preview)
+        unpacked = packer.memoized(packed, _unpack_packer)
     except Exception:
         return []
 
@@ -534,25 +542,25 @@ class DownloaderManhuagui(BaseDownloader):
     def get_catalog(
         self, region="", genre="", audience="", status="", max_pages: int = 50
     ) -> list[dict]:
-        """Carga hasta max_pages páginas (cap de seguridad). Usar get_catalog_page para lazy."""
-        first, total = _browse_page(self._sess, 1, region, genre, audience, status)
-        if not first:
-            return []
-        results = list(first)
-        seen = {s["id"] for s in results}
-        limit = min(total, max_pages)
-
-        def _fetch(pg):
-            items, _ = _browse_page(self._sess, pg, region, genre, audience, status)
-            return items
-
-        with ThreadPoolExecutor(max_workers=4) as pool:
-            for batch in pool.map(_fetch, range(2, limit + 1)):
-                for s in batch:
-                    if s["id"] not in seen:
-                        seen.add(s["id"])
-                        results.append(s)
-        return results
+        """
+        Carga hasta max_pages páginas (cap de seguridad). Usar get_catalog_page
+        para lazy. Se guarda en disco y se actualiza solo por la cabeza.
+        """
+        name = "_".join(p for p in (region, genre, audience, status) if p) or "all"
+        return incremental_catalog(
+            f"manhuagui_catalog_{name}_{max_pages}.json",
+            lambda pg: _browse_page(self._sess, pg, region, genre, audience, status)[0],
+            lambda: _load_all_pages(
+                self._sess,
+                region,
+                genre,
+                audience,
+                status,
+                workers=4,
+                max_pages=max_pages,
+            ),
+            max_pages=max_pages,
+        )
 
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
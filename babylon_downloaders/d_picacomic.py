@@ -5,16 +5,25 @@ API REST con firma HMAC. Requiere login.
 
 from __future__ import annotations
 
+import base64
 import hashlib
 import hmac
 import json
 import re
+import threading
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from typing import Callable, Optional
 
-from common import CFG, BaseDownloader
+from common import (
+    CFG,
+    BaseDownloader,
+    RateLimiter,
+    incremental_catalog,
+    load_json_cache,
+    save_json_cache,
+)
 
 BASE_URL = "https://picaapi.picacomic.com"
 
@@ -28,6 +37,13 @@ SECRET = r"~d}$Q7$eIni=V)9\RK/P.RM4;9[7|@/CA}b~OW!3?EV`:<>M7pddUBL5n|0/*Cn"
 APP_VER = "2.2.1.2.3.3"
 BUILD_VER = "44"
 
+# Límite global de la API (todos los hilos juntos), en vez de un sleep fijo
+# de 0.3 s por llamada que serializaba la paginación.
+API_RATE = 20  # peticiones/s
+API_BURST = 8
+PAGE_WORKERS = 8  # páginas de eps/imágenes en paralelo
+_API_LIMIT = RateLimiter(API_RATE, API_BURST)
+
 try:
     from curl_cffi.requests import Session as CurlSession
 
@@ -81,13 +97,22 @@ def _make_session():
 
 # ── API calls ─────────────────────────────────────────────────────────────────
 
+# Re-login transparente ante un 401: lo registra DownloaderPicacomic.
+# Recibe el token rechazado y devuelve uno válido ("" si no hay forma).
+_relogin: Optional[Callable[[str], str]] = None
+
+
+def _fresh_token(stale: str) -> str:
+    return _relogin(stale) if _relogin is not None else ""
+
 
 def _api_get(
     sess, path: str, token: str, params=None, retries: int = 3
 ) -> Optional[dict]:
-    time.sleep(0.3)
     url = BASE_URL + "/" + path.lstrip("/")
+    reauthed = False
     for attempt in range(retries):
+        _API_LIMIT.wait()
         try:
             sign_path = (
                 path.lstrip("/") + "?" + "&".join(f"{k}={v}" for k, v in params.items())
@@ -102,6 +127,10 @@ def _api_get(
             )
             if r.status_code == 200:
                 return r.json()
+            if r.status_code == 401 and token and not reauthed:
+                token, reauthed = _fresh_token(token), True
+                if token:
+                    continue
             if r.status_code in (400, 401, 403, 404):
                 return None
         except Exception:
@@ -113,9 +142,10 @@ def _api_get(
 def _api_post(
     sess, path: str, token: str, body: dict, retries: int = 3
 ) -> Optional[dict]:
-    time.sleep(0.3)
     url = BASE_URL + "/" + path.lstrip("/")
+    reauthed = False
     for attempt in range(retries):
+        _API_LIMIT.wait()
         try:
             r = sess.post(
                 url,
@@ -129,6 +159,10 @@ def _api_post(
                 data = None
             if r.status_code == 200:
                 return data
+            if r.status_code == 401 and token and not reauthed:
+                token, reauthed = _fresh_token(token), True
+                if token:
+                    continue
             if r.status_code in (400, 401, 403, 404):
                 return data
         except Exception:
@@ -162,6 +196,36 @@ def do_login(sess, email: str, password: str) -> str:
     return token.removeprefix("Bearer ").strip()
 
 
+# ── Token en disco ────────────────────────────────────────────────────────────
+TOKEN_CACHE = "picacomic_token.json"
+TOKEN_REFRESH_MARGIN = 24 * 3600  # renovar un día antes de caducar (duran ~7)
+LOGIN_WAIT = 30  # máx. espera por un login en curso cuando no hay token
+LOGIN_RETRY = 5 * 60  # tras un login fallido, no reintentar en segundo plano antes
+
+
+def token_expiry(token: str) -> float:
+    """Campo `exp` del JWT (epoch); 0 si no se puede leer."""
+    try:
+        payload = token.split(".")[1]
+        data = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(data.get("exp", 0))
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return 0.0
+
+
+def _load_cached_token(email: str) -> str:
+    data = load_json_cache(TOKEN_CACHE) or {}
+    if data.get("email") != email:
+        return ""
+    return str(data.get("token") or "")
+
+
+def _save_token(email: str, token: str) -> None:
+    save_json_cache(
+        TOKEN_CACHE, {"email": email, "token": token, "exp": token_expiry(token)}
+    )
+
+
 # ── Catalog / search ──────────────────────────────────────────────────────────
 
 
@@ -174,6 +238,7 @@ def _parse_comic_stub(d: dict) -> dict:
         "eps": d.get("epsCount", 1),
         "finished": d.get("finished", False),
         "categories": d.get("categories", []),
+        "cover": _img_url(d["thumb"]) if isinstance(d.get("thumb"), dict) else "",
     }
 
 
@@ -230,7 +295,8 @@ def fetch_full_catalog(
         return []
     if page_limit:
         total = min(total, page_limit)
-    all_comics: list[dict] = list(first)
+    # Por página y luego en orden: el catálogo guardado conserva el del sitio
+    by_page: dict[int, list[dict]] = {1: first}
     remaining = list(range(2, total + 1))
     BATCH = workers * 5
     for batch_start in range(0, len(remaining), BATCH):
@@ -241,9 +307,9 @@ def fetch_full_catalog(
                 for pg in batch
             }
             for fut in as_completed(futs):
-                _, comics, _ = fut.result()
-                all_comics.extend(comics)
-    return all_comics
+                pg, comics, _ = fut.result()
+                by_page[pg] = comics
+    return [c for pg in sorted(by_page) for c in by_page[pg]]
 
 
 # ── Comic info / episodes / pages ─────────────────────────────────────────────
@@ -267,18 +333,36 @@ def get_comic_info(sess, token: str, comic_id: str) -> dict:
     }
 
 
-def get_episodes(sess, token: str, comic_id: str) -> list[dict]:
-    eps = []
-    page = 1
-    while True:
-        resp = _api_get(sess, f"/comics/{comic_id}/eps", token, {"page": page})
+def _paged_docs(sess, token: str, path: str, key: str) -> list[dict]:
+    """
+    Todos los docs de un listado paginado de la API. La 1ª respuesta trae
+    el nº de páginas; el resto se pide en paralelo (bajo _API_LIMIT) y se
+    une en orden. Si una página falla se corta ahí, como el bucle original.
+    """
+
+    def fetch(page: int) -> Optional[tuple[list[dict], int]]:
+        resp = _api_get(sess, path, token, {"page": page})
         if not resp or resp.get("code") != 200:
-            break
-        data = ((resp.get("data") or {}).get("eps")) or {}
-        eps.extend(data.get("docs", []))
-        if page >= data.get("pages", 1):
-            break
-        page += 1
+            return None
+        data = ((resp.get("data") or {}).get(key)) or {}
+        return list(data.get("docs", [])), int(data.get("pages", 1) or 1)
+
+    first = fetch(1)
+    if first is None:
+        return []
+    docs, total = first
+    if total <= 1:
+        return docs
+    with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, total - 1)) as pool:
+        for part in pool.map(fetch, range(2, total + 1)):
+            if part is None:
+                break
+            docs.extend(part[0])
+    return docs
+
+
+def get_episodes(sess, token: str, comic_id: str) -> list[dict]:
+    eps = _paged_docs(sess, token, f"/comics/{comic_id}/eps", "eps")
     eps.sort(key=lambda e: e.get("order", 0))
     return [
         {
@@ -291,20 +375,9 @@ def get_episodes(sess, token: str, comic_id: str) -> list[dict]:
 
 
 def get_pages(sess, token: str, comic_id: str, ep_order: int) -> list[dict]:
-    pages = []
-    page = 1
-    while True:
-        resp = _api_get(
-            sess, f"/comics/{comic_id}/order/{ep_order}/pages", token, {"page": page}
-        )
-        if not resp or resp.get("code") != 200:
-            break
-        data = ((resp.get("data") or {}).get("pages")) or {}
-        pages.extend(data.get("docs", []))
-        if page >= data.get("pages", 1):
-            break
-        page += 1
-    return pages
+    return _paged_docs(
+        sess, token, f"/comics/{comic_id}/order/{ep_order}/pages", "pages"
+    )
 
 
 def _img_url(media: dict) -> str:
@@ -324,21 +397,69 @@ class DownloaderPicacomic(BaseDownloader):
     HAS_SEARCH = True
 
     def __init__(self):
+        global _relogin
         self._sess = _make_session()
-        self._token = ""
-        # Try JWT token first (fast, no network call)
-        if PICACOMIC_TOKEN:
-            self._token = PICACOMIC_TOKEN
-            print("  PicaComic: token JWT cargado")
-        # Always also try email+password to get a fresh token (token may be expired)
-        if PICACOMIC_EMAIL and PICACOMIC_PASSWORD:
-            print("  PicaComic: login…", end=" ", flush=True)
+        self._tok = ""
+        self._auth_lock = threading.Lock()  # serializa los logins
+        self._spawn_lock = threading.Lock()  # un único hilo de renovación
+        self._login_thread: Optional[threading.Thread] = None
+        self._login_at = 0.0
+        # Token guardado (o el JWT de respaldo) si no ha caducado: sin red
+        for cand in (_load_cached_token(PICACOMIC_EMAIL), PICACOMIC_TOKEN):
+            if cand and token_expiry(cand) > time.time() + 60:
+                self._tok = cand
+                print("  PicaComic: token en caché")
+                break
+        # Sin token válido o a punto de caducar: login en segundo plano
+        self._maybe_refresh()
+        _relogin = self._relogin
+
+    # ── token ─────────────────────────────────────────────────
+    @property
+    def _token(self) -> str:
+        """Token actual. Solo espera si no hay ninguno y hay un login en curso."""
+        t = self._login_thread
+        if not self._tok and t is not None and t.is_alive():
+            t.join(LOGIN_WAIT)
+        self._maybe_refresh()
+        return self._tok
+
+    @_token.setter
+    def _token(self, token: str) -> None:
+        self._tok = token
+        if token:
+            _save_token(PICACOMIC_EMAIL, token)
+
+    def _maybe_refresh(self) -> None:
+        """Lanza un login en segundo plano si no hay token o caduca pronto."""
+        if not (PICACOMIC_EMAIL and PICACOMIC_PASSWORD):
+            return
+        if self._tok and token_expiry(self._tok) - time.time() > TOKEN_REFRESH_MARGIN:
+            return
+        with self._spawn_lock:
+            t = self._login_thread
+            if t is not None and t.is_alive():
+                return
+            if self._login_at and time.monotonic() - self._login_at < LOGIN_RETRY:
+                return
+            self._login_at = time.monotonic()
+            print("  PicaComic: login en segundo plano…")
+            self._login_thread = threading.Thread(
+                target=self._relogin, args=(self._tok,), daemon=True
+            )
+            self._login_thread.start()
+
+    def _relogin(self, stale: str) -> str:
+        """Login con email+password salvo que otro hilo ya haya renovado `stale`."""
+        if not (PICACOMIC_EMAIL and PICACOMIC_PASSWORD):
+            return ""
+        with self._auth_lock:
+            if self._tok and self._tok != stale:
+                return self._tok
             t = do_login(self._sess, PICACOMIC_EMAIL, PICACOMIC_PASSWORD)
             if t:
-                self._token = t  # fresh token overrides old JWT
-                print("OK")
-            elif not self._token:
-                print("FALLÓ")
+                self._token = t
+            return t
 
     @property
     def NEEDS_LOGIN(self):
@@ -362,7 +483,16 @@ class DownloaderPicacomic(BaseDownloader):
     def get_catalog(
         self, sort: str = "dd", page_limit: Optional[int] = None
     ) -> list[dict]:
-        return fetch_full_catalog(self._sess, self._token, sort, page_limit=page_limit)
+        if sort != "dd" or page_limit:
+            return fetch_full_catalog(
+                self._sess, self._token, sort, page_limit=page_limit
+            )
+        # "dd" = de más nuevo a más viejo: se actualiza solo por la cabeza
+        return incremental_catalog(
+            f"picacomic_catalog_{sort}.json",
+            lambda pg: _fetch_global_page(self._sess, self._token, pg, sort)[1],
+            lambda: fetch_full_catalog(self._sess, self._token, sort),
+        )
 
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
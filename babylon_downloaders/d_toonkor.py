@@ -451,36 +451,37 @@ class DownloaderToonkor(BaseDownloader):
     def get_catalog_page(
         self, page: int = 1, page_size: int = 20, **kwargs
     ) -> tuple[list, bool]:
-        key = self._base
-        if getattr(self, "_cat_buf_key", None) != key:
-            self._cat_buf = []
-            self._cat_buf_key = key
-            self._cat_srv_page = 0
-            self._cat_exhausted = False
-            self._cat_seen = set()
-
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        while len(self._cat_buf) < end and not self._cat_exhausted:
-            self._cat_srv_page += 1
-            tasks = [
-                (self._sess, self._base, path, lbl, self._cat_srv_page)
-                for path, lbl in _CATALOG_SECTIONS
-            ]
-            found = 0
-            with ThreadPoolExecutor(max_workers=4) as pool:
-                for lbl, items, _ in pool.map(_fetch_section_page, tasks):
-                    for it in items:
-                        if it["slug"] not in self._cat_seen:
-                            self._cat_seen.add(it["slug"])
-                            self._cat_buf.append(it)
-                            found += 1
-            if found == 0 or self._cat_srv_page >= 10:
-                self._cat_exhausted = True
-
-        chunk = self._cat_buf[start:end]
-        has_more = (not self._cat_exhausted) or (end < len(self._cat_buf))
+        with self.catalog_lock():
+            key = self._base
+            if getattr(self, "_cat_buf_key", None) != key:
+                self._cat_buf = []
+                self._cat_buf_key = key
+                self._cat_srv_page = 0
+                self._cat_exhausted = False
+                self._cat_seen = set()
+
+            start = (page - 1) * page_size
+            end = start + page_size
+
+            while len(self._cat_buf) < end and not self._cat_exhausted:
+                self._cat_srv_page += 1
+                tasks = [
+                    (self._sess, self._base, path, lbl, self._cat_srv_page)
+                    for path, lbl in _CATALOG_SECTIONS
+                ]
+                found = 0
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    for lbl, items, _ in pool.map(_fetch_section_page, tasks):
+                        for it in items:
+                            if it["slug"] not in self._cat_seen:
+                                self._cat_seen.add(it["slug"])
+                                self._cat_buf.append(it)
+                                found += 1
+                if found == 0 or self._cat_srv_page >= 10:
+                    self._cat_exhausted = True
+
+            chunk = self._cat_buf[start:end]
+            has_more = (not self._cat_exhausted) or (end < len(self._cat_buf))
         return chunk, has_more
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
@@ -20,7 +20,8 @@ from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
-from common import CFG, BaseDownloader
+from common import CFG, BaseDownloader, catalog_swr, incremental_catalog
+from htmlparse import document, first, has_class, img_src, joined_text, text
 
 _BASE_CANDIDATES = [f"https://wfwf{n}.com/" for n in range(448, 510)] + [
     "https://wfwf1.com/",
@@ -70,6 +71,12 @@ _MANHWA_CATS = [
     f"?o=n&type1=complete&type2={x}" for x in [10, 11, 12, 13, 14, 15, 16, 20]
 ] + ["?o=n&type1=complete&type2=recent", "?o=n&type1=hiatus", "?o=n"]
 
+# Listados con lo último primero (portada de cada modo y novedades): bastan
+# para poner al día el catálogo guardado sin recorrer todas las categorías
+_WEBTOON_HEAD = ["", "?o=n&type1=day&type2=new", "?o=n&type1=day&type2=recent"]
+_MANHWA_HEAD = ["", "?o=n&type1=complete&type2=recent"]
+CATALOG_CACHE = "wfwf_catalog_{}.json"  # por modo: both / webtoon / manhwa
+
 _SITE_KEYWORDS = ("toon=", "wfwf", "lng", "ing", "webtoon", "웹툰", "만화", "manhwa")
 
 
@@ -170,13 +177,58 @@ def _mode_from_item(item: dict) -> Mode:
 # ── Catálogo (Usando tu lógica original) ──────────────────────────────────────
 
 
+_TXT_BOX_XPATH = f"(.//*[{has_class('txt')}])[1]"
+
+
+def _link_title(link_text: str) -> str:
+    if link_text and "더 읽기" not in link_text and len(link_text) > 1:
+        return link_text.split("/")[0].strip()
+    return ""
+
+
+def _card_title_lxml(a) -> str:
+    img = first(a, "(.//img)[1]")
+    if img is not None and img.get("alt"):
+        return img.get("alt").strip()
+    txt_box = first(a, _TXT_BOX_XPATH)
+    if txt_box is not None:
+        p = first(txt_box, "(.//p)[1]")
+        if p is not None and text(p):
+            return text(p)
+    return _link_title(joined_text(a))
+
+
+def _card_title_bs4(a) -> str:
+    img = a.find("img")
+    if img and img.get("alt"):
+        return img.get("alt").strip()
+    txt_box = a.find(class_="txt")
+    if txt_box:
+        p_tags = txt_box.find_all("p")
+        if p_tags and p_tags[0].get_text(strip=True):
+            return p_tags[0].get_text(strip=True)
+    return _link_title(a.get_text(" ", strip=True))
+
+
+def _anchors(html: str):
+    """([(href, <a>)…], título_de_tarjeta, <img>_de_tarjeta) con lxml o BS4."""
+    doc = document(html)
+    if doc is None:
+        links = [(a["href"], a) for a in _soup(html).find_all("a", href=True)]
+        return links, _card_title_bs4, lambda a: a.find("img")
+    return (
+        [(a.get("href"), a) for a in doc.xpath("//a[@href]")],
+        _card_title_lxml,
+        lambda a: first(a, "(.//img)[1]"),
+    )
+
+
 def _parse_series_from_html(html: str, mode: Mode) -> list[dict]:
-    soup = _soup(html)
     items: list[dict] = []
     seen: set = set()
+    links, card_title, card_img = _anchors(html)
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+    for href, a in links:
         if "num=" in href:
             continue
 
@@ -194,22 +246,7 @@ def _parse_series_from_html(html: str, mode: Mode) -> list[dict]:
         elif "list" in href or "ing" in href or "view" in href or "end" in href:
             real_mode = Mode.WEBTOON
 
-        title = ""
-        img = a.find("img")
-        if img and img.get("alt"):
-            title = img.get("alt").strip()
-
-        if not title:
-            txt_box = a.find(class_="txt")
-            if txt_box:
-                p_tags = txt_box.find_all("p")
-                if p_tags:
-                    title = p_tags[0].get_text(strip=True)
-
-        if not title:
-            text = a.get_text(" ", strip=True)
-            if text and "더 읽기" not in text and len(text) > 1:
-                title = text.split("/")[0].strip()
+        title = card_title(a)
 
         enc_title = ""
         m_title = re.search(r"[?&]title=([^&\s<>]+)", href)
@@ -228,6 +265,7 @@ def _parse_series_from_html(html: str, mode: Mode) -> list[dict]:
                 "encoded_title": enc_title,
                 "title": title or f"Toon {toon_id}",
                 "mode": real_mode,
+                "cover": img_src(card_img(a), BASE_URL),
             }
         )
     return items
@@ -279,10 +317,56 @@ def fetch_full_catalog(sess: requests.Session, workers: int = 10) -> list[dict]:
                     seen.add(key)
                     all_series.append(it)
 
-    all_series.sort(key=lambda s: (s["mode"], s["title"].lower()))
+    all_series.sort(key=_series_order)
     return all_series
 
 
+def _series_key(it: dict) -> str:
+    return f"{it['mode']}_{it['toon_id']}"
+
+
+def _series_order(it: dict) -> tuple:
+    return (it["mode"], it["title"].lower())
+
+
+def _catalog_modes(mode_val: str) -> tuple[str, ...]:
+    return (Mode.WEBTOON, Mode.MANHWA) if mode_val == "both" else (mode_val,)
+
+
+def fetch_catalog_head(
+    sess: requests.Session, mode_val: str = "both", workers: int = 5
+) -> list[dict]:
+    """Series de los listados de novedades del modo (o de ambos), en paralelo."""
+    tasks = []
+    for kind in _catalog_modes(mode_val):
+        mode = Mode(kind)
+        cats = _WEBTOON_HEAD if kind == Mode.WEBTOON else _MANHWA_HEAD
+        tasks += [(sess, f"{BASE_URL}{mode.main_path}{c}", mode) for c in cats]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [it for items in pool.map(_fetch_cat, tasks) for it in items]
+
+
+def load_catalog(sess: requests.Session, mode_val: str = "both") -> list[dict]:
+    """
+    Catálogo del modo guardado en disco; al refrescar solo se piden los
+    listados de novedades y lo nuevo se funde con lo guardado. "both" va
+    ordenado por título, como fetch_full_catalog.
+    """
+
+    def fetch_all() -> list[dict]:
+        if mode_val == "both":
+            return fetch_full_catalog(sess)
+        return fetch_series_list(sess, Mode(mode_val), workers=8)
+
+    return incremental_catalog(
+        CATALOG_CACHE.format(mode_val),
+        lambda pg: fetch_catalog_head(sess, mode_val) if pg == 1 else [],
+        fetch_all,
+        key=_series_key,
+        sort_key=_series_order if mode_val == "both" else None,
+    )
+
+
 def _parse_series_page(
     html: str, toon_id: str, enc_title: str, mode: Mode
 ) -> tuple[str, list[dict]]:
@@ -424,7 +508,9 @@ class DownloaderWfwf(BaseDownloader):
 
         if not hasattr(self, "_full_catalog") or not self._full_catalog:
             print(f"  Cargando catálogo para búsqueda…", end=" ", flush=True)
-            self._full_catalog = fetch_full_catalog(self._sess)
+            self._full_catalog = self.get_catalog_cached(
+                "both", on_update=lambda items: setattr(self, "_full_catalog", items)
+            )
             print(f"{len(self._full_catalog)} series")
 
         results = []
@@ -461,7 +547,18 @@ class DownloaderWfwf(BaseDownloader):
         return []
 
     def get_catalog(self) -> list[dict]:
-        return fetch_full_catalog(self._sess)
+        return load_catalog(self._sess)
+
+    def get_catalog_cached(self, mode_val: str = "both", on_update=None) -> list[dict]:
+        """
+        Copia en disco del catálogo del modo al instante (si la hay) y
+        revalidación en segundo plano; on_update(items) si cambia.
+        """
+        return catalog_swr(
+            CATALOG_CACHE.format(mode_val),
+            lambda: load_catalog(self._sess, mode_val),
+            on_update,
+        )
 
     def get_series(self, item: dict) -> tuple[dict, list[dict]]:
         toon_id = item.get("toon_id", item.get("id", ""))
@@ -12,13 +12,16 @@ import os
 import re
 import shutil
 import sys
+import threading
 import time
 import zipfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
-from typing import TYPE_CHECKING, Protocol, TypedDict, cast, runtime_checkable, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Protocol, TypedDict, cast, runtime_checkable, Optional
 
-from common import BaseDownloader
+from common import BaseDownloader, crawl_pages, host_limiter
+from packer import unpack_script
+from xorcrypt import SeedStore, iter_decrypted
 
 if TYPE_CHECKING:
 
@@ -268,9 +271,6 @@ _UI_PATHS = (
     "favicon.ico",
 )
 
-_seeds_cache: list[bytes] = []
-
-
 # ─── UI ───────────────────────────────────────────────────────────────────────
 class UI:
     CYAN: str = "\033[96m"
@@ -286,8 +286,8 @@ class UI:
     def header() -> None:
         _ = os.system("cls" if os.name == "nt" else "clear")
         seed_status = (
-            f"{UI.GREEN}✔ {len(_seeds_cache)} semillas{UI.END}"
-            if _seeds_cache
+            f"{UI.GREEN}✔ {len(SEEDS.get())} semillas ({SEEDS.source}){UI.END}"
+            if SEEDS.source != "hardcoded"
             else f"{UI.YELLOW}⚠ semillas hardcoded{UI.END}"
         )
         print(f"{UI.BLUE}╔══════════════════════════════════════╗")
@@ -321,8 +321,8 @@ _SEEDS_FALLBACK_HEX = [
 ]
 
 
-def _load_seeds() -> list[bytes]:
-    global _seeds_cache
+def _fetch_seeds() -> list[bytes]:
+    """Semillas de all2.js; [] si no se pueden extraer (el store pone las hardcoded)."""
     js_urls = []
     try:
         r = SESSION.get(f"{BASE_URL}/", timeout=8)
@@ -358,7 +358,6 @@ def _load_seeds() -> list[bytes]:
                         except Exception:
                             pass
                     if extracted:
-                        _seeds_cache = extracted
                         return extracted
             all_hex2 = cast(
                 "list[str]", re.findall(r'["\']([0-9a-fA-F]{8,})["\']', js_text)
@@ -371,67 +370,22 @@ def _load_seeds() -> list[bytes]:
                     except Exception:
                         pass
                 if len(extracted2) >= 5:
-                    _seeds_cache = extracted2
                     return extracted2
         except Exception:
             continue
+    return []
 
-    seeds: list[bytes] = []
-    for h in _SEEDS_FALLBACK_HEX:
-        try:
-            seeds.append(bytes.fromhex(h))
-        except Exception:
-            pass
-    _seeds_cache = seeds
-    return seeds
-
-
-# ─── DECODIFICADOR ────────────────────────────────────────────────────────────
-_B62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-
-
-def _b62_int(token: str, base: int = 62) -> int:
-    n = 0
-    chars = _B62[:base] if base <= 62 else _B62
-    try:
-        for ch in token:
-            n = n * base + chars.index(ch)
-    except ValueError:
-        return -1
-    return n
-
-
-def _decode_packer(p: str, base: int, k_str: str) -> str:
-    keys = k_str.split("|")
-
-    def replace(m: re.Match[str]) -> str:
-        idx = _b62_int(m.group(0), base)
-        return keys[idx] if 0 <= idx < len(keys) and keys[idx] else m.group(0)
-
-    return re.sub(r"\b[0-9A-Za-z]+\b", replace, p)
 
+# Persistidas en disco: el primer capítulo no espera a home + all2.js
+SEEDS = SeedStore("yumanhua", _fetch_seeds, _SEEDS_FALLBACK_HEX)
 
-def _extract_packer_args(script: str) -> tuple[str, int, int, str] | None:
-    try:
-        start = script.rindex("}(") + 2
-        args = script[start:]
-        parts = cast(
-            "list[tuple[str, str]]", re.findall(r"'((?:[^'\\]|\\.)*)'|(\d+)", args)
-        )
-        vals: list[int | str] = [int(n) if n else s for s, n in parts]
-        if len(vals) >= 4:
-            return str(vals[0]), int(vals[1]), int(vals[2]), str(vals[3])
-    except (ValueError, IndexError):
-        pass
-    return None
 
-
-def _xor_decrypt(data: bytes, key: bytes) -> bytes:
-    return bytes(data[i] ^ key[i % len(key)] for i in range(len(data)))
+# ─── DECODIFICADOR ────────────────────────────────────────────────────────────
+def _decrypt_images(html: str) -> list[str]:
+    return SEEDS.decrypt(lambda seeds: _decrypt_with_seeds(html, seeds))
 
 
-def _decrypt_images(html: str) -> list[str]:
-    seeds = _seeds_cache or _load_seeds()
+def _decrypt_with_seeds(html: str, seeds: list[bytes]) -> list[str]:
     scripts = cast(
         "list[str]",
         re.findall(r"<script[^>]*>(.*?)</script>", html, re.DOTALL | re.IGNORECASE),
@@ -439,11 +393,9 @@ def _decrypt_images(html: str) -> list[str]:
     for script in scripts:
         if "eval(function(p,a,c,k,e,d)" not in script:
             continue
-        args = _extract_packer_args(script)
-        if not args:
+        decoded = unpack_script(script)
+        if decoded is None:
             continue
-        p, base, _count, k = args
-        decoded = _decode_packer(p, base, k)
         
         # Nueva regex más agresiva para capturar el base64 cifrado
         # Buscamos cualquier cosa larga entre comillas que parezca base64
@@ -459,13 +411,9 @@ def _decrypt_images(html: str) -> list[str]:
             except Exception:
                 continue
                 
-            for seed in seeds:
+            # XOR vectorizado; las semillas incorrectas se descartan por prefijo
+            for final in iter_decrypted(raw, seeds):
                 try:
-                    xored = _xor_decrypt(raw, seed)
-                    pad2 = (4 - len(xored) % 4) % 4
-                    final_bytes = base64.b64decode(xored + b"=="[:pad2])
-                    final = final_bytes.decode("utf-8", errors="ignore")
-                    
                     if "http" not in final:
                         continue
                         
@@ -519,6 +467,12 @@ _YM_SORTS = {
     15: "连载",
     16: "完结",
 }
+# Catálogo completo: categorías en paralelo y, dentro de cada una, páginas
+# /sortmore pedidas por adelantado; todo bajo un único límite para el host.
+SORT_WORKERS = 4
+SORT_WINDOW = 4
+_HOST_LIMIT = host_limiter(BASE_URL)
+
 _YM_RANKS = {
     1: "精品榜",
     2: "人气榜",
@@ -593,6 +547,7 @@ def _sortmore(type_id: int, page: int) -> list[CatalogItem]:
     POST /sortmore  — endpoint AJAX del botón 'cargar más' en /sort/N.
     Devuelve lista de series o [] si no hay más / endpoint no existe.
     """
+    _HOST_LIMIT.wait()
     try:
         r = SESSION.post(
             f"{BASE_URL}/sortmore",
@@ -630,79 +585,82 @@ def _sortmore(type_id: int, page: int) -> list[CatalogItem]:
         return []
 
 
-def _load_sort(sort_id: int, sort_name: str) -> list[CatalogItem]:
-    """
-    Carga TODAS las series de /sort/{sort_id} usando:
-    1. GET /sort/{sort_id}  (primera página, 20 items)
-    2. POST /sortmore {type, page}  (páginas adicionales hasta vacío)
-    """
-    all_items: list[CatalogItem] = []
-    seen: set[str] = set()
-
-    # Página inicial
+def _sort_first_page(sort_id: int) -> list[CatalogItem]:
+    _HOST_LIMIT.wait()
     try:
         r = SESSION.get(f"{BASE_URL}/sort/{sort_id}", timeout=15, headers=HEADERS)
         if r.status_code == 200:
-            for it in _parse_series_html(r.text):
-                if it["slug"] not in seen:
-                    seen.add(it["slug"])
-                    all_items.append(it)
+            return _parse_series_html(r.text)
     except Exception:
         pass
+    return []
 
-    # Cargar más vía AJAX
-    page = 2
-    consecutive_empty = 0
-    while page <= 500:
-        more = _sortmore(sort_id, page)
-        if not more:
-            consecutive_empty += 1
-            if consecutive_empty >= 3:
-                break
-            page += 1
-            continue
-        consecutive_empty = 0
-        added = 0
-        for it in more:
+
+def _sort_batches(sort_id: int, pool: ThreadPoolExecutor) -> Iterator[list[CatalogItem]]:
+    """
+    Series nuevas de /sort/{sort_id}, lote a lote y en orden de página:
+    1. GET /sort/{sort_id}  (primera página, 20 items)
+    2. POST /sortmore {type, page}  (SORT_WINDOW páginas por adelantado)
+    Termina tras 3 páginas vacías seguidas o con una que no aporta nada nuevo.
+    """
+    seen: set[str] = set()
+
+    def _fresh(batch: list[CatalogItem]) -> list[CatalogItem]:
+        out: list[CatalogItem] = []
+        for it in batch:
             if it["slug"] not in seen:
                 seen.add(it["slug"])
-                all_items.append(it)
-                added += 1
-        if added == 0:
+                out.append(it)
+        return out
+
+    first = _fresh(_sort_first_page(sort_id))
+    if first:
+        yield first
+    for _page, more in crawl_pages(
+        lambda page: _sortmore(sort_id, page), pool, first=2, window=SORT_WINDOW
+    ):
+        if not more:
+            continue
+        fresh = _fresh(more)
+        if not fresh:
             break  # ya no hay nuevas
-        page += 1
-        time.sleep(0.1)
-
-    return all_items
+        yield fresh
 
 
-def load_full_catalog(workers: int = 8) -> list[CatalogItem]:
+def load_full_catalog(
+    workers: int = SORT_WORKERS,
+    on_batch: Optional[Callable[[list[CatalogItem]], None]] = None,
+) -> list[CatalogItem]:
     """
-    Carga TODAS las series iterando /sort/1..16 con paginación AJAX.
+    Carga TODAS las series de /sort/1..16: `workers` categorías a la vez,
+    deduplicando según llegan los lotes. on_batch(nuevas) recibe cada lote.
     """
     all_items: list[CatalogItem] = []
     seen: set[str] = set()
+    lock = threading.Lock()
 
-    for sort_id, sort_name in _YM_SORTS.items():
-        sys.stdout.write(
-            f"  {UI.CYAN}[{sort_id}/{len(_YM_SORTS)}] {sort_name}...{UI.END}   \r"
-        )
-        sys.stdout.flush()
-
-        items = _load_sort(sort_id, sort_name)
+    def _run(sort_id: int) -> tuple[int, int]:
         added = 0
-        for it in items:
-            if it["slug"] not in seen:
-                seen.add(it["slug"])
-                all_items.append(it)
-                added += 1
-
-        sys.stdout.write(
-            f"  {UI.CYAN}[{sort_id}/{len(_YM_SORTS)}] {sort_name}"
-            f" — {added} nuevas — {len(all_items)} total{UI.END}   \r"
-        )
-        sys.stdout.flush()
-        time.sleep(0.2)
+        for batch in _sort_batches(sort_id, page_pool):
+            with lock:
+                fresh = [it for it in batch if it["slug"] not in seen]
+                seen.update(it["slug"] for it in fresh)
+                all_items.extend(fresh)
+            added += len(fresh)
+            if fresh and on_batch:
+                on_batch(fresh)
+        return sort_id, added
+
+    with ThreadPoolExecutor(max_workers=workers * SORT_WINDOW) as page_pool:
+        with ThreadPoolExecutor(max_workers=workers) as sort_pool:
+            futs = [sort_pool.submit(_run, sid) for sid in _YM_SORTS]
+            for done, fut in enumerate(as_completed(futs), 1):
+                sort_id, added = fut.result()
+                sys.stdout.write(
+                    f"  {UI.CYAN}[{done}/{len(_YM_SORTS)}] {_YM_SORTS[sort_id]}"
+                    f" — {added} nuevas — {len(all_items)} total{UI.END}   \r"
+                )
+                sys.stdout.flush()
 
     print(f"\n  {UI.GREEN}✔ {len(all_items)} series cargadas{UI.END}   ")
     return all_items
@@ -874,7 +832,7 @@ class DownloaderYumanhua(BaseDownloader):
     HAS_SEARCH = True
 
     def __init__(self):
-        _load_seeds()
+        SEEDS.get()  # disco/hardcoded al instante; refresca en 2º plano si caducó
         self.logic = YumanhuaLogic()
 
     def search(self, query: str) -> list[dict]:
@@ -1162,7 +1120,7 @@ def menu_catalog(logic: YumanhuaLogic) -> None:
     UI.header()
     print(f"\n {UI.CYAN}Cargando catálogo completo del sitio...{UI.END}\n")
 
-    all_items = load_full_catalog(workers=8)
+    all_items = load_full_catalog()
 
     if not all_items:
         # Fallback: si no se detectó URL de catálogo, ofrecer búsqueda directa
@@ -1246,14 +1204,8 @@ def menu_catalog(logic: YumanhuaLogic) -> None:
 
 # ─── MAIN ─────────────────────────────────────────────────────────────────────
 def main():
-    print(
-        f"{UI.CYAN}[*] Cargando semillas XOR desde all2.js...{UI.END}",
-        end="",
-        flush=True,
-    )
-    seeds = _load_seeds()
-    src = "all2.js" if len(seeds) != len(_SEEDS_FALLBACK_HEX) else "hardcoded"
-    print(f"\r{UI.GREEN}[OK] {len(seeds)} semillas cargadas ({src}).{' ' * 20}{UI.END}")
+    seeds = SEEDS.get()
+    print(f"{UI.GREEN}[OK] {len(seeds)} semillas cargadas ({SEEDS.source}).{UI.END}")
 
     logic = YumanhuaLogic()
 
@@ -1320,9 +1272,10 @@ def main():
             menu_catalog(logic)
 
         elif op == "4":
-            _seeds_cache.clear()
-            _ = _load_seeds()
-            print(f"{UI.GREEN}[OK] {len(_seeds_cache)} semillas recargadas.{UI.END}")
+            _ = SEEDS.refresh()
+            print(
+                f"{UI.GREEN}[OK] {len(SEEDS.get())} semillas recargadas ({SEEDS.source}).{UI.END}"
+            )
             time.sleep(1.5)
 
         elif op == "5":
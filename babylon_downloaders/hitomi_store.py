@@ -0,0 +1,333 @@
+"""
+hitomi_store.py — Persistencia local de hitomi: espejo incremental de los
+índices nozomi y caché acotada de metadatos de galerías (MetaCache).
+
+Los .nozomi de tags/idiomas solo crecen por delante (IDs nuevos al
+principio). En vez de bajar el fichero entero en cada búsqueda:
+  - se guarda una copia en disco (mismo formato: uint32 big-endian);
+  - dentro de MIRROR_TTL se lee del disco sin tocar la red;
+  - al caducar se pide solo la cabeza con Range y se antepone lo nuevo
+    hasta encontrar el primer ID conocido;
+  - si el tamaño resultante no cuadra con Content-Range (el índice cambió
+    por dentro, no solo por delante) se descarga entero otra vez.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from common import cache_path
+
+MIRROR_DIR = "hitomi_nozomi"
+MIRROR_TTL = 15 * 60
+HEAD_IDS = 4096  # 16 KB: cubre días de novedades en casi cualquier tag
+
+CONTENT_RANGE_RE = re.compile(r"/\s*(\d+)\s*$")
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def mirror_path(url: str) -> str:
+    folder = cache_path(MIRROR_DIR)
+    os.makedirs(folder, exist_ok=True)
+    name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:20] + ".nozomi"
+    return os.path.join(folder, name)
+
+
+def grows_at_front(url: str) -> bool:
+    """Índices por fecha de subida / tag. Los de popularidad se reordenan."""
+    return "/popular/" not in url and "date-published" not in url
+
+
+# ── Disco ─────────────────────────────────────────────────────────────────────
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            # Un solo read() del tamaño justo: quien llama necesita bytes
+            # (cabecera, find, array), así que un mmap acabaría copiándose
+            # entero igualmente
+            data = f.read()
+        return data if len(data) >= 4 else None
+    except OSError:
+        return None
+
+
+def _write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _is_fresh(path: str) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) < MIRROR_TTL
+    except OSError:
+        return False
+
+
+# ── Red ───────────────────────────────────────────────────────────────────────
+
+
+def _aligned_find(head: bytes, key: bytes) -> int:
+    """Offset (múltiplo de 4) de `key` en `head`, o -1."""
+    pos = head.find(key)
+    while pos >= 0 and pos % 4:
+        pos = head.find(key, pos + 1)
+    return pos
+
+
+def _full(sess, url: str) -> Optional[bytes]:
+    """Índice entero; b"" si el servidor responde que no existe o está vacío,
+    None si no hay respuesta útil (red, 5xx…)."""
+    try:
+        r = sess.get(url, timeout=30)
+    except Exception:
+        return None
+    if r.status_code == 404:
+        return b""
+    if r.status_code != 200:
+        return None
+    return r.content if len(r.content) >= 4 else b""
+
+
+def _sync(sess, url: str, local: bytes) -> Optional[bytes]:
+    """
+    Índice actualizado a partir de la copia local; None si la red falla
+    (el llamador sigue con la copia local).
+    """
+    key = local[:4]
+    n = HEAD_IDS
+    while True:
+        try:
+            r = sess.get(
+                url, headers={"Range": f"bytes=0-{n * 4 - 1}"}, timeout=15
+            )
+        except Exception:
+            return None
+        if r.status_code == 200:  # sin soporte de Range: vino entero
+            return r.content if len(r.content) >= 4 else None
+        if r.status_code != 206:
+            return None
+        m = CONTENT_RANGE_RE.search(r.headers.get("Content-Range", ""))
+        if not m:
+            return _full(sess, url)
+        total = int(m.group(1))
+        head = r.content
+        k = _aligned_find(head, key)
+        if k >= 0:
+            merged = head[:k] + local
+            # Solo vale si el índice creció exclusivamente por delante
+            return merged if len(merged) == total else _full(sess, url)
+        if len(head) >= total:
+            return head  # la cabeza ya era el fichero completo
+        if n * 4 * 4 >= total:
+            return _full(sess, url)
+        n *= 4
+
+
+def mirror_fetch(sess, url: str) -> Optional[bytes]:
+    """
+    Bytes del índice `url` (uint32 big-endian) desde el espejo local,
+    sincronizándolo si caducó. b"" si el servidor dice que no existe (o
+    está vacío); None si no hay copia local ni red.
+    """
+    path = mirror_path(url)
+    with _lock_for(path):
+        local = _read(path)
+        if local is not None and _is_fresh(path):
+            return local
+        data = _sync(sess, url, local) if local else _full(sess, url)
+        if data is None:
+            return local
+        if not data:
+            return data  # respondió: ese índice ya no tiene nada
+        if data == local:
+            try:
+                os.utime(path)  # sin cambios: renueva el TTL
+            except OSError:
+                pass
+        else:
+            _write(path, data)
+        return data
+
+
+# ══════════════════════════════════════════════════════════════
+#  METADATOS DE GALERÍAS
+#
+#  De galleryinfo solo se guarda lo que se usa: título y, por página,
+#  hash + si tiene avif (la extensión sale de ahí). En memoria, LRU
+#  acotado; en disco, SQLite con los más recientes (acotado también).
+# ══════════════════════════════════════════════════════════════
+META_DB = "hitomi_meta.sqlite3"
+META_MEM_ITEMS = 2000
+META_DISK_ROWS = 200_000
+
+
+def compact_meta(info: dict) -> tuple[str, tuple[tuple[str, bool], ...]]:
+    files = tuple(
+        (str(f.get("hash", "")), bool(f.get("hasavif")))
+        for f in info.get("files", [])
+        if isinstance(f, dict)
+    )
+    return str(info.get("title", "")), files
+
+
+class MetaCache:
+    def __init__(
+        self,
+        db_name: str = META_DB,
+        mem_items: int = META_MEM_ITEMS,
+        disk_rows: int = META_DISK_ROWS,
+    ):
+        self._db_name = db_name
+        self._mem_items = mem_items
+        self._disk_rows = disk_rows
+        self._mem: OrderedDict[int, tuple[str, tuple[tuple[str, bool], ...]]] = (
+            OrderedDict()
+        )
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_failed = False
+        self._lock = threading.Lock()
+        self.mem_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ── SQLite (perezoso) ─────────────────────────────────────
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and not self._db_failed:
+            try:
+                db = sqlite3.connect(cache_path(self._db_name), check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS galleries ("
+                    "gid INTEGER PRIMARY KEY, title TEXT, files TEXT, ts REAL)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS galleries_ts ON galleries(ts)")
+                self._db = db
+                self._prune()
+            except sqlite3.Error:
+                self._db_failed = True  # sin disco: solo memoria
+        return self._db
+
+    def _prune(self) -> None:
+        db = self._db
+        if db is None:
+            return
+        (n,) = db.execute("SELECT COUNT(*) FROM galleries").fetchone()
+        if n > self._disk_rows:
+            db.execute(
+                "DELETE FROM galleries WHERE gid IN "
+                "(SELECT gid FROM galleries ORDER BY ts LIMIT ?)",
+                (n - self._disk_rows,),
+            )
+            db.commit()
+
+    # ── memoria ───────────────────────────────────────────────
+    def _remember(self, gid: int, rec) -> None:
+        self._mem[gid] = rec
+        self._mem.move_to_end(gid)
+        while len(self._mem) > self._mem_items:
+            self._mem.popitem(last=False)
+
+    # ── API ───────────────────────────────────────────────────
+    def get(self, gid: int):
+        """(título, ((hash, hasavif), …)) o None."""
+        with self._lock:
+            rec = self._mem.get(gid)
+            if rec is not None:
+                self._mem.move_to_end(gid)
+                self.mem_hits += 1
+                return rec
+        return self.get_many([gid]).get(gid)
+
+    def get_many(self, gids: list[int]) -> dict[int, tuple]:
+        """Consulta en bloque: memoria y, para lo que falte, un SELECT."""
+        out: dict[int, tuple] = {}
+        with self._lock:
+            pending: list[int] = []
+            for gid in gids:
+                rec = self._mem.get(gid)
+                if rec is not None:
+                    self._mem.move_to_end(gid)
+                    out[gid] = rec
+                elif gid not in out:
+                    pending.append(gid)
+            db = self._conn() if pending else None
+            if db is not None:
+                for i in range(0, len(pending), 500):
+                    chunk = pending[i : i + 500]
+                    rows = db.execute(
+                        "SELECT gid, title, files FROM galleries WHERE gid IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for gid, title, files in rows:
+                        rec = (title, tuple((h, bool(a)) for h, a in json.loads(files)))
+                        out[gid] = rec
+                        self._remember(gid, rec)
+            found_disk = sum(1 for g in pending if g in out)
+            self.disk_hits += found_disk
+            self.mem_hits += len(out) - found_disk
+            self.misses += len(pending) - found_disk
+        return out
+
+    def put_many(self, infos: dict[int, dict]) -> None:
+        """Guarda galleryinfo completos (se compactan) en memoria y disco."""
+        if not infos:
+            return
+        now = time.time()
+        rows = []
+        with self._lock:
+            for gid, info in infos.items():
+                rec = compact_meta(info)
+                self._remember(gid, rec)
+                files = json.dumps([[h, int(a)] for h, a in rec[1]])
+                rows.append((gid, rec[0], files, now))
+            db = self._conn()
+            if db is not None:
+                try:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO galleries (gid, title, files, ts) "
+                        "VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+                    db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def put(self, gid: int, info: dict) -> None:
+        self.put_many({gid: info})
+
+    def stats(self) -> dict[str, float]:
+        total = self.mem_hits + self.disk_hits + self.misses
+        return {
+            "mem_hits": self.mem_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.mem_hits + self.disk_hits) / total if total else 0.0,
+            "mem_items": len(self._mem),
+        }
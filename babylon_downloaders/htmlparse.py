@@ -0,0 +1,80 @@
+"""
+htmlparse.py — Parseo rápido con lxml.html para los downloaders HTML.
+
+BeautifulSoup construye un árbol de objetos Python por página; lxml lo hace
+en C y las consultas XPath también corren en C. Para listados grandes
+(catálogos, listas de capítulos) es la mayor parte del CPU.
+
+  - document(html): árbol lxml o None (sin lxml o HTML ilegible). Con None
+    cada parser cae a su versión BeautifulSoup de siempre. lxml está en
+    requirements.txt: varios downloaders usan además BeautifulSoup(…,
+    "lxml"), así que el None por falta de lxml es solo una red de seguridad.
+  - text()/joined_text(): equivalentes de get_text(strip=True) y
+    get_text(sep, strip=True).
+  - has_class(): predicado XPath para `.clase` (sin depender de cssselect).
+  - img_src(): URL de portada de una tarjeta, venga de lxml o de BS4.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+from urllib.parse import urljoin
+
+try:
+    import lxml.html as _lxml_html
+    from lxml import etree as _etree
+
+    HAS_LXML = True
+except ImportError:
+    _lxml_html = None
+    _etree = None
+    HAS_LXML = False
+
+
+def document(html: str) -> Optional[Any]:
+    """Raíz lxml.html del documento, o None si hay que usar BeautifulSoup."""
+    if not HAS_LXML or not html or not html.strip():
+        return None
+    try:
+        return _lxml_html.document_fromstring(html)
+    except (_etree.ParserError, ValueError):
+        # ValueError: str con declaración <?xml encoding=…?>
+        return None
+
+
+def text(el) -> str:
+    """get_text(strip=True): cada trozo de texto sin espacios, concatenados."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def joined_text(el, sep: str = " ") -> str:
+    """get_text(sep, strip=True): trozos no vacíos unidos con `sep`."""
+    return sep.join(s for s in (t.strip() for t in el.itertext()) if s)
+
+
+def has_class(name: str) -> str:
+    """Predicado XPath equivalente al selector CSS `.name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def first(el, xpath: str) -> Optional[Any]:
+    """Primer resultado de `xpath` (en orden de documento) o None."""
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+
+_LAZY_SRC = ("data-original", "data-src", "data-lazy-src", "src")
+
+
+def img_src(img, base: str = "") -> str:
+    """
+    URL absoluta de un <img> (lxml o BS4), atributos lazy-load primero.
+    "" si no hay imagen o solo un placeholder data:.
+    """
+    if img is None:
+        return ""
+    for attr in _LAZY_SRC:
+        src = (img.get(attr) or "").strip()
+        if src and not src.startswith("data:"):
+            return urljoin(base, src) if base else src
+    return ""
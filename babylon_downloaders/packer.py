@@ -0,0 +1,134 @@
+"""
+packer.py — Decodificador p.a.c.k.e.r compartido (dumanwu, yumanhua, manhuagui).
+
+  - Patrones precompilados una sola vez a nivel de módulo.
+  - decode(): tabla token→palabra construida una vez por llamada (un token por
+    entrada de la symtab) en vez de des-codificar cada token del payload.
+  - unpack_script()/memoized(): memo LRU acotado, con clave = hash del script
+    empaquetado. Los wrappers se repiten entre capítulos de una misma serie.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+TOKEN_RE = re.compile(r"\b[0-9A-Za-z]+\b")
+# Con grupo: split() alterna [texto, token, texto, token, …, texto]
+_SPLIT_RE = re.compile(r"\b([0-9A-Za-z]+)\b")
+DETECT_RE = re.compile(
+    r"(eval|window\['eval'\])\s*\(\s*function\s*\(\s*p\s*,\s*a\s*,\s*c\s*,\s*k\s*,\s*e\s*,",
+    re.I,
+)
+# Argumentos de la llamada final: '...' (con escapes) o enteros.
+# Bucle "desenrollado": avanza por tramos sin escapes en vez de carácter a
+# carácter con alternancia (mismo lenguaje, ~10x menos backtracking).
+ARGS_RE = re.compile(r"'([^'\\]*(?:\\.[^'\\]*)*)'|(\d+)")
+
+_B62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_B95 = (
+    " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
+)
+
+MEMO_SIZE = 64
+_memo: OrderedDict[tuple[str, bytes], Optional[str]] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+# ── Decodificación ────────────────────────────────────────────────────────────
+
+
+def _encode(n: int, radix: int, alphabet: str) -> str:
+    if n < radix:
+        return alphabet[n]
+    out: list[str] = []
+    while n:
+        n, r = divmod(n, radix)
+        out.append(alphabet[r])
+    return "".join(reversed(out))
+
+
+def word_table(radix: int, symtab: list[str]) -> dict[str, str]:
+    """Token codificado (forma canónica del packer) → palabra de la symtab."""
+    alphabet = _B95 if radix > 62 else _B62
+    return {
+        _encode(i, radix, alphabet): word for i, word in enumerate(symtab) if word
+    }
+
+
+def detect(source: str) -> bool:
+    return DETECT_RE.search(source) is not None
+
+
+def decode(payload: str, radix: int, symtab: list[str]) -> str:
+    """
+    Sustituye cada token del payload por su palabra de la symtab.
+    Como el JS, solo cuentan los tokens canónicos (los que produce e(c)):
+    "01" o "A" con radix ≤ 36 no están en la tabla y se quedan tal cual.
+    """
+    get = word_table(radix, symtab).get
+    parts = _SPLIT_RE.split(payload)
+    # Sin callback por token: una lista por comprensión sobre los impares
+    parts[1::2] = [get(t, t) for t in parts[1::2]]
+    return "".join(parts)
+
+
+def extract_args(script: str) -> Optional[tuple[str, int, int, str]]:
+    """(payload, radix, count, symtab) de `}('...',62,N,'a|b|c'...)`."""
+    try:
+        start = script.rindex("}(") + 2
+        vals: list[int | str] = [
+            int(n) if n else s for s, n in ARGS_RE.findall(script, start)
+        ]
+        if len(vals) >= 4:
+            return str(vals[0]), int(vals[1]), int(vals[2]), str(vals[3])
+    except (ValueError, IndexError):
+        pass
+    return None
+
+
+# ── Memo ──────────────────────────────────────────────────────────────────────
+
+
+def script_key(script: str) -> bytes:
+    return hashlib.blake2b(
+        script.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def memoized(script: str, fn: Callable[[str], Optional[str]]) -> Optional[str]:
+    """fn(script) con memo LRU de MEMO_SIZE entradas (None también se cachea)."""
+    key = (f"{fn.__module__}.{fn.__qualname__}", script_key(script))
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    result = fn(script)
+    with _memo_lock:
+        _memo[key] = result
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
+
+
+def _unpack_args(script: str) -> Optional[str]:
+    args = extract_args(script)
+    if not args:
+        return None
+    p, radix, _count, k = args
+    return decode(p, radix, k.split("|"))
+
+
+def unpack_script(script: str) -> Optional[str]:
+    """Script `eval(function(p,a,c,k,e,d)…)` → código desempaquetado (memo)."""
+    return memoized(script, _unpack_args)
+
+
+def clear_memo() -> None:
+    with _memo_lock:
+        _memo.clear()
@@ -0,0 +1,311 @@
+"""
+result_cache.py — Caché acotada de resultados del panel: búsquedas,
+catálogos completos y listas de IDs.
+
+  - TTL por tipo de entrada (KIND_TTL): una búsqueda caduca antes que un
+    catálogo completo, y una parcial (con fallos de red) al minuto.
+  - Presupuesto de memoria aproximado (MEM_BUDGET): al pasarse se expulsan
+    las entradas usadas hace más tiempo (LRU).
+  - Representación compacta: una lista de dicts con las mismas claves y
+    valores simples se guarda como una tupla de claves + una tupla por fila
+    (CompactRows); una lista de enteros, como array('q').
+  - Lo expulsado por tamaño (no lo caducado) se vuelca a disco en JSON y
+    vuelve a memoria en el siguiente get() si sigue vigente.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Iterable, Optional
+
+from common import CACHE_DIR, load_json_cache, save_json_cache
+
+MEM_BUDGET = 64 * 1024 * 1024
+KIND_TTL = {
+    "search": 15 * 60,
+    "partial": 60,  # resultado con términos sin respuesta: reintento pronto
+    "catalog": 60 * 60,
+    "ids": 60 * 60,
+}
+SPILL_PREFIX = "results_"
+SPILL_MIN_ITEMS = 200  # entradas más pequeñas no compensa volcarlas
+SPILL_MIN_TTL = 60  # ni las que están a punto de caducar
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class CompactRows(Sequence):
+    """
+    Lista de dicts homogéneos guardada como filas de tuplas. Indexar o
+    trocear devuelve dicts nuevos: solo se materializa lo que se pide.
+    """
+
+    __slots__ = ("keys", "rows")
+
+    def __init__(self, keys: tuple, rows: tuple):
+        self.keys = keys
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [dict(zip(self.keys, r)) for r in self.rows[i]]
+        return dict(zip(self.keys, self.rows[i]))
+
+
+def compact(items: Iterable) -> Sequence:
+    """Forma compacta de `items` (CompactRows, array o tupla)."""
+    if isinstance(items, (CompactRows, array)):
+        return items
+    items = list(items)
+    if not items:
+        return ()
+    if all(type(x) is int for x in items):
+        try:
+            return array("q", items)
+        except OverflowError:
+            return tuple(items)
+    first = items[0]
+    if not isinstance(first, dict):
+        return tuple(items)
+    keys = tuple(first)
+    rows = []
+    for it in items:
+        if not isinstance(it, dict) or tuple(it) != keys:
+            return tuple(items)
+        vals = tuple(it.values())
+        if not all(isinstance(v, _SCALARS) for v in vals):
+            return tuple(items)
+        rows.append(vals)
+    return CompactRows(keys, tuple(rows))
+
+
+def _deep_size(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    elif isinstance(obj, tuple):
+        size += sum(sys.getsizeof(v) for v in obj)
+    return size
+
+
+def approx_size(value: Sequence) -> int:
+    """Bytes aproximados: media de una muestra de filas × nº de filas."""
+    if isinstance(value, array):
+        return sys.getsizeof(value)
+    rows = value.rows if isinstance(value, CompactRows) else value
+    n = len(rows)
+    if not n:
+        return sys.getsizeof(rows)
+    sample = rows[:: max(1, n // 32)][:32]
+    per_row = sum(_deep_size(r) for r in sample) / len(sample)
+    return int(per_row * n) + sys.getsizeof(rows)
+
+
+# ── Disco ─────────────────────────────────────────────────────────────────────
+
+
+def _spill_name(key: str) -> str:
+    return SPILL_PREFIX + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + ".json"
+
+
+def _encode(key: str, value: Sequence, expires: float, kind: str) -> dict:
+    data: dict = {"key": key, "expires": expires, "kind": kind}
+    if isinstance(value, CompactRows):
+        data.update(fmt="rows", keys=list(value.keys), data=value.rows)
+    elif isinstance(value, array):
+        data.update(fmt="ids", data=value.tolist())
+    else:
+        data.update(fmt="list", data=list(value))
+    return data
+
+
+def _decode(data: dict) -> Optional[Sequence]:
+    fmt, rows = data.get("fmt"), data.get("data")
+    if not isinstance(rows, list):
+        return None
+    if fmt == "rows":
+        return CompactRows(tuple(data.get("keys") or ()), tuple(map(tuple, rows)))
+    if fmt == "ids":
+        return array("q", rows)
+    if fmt == "list":
+        return tuple(rows)
+    return None
+
+
+def _remove(name: str) -> None:
+    try:
+        os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass
+
+
+class ResultCache:
+    def __init__(
+        self,
+        budget: int = MEM_BUDGET,
+        ttl: Optional[dict[str, float]] = None,
+        spill: bool = True,
+    ):
+        self._budget = budget
+        self._ttl = dict(KIND_TTL if ttl is None else ttl)
+        self._spill = spill
+        # key → (valor compacto, caduca, tipo, bytes)
+        self._entries: OrderedDict[str, tuple[Sequence, float, str, int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._pruned = False
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ── memoria ───────────────────────────────────────────────
+    def _drop(self, key: str) -> None:
+        ent = self._entries.pop(key, None)
+        if ent is not None:
+            self._bytes -= ent[3]
+
+    def _evict(self, keep: str) -> list[tuple[str, tuple]]:
+        """Caducadas fuera; luego LRU hasta el presupuesto. Devuelve lo expulsado."""
+        now = time.time()
+        for k in [k for k, e in self._entries.items() if e[1] <= now and k != keep]:
+            self._drop(k)
+        evicted = []
+        while self._bytes > self._budget and len(self._entries) > 1:
+            k = next(iter(self._entries))
+            if k == keep:
+                self._entries.move_to_end(k)
+                continue
+            evicted.append((k, self._entries[k]))
+            self._drop(k)
+        return evicted
+
+    # ── disco ─────────────────────────────────────────────────
+    def _spill_out(self, evicted: list[tuple[str, tuple]]) -> None:
+        if not self._spill:
+            return
+        now = time.time()
+        for key, (value, expires, kind, _size) in evicted:
+            if len(value) < SPILL_MIN_ITEMS or expires - now < SPILL_MIN_TTL:
+                continue
+            try:
+                save_json_cache(_spill_name(key), _encode(key, value, expires, kind))
+            except (TypeError, ValueError):
+                _remove(_spill_name(key))  # valores no serializables
+        if evicted and not self._pruned:
+            self._pruned = True
+            self._prune_spill()
+
+    def _prune_spill(self) -> None:
+        """Borra volcados de sesiones anteriores ya caducados."""
+        limit = time.time() - max(self._ttl.values(), default=0)
+        for path in glob.glob(os.path.join(CACHE_DIR, SPILL_PREFIX + "*.json")):
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _spill_in(self, key: str) -> Optional[Sequence]:
+        if not self._spill:
+            return None
+        name = _spill_name(key)
+        data = load_json_cache(name)
+        if data is None:
+            return None
+        _remove(name)  # vuelve a memoria; si se expulsa otra vez se reescribe
+        expires = data.get("expires")
+        if data.get("key") != key or not isinstance(expires, (int, float)):
+            return None
+        if expires <= time.time():
+            return None
+        value = _decode(data)
+        if value is None:
+            return None
+        self._insert(key, value, float(expires), str(data.get("kind", "search")))
+        return value
+
+    # ── API ───────────────────────────────────────────────────
+    def _insert(self, key: str, value: Sequence, expires: float, kind: str) -> None:
+        size = approx_size(value)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, expires, kind, size)
+            self._bytes += size
+            evicted = self._evict(key)
+        self._spill_out(evicted)
+
+    def get(self, key: str) -> Optional[Sequence]:
+        """Valor compacto vigente (memoria o disco) o None."""
+        now = time.time()
+        with self._lock:
+            ent = self._entries.get(key)
+            if ent is not None:
+                if ent[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return ent[0]
+                self._drop(key)
+        value = self._spill_in(key)
+        with self._lock:
+            if value is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        return value
+
+    def put(self, key: str, items: Iterable, kind: str = "search") -> Sequence:
+        """Guarda `items` (se compactan) y devuelve la forma compacta."""
+        value = compact(items)
+        ttl = self._ttl.get(kind, self._ttl.get("search", 0))
+        self._insert(key, value, time.time() + ttl, kind)
+        return value
+
+    def get_or_load(
+        self, key: str, loader: Callable[[], Iterable], kind: str = "search"
+    ) -> Sequence:
+        """get(); si falta, loader() una sola vez aunque lo pidan varios hilos."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                value = self.put(key, loader(), kind)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return value
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+        if self._spill:
+            _remove(_spill_name(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,155 @@
+"""
+thumb_cache.py — Miniaturas de portada en disco para el navegador del panel.
+
+  - Un fichero por URL (sha1) en CACHE_DIR/thumbs, ya reescalado: lo que se
+    guarda es la miniatura, no la portada original.
+  - Tamaño total acotado (DISK_BUDGET): al pasarse se borran las menos
+    usadas (mtime, que get() refresca) hasta quedar en PRUNE_TO.
+  - fetch(): descarga con el limitador por host de common y, además, un
+    máximo de peticiones simultáneas por host (HOST_CONCURRENCY) para que
+    una página llena de portadas no sature al sitio ni a sus descargas.
+
+Sin Qt: decodificar y escalar lo hace quien llama (el panel).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from common import CACHE_DIR, host_limiter
+
+THUMB_DIR = os.path.join(CACHE_DIR, "thumbs")
+DISK_BUDGET = 96 * 1024 * 1024
+PRUNE_TO = 0.8  # fracción del presupuesto que queda tras podar
+HOST_CONCURRENCY = 4
+FAIL_RETRY = 10 * 60  # una portada caída no se reintenta antes de esto
+
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc or url
+    with _host_slots_lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = _host_slots[host] = threading.BoundedSemaphore(HOST_CONCURRENCY)
+        return sem
+
+
+def _path(url: str) -> str:
+    return os.path.join(THUMB_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+
+class ThumbCache:
+    def __init__(self, budget: int = DISK_BUDGET):
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._bytes: Optional[int] = None  # se calcula al primer put()
+        self._failed: dict[str, float] = {}
+
+    # ── disco ─────────────────────────────────────────────────
+    def get(self, url: str) -> Optional[bytes]:
+        path = _path(url)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU: la poda mira el mtime
+            return data or None
+        except OSError:
+            return None
+
+    def put(self, url: str, data: bytes) -> None:
+        path = _path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            old = os.path.getsize(path)  # se reemplaza: no suma dos veces
+        except OSError:
+            old = 0
+        try:
+            os.makedirs(THUMB_DIR, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._scan_size()
+            else:
+                self._bytes += len(data) - old
+            if self._bytes > self._budget:
+                self._bytes = self._prune()
+
+    def _scan_size(self) -> int:
+        try:
+            return sum(e.stat().st_size for e in os.scandir(THUMB_DIR) if e.is_file())
+        except OSError:
+            return 0
+
+    def _prune(self) -> int:
+        """Borra las miniaturas menos usadas; devuelve el tamaño restante."""
+        try:
+            entries = [
+                (e.stat().st_mtime, e.stat().st_size, e.path)
+                for e in os.scandir(THUMB_DIR)
+                if e.is_file()
+            ]
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in entries)
+        target = int(self._budget * PRUNE_TO)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+    # ── red ───────────────────────────────────────────────────
+    def failed_recently(self, url: str) -> bool:
+        with self._lock:
+            ts = self._failed.get(url)
+        return ts is not None and time.time() - ts < FAIL_RETRY
+
+    def fetch(
+        self, url: str, download: Callable[[str], Optional[bytes]]
+    ) -> Optional[bytes]:
+        """
+        Bytes originales de la portada con `download(url)` (normalmente
+        dl_image del downloader: misma sesión, cabeceras y referer del
+        sitio), respetando los límites por host. None si falla.
+        """
+        if self.failed_recently(url):
+            return None
+        with _host_slot(url):
+            host_limiter(url).wait()
+            try:
+                data = download(url)
+            except Exception:
+                data = None
+        if not data:
+            with self._lock:
+                self._failed[url] = time.time()
+            return None
+        return data
+
+
+_thumb_cache: Optional[ThumbCache] = None
+_thumb_cache_lock = threading.Lock()
+
+
+def get_thumb_cache() -> ThumbCache:
+    global _thumb_cache
+    with _thumb_cache_lock:
+        if _thumb_cache is None:
+            _thumb_cache = ThumbCache()
+        return _thumb_cache
@@ -0,0 +1,209 @@
+"""
+xorcrypt.py — XOR + base64 compartido por dumanwu y yumanhua.
+
+Ambos sitios cifran la lista de imágenes como base64(xor(base64(json), seed))
+con una de ~10 semillas de all2.js. Aquí:
+  - xor_bytes():      XOR de todo el buffer en una sola operación de enteros
+                      (int.from_bytes), sin generador por byte.
+  - iter_decrypted(): prueba todas las semillas en una pasada; descarta las
+                      incorrectas mirando solo un prefijo antes de descifrar
+                      el payload completo.
+  - SeedStore:        semillas persistidas en disco con timestamp. Arranque
+                      sin red; refresco en segundo plano al caducar y
+                      refresco forzado solo si fallan todas las semillas.
+"""
+
+from __future__ import annotations
+
+import base64
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from common import load_json_cache, save_json_cache
+
+# Bytes válidos en el texto base64 intermedio (resultado del XOR correcto).
+# Se toleran saltos de línea: b64decode los ignora igual que antes.
+_B64_ALPHABET = frozenset(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\r\n"
+)
+
+# Bytes del prefijo que se comprueban antes del descifrado completo.
+# Con una semilla incorrecta cada byte cae en el alfabeto con p≈1/4:
+# 32 bytes → ~1e-19 de falso positivo.
+PROBE_BYTES = 32
+
+
+def _repeat_key(key: bytes, n: int) -> bytes:
+    reps, rest = divmod(n, len(key))
+    return key * reps + key[:rest]
+
+
+def xor_bytes(data: bytes, key: bytes) -> bytes:
+    """data ^ key (key repetida cíclicamente) en una sola operación."""
+    n = len(data)
+    if not n or not key:
+        return data
+    x = int.from_bytes(data, "little") ^ int.from_bytes(_repeat_key(key, n), "little")
+    return x.to_bytes(n, "little")
+
+
+def candidate_seeds(raw: bytes, seeds: list[bytes]) -> list[bytes]:
+    """
+    Semillas cuyo XOR sobre el prefijo de `raw` produce texto base64.
+    Conserva el orden original de `seeds`.
+    """
+    probe = raw[:PROBE_BYTES]
+    if not probe:
+        return []
+    head = int.from_bytes(probe, "little")
+    n = len(probe)
+    out: list[bytes] = []
+    for seed in seeds:
+        if not seed:
+            continue
+        plain = (head ^ int.from_bytes(_repeat_key(seed, n), "little")).to_bytes(
+            n, "little"
+        )
+        if _B64_ALPHABET.issuperset(plain):
+            out.append(seed)
+    return out
+
+
+def _b64_lenient(data: bytes) -> bytes:
+    return base64.b64decode(data + b"=="[: (4 - len(data) % 4) % 4])
+
+
+def iter_decrypted(raw: bytes, seeds: list[bytes]) -> Iterator[str]:
+    """
+    Descifra `raw` (ya decodificado de base64) con cada semilla plausible y
+    devuelve el texto final (utf-8 tolerante) en el orden de `seeds`.
+    """
+    for seed in candidate_seeds(raw, seeds):
+        try:
+            final = _b64_lenient(xor_bytes(raw, seed))
+        except Exception:
+            continue
+        yield final.decode("utf-8", errors="ignore")
+
+
+# ── Semillas persistidas ──────────────────────────────────────────────────────
+
+SEED_TTL = 24 * 3600  # all2.js cambia muy de vez en cuando
+# Pausa mínima entre refrescos (forzados o fallidos) para no martillear
+# el sitio cuando un capítulo no se puede descifrar por otro motivo.
+REFRESH_COOLDOWN = 5 * 60
+
+
+def _parse_hex(hexes: list[str]) -> list[bytes]:
+    seeds: list[bytes] = []
+    for h in hexes:
+        try:
+            seeds.append(bytes.fromhex(h))
+        except (TypeError, ValueError):
+            pass
+    return seeds
+
+
+class SeedStore:
+    """
+    Semillas XOR de un sitio: memoria → disco → hardcoded, con la red fuera
+    del camino crítico.
+
+    `fetch()` descarga y extrae las semillas de all2.js; debe devolver []
+    si falla (nunca las hardcoded, esas las pone el store).
+    """
+
+    def __init__(
+        self,
+        site: str,
+        fetch: Callable[[], list[bytes]],
+        fallback_hex: list[str],
+        ttl: float = SEED_TTL,
+    ):
+        self._file = f"xor_seeds_{site}.json"
+        self._fetch = fetch
+        self._fallback = _parse_hex(fallback_hex)
+        self._ttl = ttl
+        self._seeds: list[bytes] = []
+        self._stamp = 0.0  # momento de extracción de self._seeds
+        self._last_try = 0.0
+        self._loaded = False
+        self.source = "hardcoded"  # hardcoded | disco | all2.js
+        self._lock = threading.Lock()
+        self._refreshing: Optional[threading.Thread] = None
+
+    # ── lectura ───────────────────────────────────────────────
+    def get(self) -> list[bytes]:
+        """Semillas actuales sin bloquear; lanza refresco en 2º plano si caducan."""
+        with self._lock:
+            if not self._loaded:
+                self._load_disk()
+            seeds = self._seeds or self._fallback
+            stale = time.time() - self._stamp > self._ttl
+        if stale:
+            self._refresh_async()
+        return seeds
+
+    def _load_disk(self) -> None:
+        self._loaded = True
+        data = load_json_cache(self._file) or {}
+        seeds = _parse_hex(data.get("seeds") or [])
+        if seeds:
+            self._seeds = seeds
+            self._stamp = float(data.get("ts") or 0)
+            self.source = "disco"
+
+    # ── refresco ──────────────────────────────────────────────
+    def _do_refresh(self) -> bool:
+        self._last_try = time.time()
+        try:
+            seeds = self._fetch()
+        except Exception:
+            seeds = []
+        if not seeds:
+            return False
+        with self._lock:
+            self._seeds, self._stamp = seeds, time.time()
+            self.source = "all2.js"
+        save_json_cache(
+            self._file, {"ts": self._stamp, "seeds": [s.hex() for s in seeds]}
+        )
+        return True
+
+    def _refresh_async(self) -> None:
+        with self._lock:
+            running = self._refreshing is not None and self._refreshing.is_alive()
+            if running or time.time() - self._last_try < REFRESH_COOLDOWN:
+                return
+            self._last_try = time.time()
+            self._refreshing = threading.Thread(target=self._do_refresh, daemon=True)
+            self._refreshing.start()
+
+    def refresh(self, force: bool = True) -> bool:
+        """
+        Refresco síncrono. Si ya hay uno en 2º plano, lo espera en vez de
+        repetir la descarga. Devuelve True si las semillas cambiaron.
+        """
+        before = self._seeds
+        t = self._refreshing
+        if t is not None and t.is_alive():
+            t.join()
+        elif force or time.time() - self._last_try >= REFRESH_COOLDOWN:
+            self._do_refresh()
+        return self._seeds != before
+
+    # ── descifrado ────────────────────────────────────────────
+    def decrypt(self, fn: Callable[[list[bytes]], list[str]]) -> list[str]:
+        """
+        fn(semillas) con las cacheadas; solo si no devuelve nada se fuerza
+        un refresco (respetando REFRESH_COOLDOWN) y se reintenta.
+        """
+        seeds = self.get()
+        result = fn(seeds)
+        if result:
+            return result
+        self.refresh(force=False)
+        fresh = self._seeds or self._fallback
+        # Puede que un refresco en 2º plano ya las cambiara entre medias
+        return fn(fresh) if fresh != seeds else result
@@ -12,8 +12,12 @@ PAGINACIÓN REAL:
 POR QUÉ ES RÁPIDO AHORA:
   - baozimh: _fetch_api_page(page) → 36 items en ~1s en vez de get_catalog() que tarda minutos
   - dumanwu: GET /sort/N (1 request) + _sortmore(page) en vez de _load_sort() que hace 500 requests
-  - wfwf:    caché en memoria → primera carga lenta, páginas 2+ instantáneas
+  - wfwf:    catálogo por modo en disco → al instante; se revalida en segundo plano
   - resto:   get_catalog_page(page=N) — siempre fue rápido
+
+PORTADAS:
+  - Solo las de filas visibles, en hilos propios, con caché en disco
+    (thumb_cache) y en memoria (QPixmapCache)
 """
 
 from __future__ import annotations
@@ -25,15 +29,44 @@ import re
 import shutil
 import sys
 import threading
+import time
+import unicodedata
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple, cast
 
-from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, QUrl, Signal
-from PySide6.QtGui import QDesktopServices, QFont, QPixmap
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QBuffer,
+    QIODevice,
+    QModelIndex,
+    QObject,
+    QPoint,
+    QRect,
+    QRunnable,
+    QSize,
+    Qt,
+    QThreadPool,
+    QUrl,
+    Signal,
+)
+from PySide6.QtGui import (
+    QColor,
+    QDesktopServices,
+    QFont,
+    QFontMetrics,
+    QImage,
+    QKeySequence,
+    QPainter,
+    QPen,
+    QPixmap,
+    QPixmapCache,
+)
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QApplication,
+    QCheckBox,
     QComboBox,
     QFileDialog,
     QFrame,
@@ -41,12 +74,15 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
+    QMenu,
     QMessageBox,
     QProgressBar,
     QPushButton,
     QScrollArea,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QVBoxLayout,
     QWidget,
 )
@@ -54,6 +90,15 @@ from PySide6.QtWidgets import (
 from config import Config, resource_path
 
 PAGE_SIZE = 20  # Items por página en la UI
+# Páginas que salen de una lista ya en memoria (búsquedas, catálogos
+# cacheados, índice local): la vista es virtual, así que pueden ser grandes
+SLICE_PAGE_SIZE = 200
+
+# Miniaturas de portada en la lista de resultados
+THUMB_W, THUMB_H = 40, 56  # tamaño en pantalla
+THUMB_SCALE = 2  # se guardan al doble para pantallas HiDPI
+THUMB_THREADS = 6  # pool propio: no compite con búsquedas ni descargas
+PIXMAP_CACHE_KB = 32 * 1024  # QPixmapCache (memoria de vídeo/RAM del proceso)
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  CONFIGURACIÓN DE FILTROS POR SITIO
@@ -300,6 +345,17 @@ _DL_DIR = os.path.join(os.path.dirname(__file__), "babylon_downloaders")
 if _DL_DIR not in sys.path:
     sys.path.insert(0, _DL_DIR)
 
+import chapter_cache  # noqa: E402
+from catalog_index import (  # noqa: E402
+    COVER_KEYS,
+    CRAWL_MAX_ITEMS,
+    SEARCH_LIMIT,
+    crawl_site,
+    get_index,
+)
+from result_cache import ResultCache  # noqa: E402
+from thumb_cache import get_thumb_cache  # noqa: E402
+
 _DOWNLOADER_MAP: Dict[str, Tuple[str, str]] = {
     "18mh": ("d_18mh.py", "Downloader18mh"),
     "bakamh": ("d_bakamh.py", "DownloaderBakamh"),
@@ -317,15 +373,37 @@ _DOWNLOADER_MAP: Dict[str, Tuple[str, str]] = {
 
 _mod_cache: Dict[str, Any] = {}
 _dl_cache: Dict[str, Any] = {}
-# Caché para downloaders que no tienen paginación nativa (wfwf, dumanwu search)
-_catalog_cache: Dict[str, List[Dict]] = {}
+# Un RLock por sitio: _load_mod/get_dl se llaman desde muchos hilos a la vez
+# (federada, índice, búsquedas, prefetch, portadas) y un módulo cargado dos
+# veces tendría su propio estado (META de hitomi, semillas XOR, tokens)
+_site_locks: Dict[str, threading.RLock] = {}
+_site_locks_guard = threading.Lock()
+# Caché para downloaders que no tienen paginación nativa (wfwf, dumanwu search):
+# acotada en memoria, con TTL por tipo ("search"/"catalog"/"ids") y compacta
+_catalog_cache = ResultCache()
 # Última carpeta de destino — persiste entre series durante la sesión
 _last_dest_dir: str = os.path.join(os.path.expanduser("~"), "Downloads")
 
 
+def _site_lock(site_type: str) -> threading.RLock:
+    with _site_locks_guard:
+        lock = _site_locks.get(site_type)
+        if lock is None:
+            lock = _site_locks[site_type] = threading.RLock()
+        return lock
+
+
 def _load_mod(site_type: str) -> Any:
-    if site_type in _mod_cache:
+    mod = _mod_cache.get(site_type)
+    if mod is not None:
+        return mod
+    with _site_lock(site_type):
+        if site_type not in _mod_cache:
+            _mod_cache[site_type] = _exec_mod(site_type)
         return _mod_cache[site_type]
+
+
+def _exec_mod(site_type: str) -> Any:
     filename, _ = _DOWNLOADER_MAP[site_type]
     filepath = os.path.join(_DL_DIR, filename)
     if not os.path.exists(filepath):
@@ -336,19 +414,29 @@ def _load_mod(site_type: str) -> Any:
     mod = importlib.util.module_from_spec(spec)
     sys.modules[f"_bdl_{site_type}"] = mod
     spec.loader.exec_module(mod)  # type: ignore[union-attr]
-    _mod_cache[site_type] = mod
     return mod
 
 
+def new_dl(site_type: str) -> Any:
+    """Instancia nueva, fuera de _dl_cache (estado de catálogo propio)."""
+    mod = _load_mod(site_type)
+    _, class_name = _DOWNLOADER_MAP[site_type]
+    return getattr(mod, class_name)()
+
+
 def get_dl(site_type: str) -> Any:
-    if site_type not in _dl_cache:
-        mod = _load_mod(site_type)
-        _, class_name = _DOWNLOADER_MAP[site_type]
-        cls = getattr(mod, class_name)
-        logging.info(f"[Babylon] Inicializando {class_name}…")
-        _dl_cache[site_type] = cls()
-        logging.info(f"[Babylon] {class_name} lista.")
-    return _dl_cache[site_type]
+    dl = _dl_cache.get(site_type)
+    if dl is not None:
+        return dl
+    with _site_lock(site_type):
+        if site_type not in _dl_cache:
+            mod = _load_mod(site_type)
+            _, class_name = _DOWNLOADER_MAP[site_type]
+            cls = getattr(mod, class_name)
+            logging.info(f"[Babylon] Inicializando {class_name}…")
+            _dl_cache[site_type] = cls()
+            logging.info(f"[Babylon] {class_name} lista.")
+        return _dl_cache[site_type]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -423,19 +511,26 @@ def search_site(
     query: str,
     filters: Optional[Dict[str, str]] = None,
     page: int = 1,
-) -> Tuple[List[Dict], bool]:
+    index: bool = True,
+    dl: Any = None,
+) -> Tuple[List[Dict], bool, str]:
     """
-    Retorna (items_para_esta_pagina, hay_mas_paginas).
+    Retorna (items_para_esta_pagina, hay_mas_paginas, total_hint).
 
     Para CATÁLOGO (query=""): hace 1 request a la red por página → rápido.
     Para BÚSQUEDA (query!=""): fetch-all una vez (cacheado), slice por página.
+    Si el índice local cubre el sitio (recorrido completo reciente), la
+    búsqueda sale de ahí sin red salvo que filters[REMOTE_FLAG] == "1".
+    Todo lo que llega de la red se guarda en el índice (index=False lo evita:
+    lo usa el recorrido en segundo plano, que ya guarda por su cuenta).
+    `dl` sustituye al downloader compartido (el recorrido usa uno propio).
 
     Lógica rápida por downloader:
       18mh      → _get_catalog_page(sess, section, page)        — 1 request
       bakamh    → dl.get_catalog_page(page, genre_slug, sort)   — 1 request
       baozimh   → _fetch_api_page(sess_com, mirror, ..., page)  — 1 request (~36 items)
       dumanwu   → GET /sort/N para page=1, _sortmore() para page>1 — 1 request
-      hitomi    → dl.get_catalog_page(page, language)           — 1 request
+      hitomi    → dl.get_catalog_page(page, language, order)    — 1 Range request
       mangafox  → dl.get_catalog_page(page)                     — 1 request
       manhuagui → dl.get_catalog_page(page, region, genre, ...) — 1 request
       picacomic → dl.get_catalog_page(page) o get_comics_by_category — 1 request
@@ -446,8 +541,16 @@ def search_site(
         filters = {}
     t = site["type"]
 
+    remote = filters.get(REMOTE_FLAG) == "1"
+    if query and not remote:
+        local = _local_page(t, query, page)
+        if local is not None:
+            return local
+    if remote and page == 1:
+        _catalog_cache.pop(f"{t}_search_{query}")
+
     try:
-        dl = get_dl(t)
+        dl = dl or get_dl(t)
         mod = _load_mod(t)
     except Exception as e:
         logging.error(f"[Babylon] No se pudo cargar {t}: {e}")
@@ -463,8 +566,9 @@ def search_site(
         # ─────────────────────────────────────────────────────────────────────
         # 18MH
         # Búsqueda: dl.search(query) → todo de una, paginamos display
-        # Catálogo: dl.get_catalog_page(page, page_size) — el downloader ya tiene
-        #   buffer interno con deduplicación que itera secciones secuencialmente.
+        # Catálogo: dl.get_catalog_page(page, page_size) — el downloader recorre
+        #   las secciones en segundo plano (CatalogCrawl) y deduplica; la página
+        #   vuelve en cuanto sus items han llegado.
         #   mod._get_catalog_page(sess, path, page>1) NO funciona: 18mh no soporta
         #   paginación por URL (?page=N, /N, /page/N) y devuelve siempre página 1.
         #   Por eso usamos el método de clase que ya resuelve esto internamente.
@@ -476,14 +580,12 @@ def search_site(
         if t == "18mh":
             if query:
                 cache_key = f"18mh_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
             else:
-                # dl.get_catalog_page tiene su propio buffer interno (_cat_buf)
+                # dl.get_catalog_page tiene su propio recorrido (CatalogCrawl)
                 # que acumula resultados de todas las secciones y los deduplica.
                 # Es el único método que pagina correctamente en 18mh.
                 items, has_more = dl.get_catalog_page(page=page, page_size=PAGE_SIZE)
@@ -497,12 +599,10 @@ def search_site(
         elif t == "bakamh":
             if query:
                 cache_key = f"bakamh_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
             else:
                 items, has_more = dl.get_catalog_page(
                     page=page,
@@ -519,12 +619,10 @@ def search_site(
         elif t == "baozimh":
             if query:
                 cache_key = f"baozimh_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
             else:
                 mirror = dl._mirror or mod.COM_MIRRORS[0]
                 raw_items = mod._fetch_api_page(
@@ -544,12 +642,10 @@ def search_site(
         elif t == "dumanwu":
             if query:
                 cache_key = f"dumanwu_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
             else:
                 sort_id = (
                     int(filters.get("sort_id", "1"))
@@ -578,7 +674,8 @@ def search_site(
         # HITOMI
         # Búsqueda: dl.search(query) — ID numérico o tags (female:X language:Y …)
         #
-        # Catálogo: construimos la URL nozomi según el filtro "order".
+        # Catálogo: mod.order_url() da la URL nozomi según el filtro "order".
+        # Sin tipo ni aleatorio, cada página es un Range de PAGE_SIZE*4 bytes.
         # Cada opción del menú "Orden" corresponde a un endpoint real del CDN:
         #   default       → /index-{language}.nozomi          (Date Added, desc)
         #   date_published→ /date-published-index-{language}.nozomi
@@ -594,44 +691,52 @@ def search_site(
         elif t == "hitomi":
             import random as _random
 
-            CDN = "https://ltn.gold-usergeneratedcontent.net"
             language = filters.get("language", "all")
             type_val = filters.get("type", "")
             order = filters.get("order", "default")
 
-            # Mapa de orden → URL nozomi del CDN de hitomi
-            _ORDER_URL = {
-                "default": f"{CDN}/index-{language}.nozomi",
-                "date_published": f"{CDN}/date-published-index-{language}.nozomi",
-                "pop_today": f"{CDN}/popular/today-index-{language}.nozomi",
-                "pop_week": f"{CDN}/popular/week-index-{language}.nozomi",
-                "pop_month": f"{CDN}/popular/month-index-{language}.nozomi",
-                "pop_year": f"{CDN}/popular/year-index-{language}.nozomi",
-                "random": f"{CDN}/index-{language}.nozomi",
-            }
-
             if query:
-                # dl.search() maneja ID numérico o tags via search_ids()
+                # dl.search() maneja ID numérico o tags via search_terms()
                 cache_key = f"hitomi_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
+                all_r = _catalog_cache.get(cache_key)
+                failed = _catalog_cache.get(f"{cache_key}_failed") or ()
+                if all_r is None:
+                    all_r, failed = dl.search_partial(query)
+                    # Parcial: TTL corto para reintentar pronto los que fallaron,
+                    # pero sin repetir todos los términos en cada página/prefetch
+                    kind = "partial" if failed else "search"
+                    all_r = _catalog_cache.put(cache_key, all_r, kind)
+                    if failed:
+                        _catalog_cache.put(f"{cache_key}_failed", failed, kind)
+                    else:
+                        _catalog_cache.pop(f"{cache_key}_failed")
+                if failed:
+                    total_hint = f"⚠ omitidos (sin respuesta): {' '.join(failed)}"
                 start = (page - 1) * PAGE_SIZE
                 raw_items = all_r[start : start + PAGE_SIZE]
                 has_more = start + PAGE_SIZE < len(all_r)
 
-            elif order == "default" and not type_val:
-                # Caso más simple y rápido: delegar al downloader
-                # dl.get_catalog_page usa su caché interno (_cat_ids/_cat_buf_key)
-                items, has_more = dl.get_catalog_page(page=page, language=language)
+            elif order != "random" and not type_val:
+                # Orden nativo de un índice: la página es un rango fijo de bytes
+                # → 1 Range request de PAGE_SIZE*4 bytes, sin bajar el índice
+                # El total vuelve con la página: el downloader es compartido
+                # (prefetch, federada) y no puede guardarlo en sí mismo
+                items, has_more, total = dl.catalog_page(
+                    page=page, page_size=PAGE_SIZE, language=language, order=order
+                )
                 raw_items = list(items)
+                if total > 0:
+                    total_hint = f"{total} galerías"
 
             else:
-                # Todos los demás órdenes: necesitamos la lista completa de IDs
+                # Filtro por tipo o aleatorio: solo aquí hace falta el índice
+                # completo (se descarga en este worker, fuera del hilo de UI)
+                # Solo se guardan los IDs (array compacto): los títulos salen
+                # de la caché de metadatos del módulo al pintar cada página
                 cache_key = f"hitomi_cat_{language}_{type_val}_{order}"
 
-                if cache_key not in _catalog_cache:
-                    nozomi_url = _ORDER_URL.get(order, _ORDER_URL["default"])
+                def _load_ids():
+                    nozomi_url = mod.order_url(language, order)
 
                     # Obtener IDs desde el endpoint nozomi correspondiente
                     ids = mod._nozomi_ids(dl._sess, nozomi_url)
@@ -642,7 +747,7 @@ def search_site(
                             f"[Hitomi] {nozomi_url} vacío, usando índice base"
                         )
                         ids = mod._nozomi_ids(
-                            dl._sess, f"{CDN}/index-{language}.nozomi"
+                            dl._sess, mod.order_url(language, "default")
                         )
 
                     # Filtrar por tipo si está seleccionado
@@ -657,28 +762,21 @@ def search_site(
 
                     # Pre-load metadata primeros 200 para títulos rápidos
                     mod.load_meta_batch(dl._sess, ids[:200])
+                    return ids
 
-                    _catalog_cache[cache_key] = [
-                        {"id": str(gid), "title": mod.gallery_title(gid)} for gid in ids
-                    ]
-
-                all_r = _catalog_cache[cache_key]
+                all_ids = _catalog_cache.get_or_load(cache_key, _load_ids, "ids")
                 start = (page - 1) * PAGE_SIZE
-                raw_items_page = all_r[start : start + PAGE_SIZE]
+                gids_page = list(all_ids[start : start + PAGE_SIZE])
 
                 # Pre-load metadata de esta página si no estaba en los primeros 200
-                gids_page = [int(r["id"]) for r in raw_items_page if r["id"].isdigit()]
                 if gids_page:
                     mod.load_meta_batch(dl._sess, gids_page)
 
                 raw_items = [
-                    {
-                        "id": r["id"],
-                        "title": mod.gallery_title(int(r["id"])) or r["title"],
-                    }
-                    for r in raw_items_page
+                    {"id": str(gid), "title": mod.gallery_title(gid)}
+                    for gid in gids_page
                 ]
-                has_more = start + PAGE_SIZE < len(all_r)
+                has_more = start + PAGE_SIZE < len(all_ids)
 
         # ─────────────────────────────────────────────────────────────────────
         # MANGAFOX — dl.get_catalog_page(page, page_size) → (items, has_more:bool)
@@ -686,12 +784,10 @@ def search_site(
         elif t == "mangafox":
             if query:
                 cache_key = f"mangafox_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
                 total_hint = f"{len(all_r)} resultados"
             else:
                 items, has_more = dl.get_catalog_page(page=page)
@@ -704,12 +800,10 @@ def search_site(
         elif t == "manhuagui":
             if query:
                 cache_key = f"manhuagui_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
                 total_hint = f"{len(all_r)} resultados"
             else:
                 items, total_pages = dl.get_catalog_page(
@@ -770,44 +864,43 @@ def search_site(
         elif t == "toonkor":
             if query:
                 cache_key = f"toonkor_search_{query}"
-                if cache_key not in _catalog_cache:
-                    _catalog_cache[cache_key] = dl.search(query)
-                all_r = _catalog_cache[cache_key]
-                start = (page - 1) * PAGE_SIZE
-                raw_items = all_r[start : start + PAGE_SIZE]
-                has_more = start + PAGE_SIZE < len(all_r)
+                all_r = _catalog_cache.get_or_load(cache_key, lambda: dl.search(query))
+                start = (page - 1) * SLICE_PAGE_SIZE
+                raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+                has_more = start + SLICE_PAGE_SIZE < len(all_r)
                 total_hint = f"{len(all_r)} resultados"
             else:
                 items, has_more = dl.get_catalog_page(page=page)
                 raw_items = list(items)
 
         # ─────────────────────────────────────────────────────────────────────
-        # WFWF — caché en memoria. Total conocido tras primera carga.
+        # WFWF — catálogo por modo en disco (stale-while-revalidate) + caché
+        # en memoria. Total conocido tras primera carga.
         # ─────────────────────────────────────────────────────────────────────
         elif t == "wfwf":
-            Mode = mod.Mode
             mode_val = filters.get("mode", "both")
             cache_key = f"wfwf_catalog_{mode_val}"
 
             if query:
                 search_key = f"wfwf_search_{query}"
-                if search_key not in _catalog_cache:
-                    _catalog_cache[search_key] = dl.search(query)
-                all_r = _catalog_cache[search_key]
+                all_r = _catalog_cache.get_or_load(search_key, lambda: dl.search(query))
             else:
-                if cache_key not in _catalog_cache:
-                    # get_catalog() hace requests paralelas; más workers = más rápido
-                    if mode_val == "both":
-                        _catalog_cache[cache_key] = dl.get_catalog()
-                    else:
-                        _catalog_cache[cache_key] = mod.fetch_series_list(
-                            dl._sess, Mode(mode_val), workers=8
-                        )
-                all_r = _catalog_cache[cache_key]
 
-            start = (page - 1) * PAGE_SIZE
-            raw_items = all_r[start : start + PAGE_SIZE]
-            has_more = start + PAGE_SIZE < len(all_r)
+                # Copia en disco por modo al instante; el downloader la
+                # revalida en segundo plano y avisa si cambia
+                def _load_catalog():
+                    return dl.get_catalog_cached(
+                        mode_val,
+                        on_update=lambda items: _on_catalog_update(
+                            t, cache_key, items, mode_val
+                        ),
+                    )
+
+                all_r = _catalog_cache.get_or_load(cache_key, _load_catalog, "catalog")
+
+            start = (page - 1) * SLICE_PAGE_SIZE
+            raw_items = all_r[start : start + SLICE_PAGE_SIZE]
+            has_more = start + SLICE_PAGE_SIZE < len(all_r)
             total_hint = f"{len(all_r)} series en total"
 
     except Exception as exc:
@@ -826,14 +919,118 @@ def search_site(
 
     # total_hint para búsquedas cacheadas en downloaders sin total nativo
     if not total_hint and query and raw_items:
-        cache_key_search = f"{t}_search_{query}"
-        if cache_key_search in _catalog_cache:
-            n = len(_catalog_cache[cache_key_search])
-            total_hint = f"{n} resultados"
+        cached = _catalog_cache.get(f"{t}_search_{query}")
+        if cached is not None:
+            total_hint = f"{len(cached)} resultados"
+
+    if index and results:
+        get_index().upsert(t, results)
 
     return results, has_more, total_hint
 
 
+def _on_catalog_update(
+    site_type: str, cache_key: str, items: List[Dict], mode: str = ""
+) -> None:
+    """
+    Catálogo revalidado en segundo plano: caché, índice local y aviso a la UI.
+    `mode` es el filtro de modo del catálogo ("" si el sitio no separa).
+    """
+    _catalog_cache.put(cache_key, items, "catalog")
+    entries = [e for e in (_raw_to_display(site_type, r) for r in items) if e]
+    get_index().upsert(site_type, entries)
+    catalog_events.updated.emit(site_type, mode, len(items))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ÍNDICE LOCAL — catalog_index (SQLite FTS5, todos los sitios)
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Sitios que se recorren enteros en segundo plano al abrir su panel, con el
+# máximo de entradas (0 = sin límite). El resto se indexa con lo que se ve.
+#   wfwf/toonkor   → su búsqueda remota ya baja el catálogo completo
+#   18mh/mangafox  → el downloader ya recorre el catálogo para paginar
+INDEX_CRAWL_SITES: Dict[str, int] = {
+    "wfwf": 0,
+    "toonkor": 0,
+    "18mh": CRAWL_MAX_ITEMS,
+    "mangafox": CRAWL_MAX_ITEMS,
+}
+REMOTE_FLAG = "_remote"  # clave en filters: forzar búsqueda remota
+# Sitios con catálogo en disco: se listan al abrir su panel, sin esperar a Listar
+AUTOLIST_SITES = {"wfwf"}
+
+_index_crawling: set = set()
+_index_crawling_lock = threading.Lock()
+
+
+def search_local(
+    query: str,
+    sites: Optional[List[str]] = None,
+    limit: int = SEARCH_LIMIT,
+    offset: int = 0,
+) -> List[Dict]:
+    """
+    Búsqueda en el índice local (milisegundos), ordenada entre todos los
+    sitios o los de `sites`. Entradas display con "site" además de "_raw".
+    """
+    return [
+        {"title": r["title"], "slug": r["slug"], "site": r["site"], "_raw": r["_raw"]}
+        for r in get_index().search(query, sites, limit=limit, offset=offset)
+    ]
+
+
+def _local_page(
+    site_type: str, query: str, page: int
+) -> Optional[Tuple[List[Dict], bool, str]]:
+    """Página de resultados locales, o None si el índice no cubre el sitio."""
+    index = get_index()
+    if not index.covers(site_type):
+        return None
+    # Una fila de más dice si hay página siguiente sin contar nada
+    hits = search_local(
+        query,
+        [site_type],
+        limit=SLICE_PAGE_SIZE + 1,
+        offset=(page - 1) * SLICE_PAGE_SIZE,
+    )
+    has_more = len(hits) > SLICE_PAGE_SIZE
+    total = index.count_matches(query, [site_type])
+    return hits[:SLICE_PAGE_SIZE], has_more, f"{total} resultados (índice local)"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  BÚSQUEDA FEDERADA — todos los sitios a la vez
+# ══════════════════════════════════════════════════════════════════════════════
+
+FEDERATED_TIMEOUT = 15.0  # segundos por sitio
+# Sitios lentos en búsqueda: catálogo completo (wfwf) o páginas pesadas
+FEDERATED_TIMEOUTS: Dict[str, float] = {"wfwf": 60.0, "mangafox": 30.0, "hitomi": 30.0}
+
+_BRACKETS_RE = re.compile(r"[(\[（【〔].*?[)\]）】〕]")
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def federated_sites() -> List[Dict]:
+    """Sitios activos con downloader."""
+    return [
+        s
+        for s in Config.BABYLON_SITES
+        if s.get("type") in _DOWNLOADER_MAP and s.get("status", "Activo") == "Activo"
+    ]
+
+
+def title_key(title: str) -> str:
+    """
+    Clave para agrupar la misma serie entre sitios: NFKC (anchos completos),
+    sin mayúsculas, sin anotaciones entre paréntesis/corchetes y sin
+    puntuación ni espacios.
+    """
+    t = unicodedata.normalize("NFKC", title).casefold()
+    key = _NON_WORD_RE.sub("", _BRACKETS_RE.sub("", t))
+    return key or _NON_WORD_RE.sub("", t) or t
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  SEÑALES
 # ══════════════════════════════════════════════════════════════════════════════
@@ -845,7 +1042,9 @@ class _SearchSignals(QObject):
 
 
 class _SeriesSignals(QObject):
-    finished = Signal(dict, list)  # (series_meta, chapters)
+    cached = Signal(dict, list)  # copia en disco, antes de revalidar
+    finished = Signal(dict, list)  # (series_meta, chapters) — recién traídos
+    unchanged = Signal()  # la copia sigue al día
     error = Signal(str)
 
 
@@ -862,6 +1061,24 @@ class _DynOptsSignals(QObject):
     finished = Signal(str, list)  # (filter_id, [(display, value)])
 
 
+class _CatalogSignals(QObject):
+    updated = Signal(str, str, int)  # (site_type, modo, nº de series) renovado
+
+
+# Emisor único (vive en el hilo principal): los hilos de revalidación emiten
+# y los paneles abiertos reciben en el hilo de UI
+catalog_events = _CatalogSignals()
+
+
+class _FederatedSignals(QObject):
+    site_done = Signal(int, str, list, str)  # (search_id, site_type, items, error)
+    all_done = Signal(int)  # (search_id)
+
+
+class _ThumbSignals(QObject):
+    loaded = Signal(str, QImage)  # (url, miniatura; nula si falló)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  WORKERS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -886,10 +1103,123 @@ class BabylonSearchWorker(QRunnable):
             self.signals.error.emit(str(e))
 
 
+class BabylonFederatedWorker(QRunnable):
+    """
+    Lanza search_site en todos los sitios a la vez, cada uno en su hilo
+    (fuera del pool de Qt, para que los lentos no ocupen sus hilos), y emite
+    cada sitio en cuanto responde. Al vencer el plazo de un sitio se da por
+    perdido sin esperarlo.
+
+    Ese hilo NO se interrumpe: search_site está dentro de una petición de
+    red y Python no puede cortarla desde fuera. Sigue hasta que el
+    downloader termina (sus propios timeouts de requests lo acotan), su
+    resultado se ignora aquí y solo llega al índice local / caché. Lo que
+    sí se cancela (cancel_futures) es lo que aún no había empezado.
+    """
+
+    def __init__(self, search_id: int, sites: List[Dict], query: str) -> None:
+        super().__init__()
+        self.search_id = search_id
+        self.sites = sites
+        self.query = query
+        self.signals = _FederatedSignals()
+        self._stop = threading.Event()
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def _emit(self, site_type: str, items: List[Dict], error: str) -> None:
+        if not self._stop.is_set():
+            self.signals.site_done.emit(self.search_id, site_type, items, error)
+
+    def run(self) -> None:
+        if not self.sites:
+            self.signals.all_done.emit(self.search_id)
+            return
+        ex = ThreadPoolExecutor(
+            max_workers=len(self.sites), thread_name_prefix="babylon-fed"
+        )
+        t0 = time.monotonic()
+        pending = {ex.submit(search_site, s, self.query, {}, 1): s for s in self.sites}
+        deadline = {
+            f: t0 + FEDERATED_TIMEOUTS.get(s["type"], FEDERATED_TIMEOUT)
+            for f, s in pending.items()
+        }
+        try:
+            while pending and not self._stop.is_set():
+                now = time.monotonic()
+                for f in [f for f in pending if deadline[f] <= now and not f.done()]:
+                    # Abandonado, no parado: ver docstring
+                    f.cancel()
+                    self._emit(pending.pop(f)["type"], [], "sin respuesta")
+                if not pending:
+                    break
+                # Tope de 0.5s para atender cancel() sin demora
+                timeout = min(min(deadline[f] for f in pending) - now, 0.5)
+                done, _ = wait(
+                    list(pending), timeout=max(timeout, 0.0), return_when=FIRST_COMPLETED
+                )
+                for f in done:
+                    t = pending.pop(f)["type"]
+                    try:
+                        items = f.result()[0]
+                    except Exception as e:
+                        self._emit(t, [], str(e))
+                        continue
+                    ok = [i for i in items if i.get("slug") != "__no_token__"]
+                    self._emit(t, ok, "sin token" if len(ok) < len(items) else "")
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
+        if not self._stop.is_set():
+            self.signals.all_done.emit(self.search_id)
+
+
+class BabylonIndexWorker(QRunnable):
+    """
+    Recorre el catálogo de un sitio página a página y lo guarda en el
+    índice local. Sin señales: no toca la UI. Un solo recorrido por sitio.
+    Usa su propia instancia del downloader: el buffer de catálogo de la
+    compartida (get_catalog_page) es el que pagina el panel a la vez.
+    """
+
+    def __init__(self, site: Dict) -> None:
+        super().__init__()
+        self.site = site
+        self._stop = threading.Event()
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        t = self.site["type"]
+        with _index_crawling_lock:
+            if t in _index_crawling:
+                return
+            _index_crawling.add(t)
+        try:
+            dl = new_dl(t)
+            n = crawl_site(
+                get_index(),
+                t,
+                lambda p: search_site(self.site, "", {}, p, index=False, dl=dl)[:2],
+                max_items=INDEX_CRAWL_SITES.get(t, CRAWL_MAX_ITEMS),
+                stop=self._stop.is_set,
+            )
+            logging.info(f"[Babylon] Índice local {t}: {n} series recorridas")
+        except Exception as e:
+            logging.warning(f"[Babylon] Índice local {t}: {e}")
+        finally:
+            with _index_crawling_lock:
+                _index_crawling.discard(t)
+
+
 class BabylonSeriesWorker(QRunnable):
     """
     Carga la ficha + capítulos de una serie.
     Usa item["_raw"] directamente en dl.get_series() — sin modificar nada.
+
+    Con copia en chapter_cache la emite primero (cached) y luego revalida:
+    finished si la lista cambió, unchanged si no (o si la copia es reciente).
     """
 
     def __init__(self, site_type: str, item: Dict) -> None:
@@ -899,9 +1229,19 @@ class BabylonSeriesWorker(QRunnable):
         self.signals = _SeriesSignals()
 
     def run(self) -> None:
+        raw_item = self.item.get("_raw") or self.item
+        # El slug display ya es único por sitio (wfwf: id|||enc|||modo)
+        slug = str(self.item.get("slug") or "") or chapter_cache.series_slug(
+            raw_item
+        )
+        entry = chapter_cache.load(self.site_type, slug)
+        if entry is not None:
+            self.signals.cached.emit(entry["series"], entry["chapters"])
+            if chapter_cache.is_fresh(entry):
+                self.signals.unchanged.emit()
+                return
         try:
             dl = get_dl(self.site_type)
-            raw_item = self.item.get("_raw") or self.item
 
             if self.site_type == "wfwf":
                 keys = (
@@ -920,7 +1260,16 @@ class BabylonSeriesWorker(QRunnable):
                     f"[Babylon/wfwf] get_series OK — {len(chapters or [])} capítulos"
                 )
 
-            self.signals.finished.emit(series or {}, chapters or [])
+            series, chapters = series or {}, chapters or []
+            fp = chapter_cache.store(self.site_type, slug, series, chapters)
+            if (
+                entry is not None
+                and fp == entry.get("fingerprint")
+                and series == entry["series"]
+            ):
+                self.signals.unchanged.emit()
+            else:
+                self.signals.finished.emit(series, chapters)
         except Exception as e:
             logging.error(
                 f"[Babylon] SeriesWorker ({self.site_type}): {e}", exc_info=True
@@ -1053,6 +1402,135 @@ class BabylonDynamicOptsWorker(QRunnable):
             logging.warning(f"[Babylon] DynOpts {t}: {e}")
 
 
+class BabylonThumbWorker(QRunnable):
+    """
+    Una portada: caché de disco o descarga con la sesión del downloader
+    (límites por host en thumb_cache), y decodificado + escalado con QImage,
+    todo fuera del hilo de UI. Emite la miniatura ya lista para QPixmap.
+    """
+
+    def __init__(self, site_type: str, url: str, signals: _ThumbSignals) -> None:
+        super().__init__()
+        self.site_type = site_type
+        self.url = url
+        self.signals = signals
+
+    def run(self) -> None:
+        img = QImage()
+        try:
+            cache = get_thumb_cache()
+            data = cache.get(self.url)
+            if data is not None:
+                img.loadFromData(data)
+            else:
+                raw = cache.fetch(self.url, get_dl(self.site_type).dl_image)
+                if raw and img.loadFromData(raw):
+                    img = img.scaled(
+                        THUMB_W * THUMB_SCALE,
+                        THUMB_H * THUMB_SCALE,
+                        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                        Qt.TransformationMode.SmoothTransformation,
+                    )
+                    buf = QBuffer()
+                    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+                    img.save(buf, "JPG", 85)
+                    cache.put(self.url, bytes(buf.data()))
+        except Exception as e:
+            logging.debug(f"[Babylon] Portada {self.url}: {e}")
+            img = QImage()
+        self.signals.loaded.emit(self.url, img)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  MINIATURAS DE PORTADA
+# ══════════════════════════════════════════════════════════════════════════════
+
+
+def item_cover(item: Dict) -> str:
+    """URL de portada de un resultado display (o de su _raw), "" si no hay."""
+    for src in (item, item.get("_raw") or {}):
+        for k in COVER_KEYS:
+            v = src.get(k)
+            if isinstance(v, str) and v.startswith("http"):
+                return v
+    return ""
+
+
+class _ThumbLoader(QObject):
+    """
+    Cola de portadas compartida por los paneles (vive en el hilo de UI).
+    Las miniaturas listas van a QPixmapCache, que expulsa por su cuenta al
+    pasarse de PIXMAP_CACHE_KB; lo expulsado vuelve desde la caché de disco.
+    Cada portada encolada recuerda qué vistas la pidieron: solo se saca de
+    la cola cuando ninguna la quiere ya.
+    """
+
+    ready = Signal(str)  # url con miniatura ya en QPixmapCache
+
+    def __init__(self) -> None:
+        super().__init__()
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_KB))
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(THUMB_THREADS)
+        self._signals = _ThumbSignals()
+        self._signals.loaded.connect(self._on_loaded)
+        self._jobs: Dict[str, BabylonThumbWorker] = {}
+        self._owners: Dict[str, set] = {}  # url → vistas que la esperan
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return "babylon-thumb:" + url
+
+    def pixmap(self, url: str) -> Optional[QPixmap]:
+        pm = QPixmap()
+        return pm if QPixmapCache.find(self._key(url), pm) else None
+
+    def request(self, site_type: str, url: str, owner: object) -> None:
+        """Encola la portada si no está ya en camino (o caída hace poco)."""
+        if url in self._jobs:
+            self._owners[url].add(owner)
+            return
+        if get_thumb_cache().failed_recently(url):
+            return
+        w = BabylonThumbWorker(site_type, url, self._signals)
+        self._jobs[url] = w
+        self._owners[url] = {owner}
+        self._pool.start(w)
+
+    def retain(self, owner: object, urls: set) -> None:
+        """
+        `owner` ya solo quiere `urls` (scroll, otra página): se olvida del
+        resto y se descarta lo encolado que no espera ninguna otra vista.
+        """
+        for url, w in list(self._jobs.items()):
+            if url in urls:
+                continue
+            owners = self._owners[url]
+            owners.discard(owner)
+            if not owners and self._pool.tryTake(w):
+                del self._jobs[url]
+                del self._owners[url]
+
+    def _on_loaded(self, url: str, img: QImage) -> None:
+        self._jobs.pop(url, None)
+        self._owners.pop(url, None)
+        if img.isNull():
+            return
+        QPixmapCache.insert(self._key(url), QPixmap.fromImage(img))
+        self.ready.emit(url)
+
+
+_thumb_loader: Optional[_ThumbLoader] = None
+
+
+def thumb_loader() -> _ThumbLoader:
+    # Se crea en el primer panel que lo pide, siempre desde el hilo de UI
+    global _thumb_loader
+    if _thumb_loader is None:
+        _thumb_loader = _ThumbLoader()
+    return _thumb_loader
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  UTILS
 # ══════════════════════════════════════════════════════════════════════════════
@@ -1115,11 +1593,11 @@ _IMG_BAR = (
     "QProgressBar::chunk{background:rgba(0,200,130,0.75);border-radius:4px;}"
 )
 _LIST_STYLE = (
-    "QListWidget{background:rgba(5,5,8,0.85);border:1px solid rgba(157,70,255,0.3);"
+    "QListView{background:rgba(5,5,8,0.85);border:1px solid rgba(157,70,255,0.3);"
     "border-radius:6px;color:#e0e0e0;font-size:12px;outline:none;}"
-    "QListWidget::item{padding:4px 8px;}"
-    "QListWidget::item:selected{background:rgba(157,70,255,0.35);color:white;}"
-    "QListWidget::item:hover{background:rgba(157,70,255,0.12);}"
+    "QListView::item{padding:4px 8px;}"
+    "QListView::item:selected{background:rgba(157,70,255,0.35);color:white;}"
+    "QListView::item:hover{background:rgba(157,70,255,0.12);}"
 )
 
 
@@ -1148,37 +1626,236 @@ class _ArrowLineEdit(QLineEdit):
             super().keyPressEvent(event)
 
 
-class _DragSelectList(QListWidget):
+class _ChapterModel(QAbstractListModel):
+    """
+    Capítulos de una serie con la selección guardada aparte, como bitset
+    (un int de Python, bit i = fila i) más un flag de inversión:
+
+      - seleccionar/quitar un rango es una máscara: set_range(a, b, on)
+      - invertir y seleccionar todo son O(1): solo cambian el flag
+      - contar es bit_count(), sin recorrer filas
+
+    La vista no usa el selection model de Qt; el delegate marca como
+    seleccionadas las filas que diga is_selected() al pintarlas.
     """
-    QListWidget con selección por arrastre tipo "pintura":
+
+    selection_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._chapters: List[Dict] = []
+        self._bits = 0
+        self._inverted = False
+        self._new: set = set()  # claves de capítulo nuevos desde la última visita
+
+    # ── modelo ────────────────────────────────────────────────
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._chapters)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._chapters):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._chapters[index.row()].get("title", "?")
+        if role == Qt.ItemDataRole.UserRole:
+            return self._chapters[index.row()]
+        if role == Qt.ItemDataRole.ToolTipRole and self.is_new(index.row()):
+            return "Nuevo desde la última visita"
+        return None
+
+    def set_chapters(self, chapters: List[Dict], new_keys=()) -> None:
+        self.beginResetModel()
+        self._chapters = list(chapters)
+        self._new = set(new_keys)
+        self._bits = 0
+        self._inverted = False
+        self.endResetModel()
+        self.selection_changed.emit()
+
+    def is_new(self, row: int) -> bool:
+        return bool(self._new) and (
+            chapter_cache.chapter_key(self._chapters[row]) in self._new
+        )
+
+    def apply_delta(self, chapters: List[Dict], new_keys=()) -> None:
+        """
+        Pasa a `chapters` quitando e insertando solo las filas que cambian
+        (la vista conserva scroll y selección). Si el orden de lo que ya
+        estaba no coincide o hay claves repetidas, reset completo.
+        """
+        cur = [chapter_cache.chapter_key(ch) for ch in self._chapters]
+        keys = [chapter_cache.chapter_key(ch) for ch in chapters]
+        if len(set(cur)) != len(cur) or len(set(keys)) != len(keys):
+            self.set_chapters(chapters, new_keys)
+            return
+        # Fuera lo que ya no está, por tramos y de abajo arriba
+        keep = set(keys)
+        row = len(cur) - 1
+        while row >= 0:
+            if cur[row] in keep:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and cur[row] not in keep:
+                row -= 1
+            self._remove_rows(row + 1, last)
+            del cur[row + 1 : last + 1]
+        # Dentro lo nuevo, en su posición
+        have = set(cur)
+        i = 0
+        while i < len(keys):
+            if keys[i] in have:
+                i += 1
+                continue
+            j = i
+            while j < len(keys) and keys[j] not in have:
+                j += 1
+            self._insert_rows(i, chapters[i:j])
+            cur[i:i] = keys[i:j]
+            i = j
+        if cur != keys:
+            self.set_chapters(chapters, new_keys)
+            return
+        self._chapters = list(chapters)  # títulos u otros campos al día
+        self._new = set(new_keys)
+        self._changed(0, len(self._chapters) - 1)
+
+    def _remove_rows(self, first: int, last: int) -> None:
+        self.beginRemoveRows(QModelIndex(), first, last)
+        del self._chapters[first : last + 1]
+        low = self._bits & ((1 << first) - 1)
+        self._bits = low | (self._bits >> (last + 1) << first)
+        self.endRemoveRows()
+
+    def _insert_rows(self, pos: int, chapters: List[Dict]) -> None:
+        k = len(chapters)
+        self.beginInsertRows(QModelIndex(), pos, pos + k - 1)
+        self._chapters[pos:pos] = chapters
+        # Las filas nuevas entran sin seleccionar: bit = flag de inversión
+        fill = (1 << k) - 1 if self._inverted else 0
+        low = self._bits & ((1 << pos) - 1)
+        self._bits = low | (fill << pos) | (self._bits >> pos << (pos + k))
+        self.endInsertRows()
+
+    def reverse(self) -> None:
+        """Invierte el orden conservando qué capítulos están seleccionados."""
+        n = len(self._chapters)
+        self.beginResetModel()
+        self._chapters.reverse()
+        if n and self._bits:
+            self._bits = int(format(self._bits, f"0{n}b")[::-1], 2)
+        self.endResetModel()
+
+    # ── selección ─────────────────────────────────────────────
+    def is_selected(self, row: int) -> bool:
+        return bool(self._bits >> row & 1) != self._inverted
+
+    def selected_count(self) -> int:
+        n = self._bits.bit_count()
+        return len(self._chapters) - n if self._inverted else n
+
+    def selected_chapters(self) -> List[Dict]:
+        return [ch for i, ch in enumerate(self._chapters) if self.is_selected(i)]
+
+    def set_range(self, first: int, last: int, on: bool) -> None:
+        if first > last:
+            first, last = last, first
+        first = max(first, 0)
+        last = min(last, len(self._chapters) - 1)
+        if first > last:
+            return
+        mask = ((1 << (last - first + 1)) - 1) << first
+        # Con la selección invertida, "seleccionado" es el bit a 0
+        if on != self._inverted:
+            self._bits |= mask
+        else:
+            self._bits &= ~mask
+        self._changed(first, last)
+
+    def select_all(self) -> None:
+        self._bits, self._inverted = 0, True
+        self._changed(0, len(self._chapters) - 1)
+
+    def clear_selection(self) -> None:
+        self._bits, self._inverted = 0, False
+        self._changed(0, len(self._chapters) - 1)
+
+    def invert_selection(self) -> None:
+        self._inverted = not self._inverted
+        self._changed(0, len(self._chapters) - 1)
+
+    def _changed(self, first: int, last: int) -> None:
+        if last >= first:
+            # La vista solo repinta las filas visibles del rango
+            self.dataChanged.emit(self.index(first), self.index(last))
+        self.selection_changed.emit()
+
+
+class _ChapterDelegate(QStyledItemDelegate):
+    """
+    Pinta la selección del bitset con el estilo ::item:selected de siempre
+    y marca en negrita los capítulos nuevos desde la última visita.
+    """
+
+    def initStyleOption(self, option: QStyleOptionViewItem, index) -> None:
+        super().initStyleOption(option, index)
+        if index.model().is_new(index.row()):
+            option.font.setBold(True)
+            option.text = "● " + option.text
+        if index.model().is_selected(index.row()):
+            option.state |= QStyle.StateFlag.State_Selected
+        else:
+            option.state &= ~QStyle.StateFlag.State_Selected
+
+
+class _DragSelectList(QListView):
+    """
+    Lista de capítulos con selección por arrastre tipo "pintura":
     - Click normal: selecciona/deselecciona un ítem
-    - Click + arrastrar: selecciona todos los ítems bajo el cursor
-    Usa ExtendedSelection (no MultiSelection) para no interferir
-    con el foco del teclado de otros widgets.
+    - Click + arrastrar: aplica ese mismo estado a todo lo recorrido
+    - Shift + click: aplica el estado del último click hasta la fila pulsada
+    La selección vive en _ChapterModel (bitset); la vista no tiene selection
+    model propio, así que tampoco roba el foco del teclado a otros widgets.
     """
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._model = _ChapterModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(_ChapterDelegate(self))
         self._drag_active = False
         self._drag_toggle_to: Optional[bool] = None
+        self._anchor = -1
+        self._last_row = -1
+        self.setUniformItemSizes(True)
         self.setMouseTracking(True)
-        # ExtendedSelection en lugar de MultiSelection — no roba el foco del teclado
-        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         # Foco solo al hacer click explícito, no al navegar con Tab
         self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
 
+    def chapter_model(self) -> _ChapterModel:
+        return self._model
+
+    def _row_at(self, event) -> int:
+        return self.indexAt(event.position().toPoint()).row()
+
     def mousePressEvent(self, event) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
-            item = self.itemAt(event.position().toPoint())
-            if item:
-                self._drag_active = True
-                self._drag_toggle_to = not item.isSelected()
-                self.blockSignals(True)
-                item.setSelected(self._drag_toggle_to)
-                self.blockSignals(False)
-                self.itemSelectionChanged.emit()
+            row = self._row_at(event)
+            if row < 0:
+                self._model.clear_selection()
+            elif (
+                event.modifiers() & Qt.KeyboardModifier.ShiftModifier
+                and self._anchor >= 0
+            ):
+                self._model.set_range(
+                    self._anchor, row, self._model.is_selected(self._anchor)
+                )
             else:
-                self.clearSelection()
+                self._drag_active = True
+                self._drag_toggle_to = not self._model.is_selected(row)
+                self._anchor = self._last_row = row
+                self._model.set_range(row, row, self._drag_toggle_to)
             # No llamar super() para no activar el comportamiento nativo
             # que movería el foco del teclado fuera del campo de búsqueda
             event.accept()
@@ -1187,12 +1864,11 @@ class _DragSelectList(QListWidget):
 
     def mouseMoveEvent(self, event) -> None:
         if self._drag_active and self._drag_toggle_to is not None:
-            item = self.itemAt(event.position().toPoint())
-            if item and item.isSelected() != self._drag_toggle_to:
-                self.blockSignals(True)
-                item.setSelected(self._drag_toggle_to)
-                self.blockSignals(False)
-                self.itemSelectionChanged.emit()
+            row = self._row_at(event)
+            if row >= 0 and row != self._last_row:
+                # Rango desde la última fila: un arrastre rápido no se salta filas
+                self._model.set_range(self._last_row, row, self._drag_toggle_to)
+                self._last_row = row
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event) -> None:
@@ -1201,11 +1877,152 @@ class _DragSelectList(QListWidget):
         super().mouseReleaseEvent(event)
 
     def keyPressEvent(self, event) -> None:
-        # Pasar flechas a QListWidget solo cuando este widget TIENE el foco explícito
-        # Esto evita que robe eventos de teclado de campos de texto hermanos
+        if event.matches(QKeySequence.StandardKey.SelectAll):
+            self._model.select_all()
+            return
+        # Flechas/PgUp/PgDn: navegación normal de QListView
         super().keyPressEvent(event)
 
 
+def _can_open(item: Dict) -> bool:
+    return bool(item.get("slug") and item.get("slug") != "__no_token__")
+
+
+class _ResultsModel(QAbstractListModel):
+    """Resultados de una página: la lista de dicts tal cual, sin widgets."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[Dict] = []
+        self._covers: List[str] = []
+        self._rows_by_cover: Dict[str, List[int]] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._items[index.row()].get("title", "(sin título)")
+        return None
+
+    def set_items(self, items: List[Dict]) -> None:
+        self.beginResetModel()
+        self._items = list(items)
+        self._covers = [item_cover(it) for it in self._items]
+        self._rows_by_cover = {}
+        for row, url in enumerate(self._covers):
+            if url:
+                self._rows_by_cover.setdefault(url, []).append(row)
+        self.endResetModel()
+
+    def item(self, row: int) -> Dict:
+        return self._items[row]
+
+    def cover(self, row: int) -> str:
+        return self._covers[row]
+
+    def has_covers(self) -> bool:
+        return bool(self._rows_by_cover)
+
+    def rows_for_cover(self, url: str) -> List[int]:
+        return self._rows_by_cover.get(url, [])
+
+
+class _ResultDelegate(QStyledItemDelegate):
+    """
+    Pinta cada fila como la tarjeta de siempre (título + "VER SERIE") sin
+    crear widgets: el coste es por fila visible, no por resultado.
+    """
+
+    ROW_H = 46
+    ROW_H_COVER = THUMB_H + 14
+    BTN_W = 100
+    BTN_H = 31
+
+    def __init__(
+        self,
+        parent=None,
+        font: Optional[QFont] = None,
+        site_type: str = "",
+        thumbs: Optional[_ThumbLoader] = None,
+    ):
+        super().__init__(parent)
+        self._font = font
+        self._site_type = site_type
+        self._thumbs = thumbs
+
+    def sizeHint(self, option: QStyleOptionViewItem, index) -> QSize:
+        h = self.ROW_H_COVER if index.model().has_covers() else self.ROW_H
+        return QSize(option.rect.width(), h)
+
+    def button_rect(self, row_rect: QRect) -> QRect:
+        r = row_rect.adjusted(0, 2, -4, -3)
+        top = r.top() + (r.height() - self.BTN_H) // 2
+        return QRect(r.right() - 12 - self.BTN_W, top, self.BTN_W, self.BTN_H)
+
+    def _paint_cover(self, painter: QPainter, rect: QRect, url: str) -> None:
+        # Solo se pinta lo visible: pedir aquí la portada es cargar solo esas
+        pm = self._thumbs.pixmap(url) if self._thumbs and url else None
+        if pm is None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(157, 70, 255, 25))
+            painter.drawRoundedRect(rect, 4, 4)
+            if self._thumbs and url:
+                self._thumbs.request(self._site_type, url, self.parent())
+            return
+        # Recorte centrado: las portadas no tienen todas la misma proporción
+        src = pm.rect()
+        scale = min(src.width() / rect.width(), src.height() / rect.height())
+        w, h = int(rect.width() * scale), int(rect.height() * scale)
+        src = QRect((src.width() - w) // 2, (src.height() - h) // 2, w, h)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(rect, pm, src)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index) -> None:
+        item = index.model().item(index.row())
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        openable = _can_open(item)
+        font = QFont(self._font) if self._font else QFont(option.font)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        card = option.rect.adjusted(0, 2, -4, -3)
+        painter.setPen(QPen(QColor(157, 70, 255, 128 if hover else 51), 1))
+        painter.setBrush(QColor(25, 28, 38, 140))
+        painter.drawRoundedRect(card, 6, 6)
+
+        btn = self.button_rect(option.rect)
+        painter.setPen(QPen(QColor(157, 70, 255, 255 if openable else 50), 1))
+        painter.setBrush(QColor(157, 70, 255, 90 if openable else 20))
+        painter.drawRoundedRect(btn, 6, 6)
+        bold = QFont(font)
+        bold.setBold(True)
+        painter.setFont(bold)
+        painter.setPen(QColor(255, 255, 255, 255 if openable else 64))
+        painter.drawText(btn, Qt.AlignmentFlag.AlignCenter, "VER SERIE")
+
+        left = card.left() + 12
+        if index.model().has_covers():
+            cover_rect = QRect(left - 6, card.top() + 5, THUMB_W, card.height() - 10)
+            self._paint_cover(painter, cover_rect, index.model().cover(index.row()))
+            left = cover_rect.right() + 12
+
+        painter.setFont(font)
+        text_rect = QRect(left, card.top(), btn.left() - left - 12, card.height())
+        title = QFontMetrics(font).elidedText(
+            item.get("title", "(sin título)"),
+            Qt.TextElideMode.ElideRight,
+            text_rect.width(),
+        )
+        painter.setPen(QColor("#ddd"))
+        painter.drawText(
+            text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, title
+        )
+        painter.restore()
+
+
 def _lbl(color: str = "#aaa") -> str:
     return f"color:{color};font-size:12px;background:transparent;border:none;"
 
@@ -1429,7 +2246,10 @@ class BabylonSeriesPanel(QWidget):
         self.body_font = body_font
         self.title_font = title_font
         self._series: Dict = {}
-        self._chapters: List[Dict] = []
+        self._chapters: List[Dict] = []  # en el orden mostrado
+        self._reversed = False
+        self._from_cache = False
+        self._new_count = 0
         self._dest_dir = _last_dest_dir
         self._pool = QThreadPool.globalInstance()
         self._build_ui()
@@ -1495,16 +2315,17 @@ class BabylonSeriesPanel(QWidget):
         self._ch_list.setStyleSheet(_LIST_STYLE)
         if self.body_font:
             self._ch_list.setFont(self.body_font)
-        self._ch_list.itemSelectionChanged.connect(self._update_btn)
+        self._ch_model = self._ch_list.chapter_model()
+        self._ch_model.selection_changed.connect(self._update_btn)
         content.addWidget(self._ch_list, 1)
 
         rp = QVBoxLayout()
         rp.setSpacing(8)
         rp.setContentsMargins(0, 0, 0, 0)
         for lbl_txt, slot in [
-            ("Seleccionar todo", self._ch_list.selectAll),
-            ("Quitar selección", self._ch_list.clearSelection),
-            ("Invertir selección", self._invert),
+            ("Seleccionar todo", self._ch_model.select_all),
+            ("Quitar selección", self._ch_model.clear_selection),
+            ("Invertir selección", self._ch_model.invert_selection),
             ("Invertir orden", self._invert_order),
             ("ABRIR WEB", self._open_web),
         ]:
@@ -1564,43 +2385,61 @@ class BabylonSeriesPanel(QWidget):
 
     def _load(self) -> None:
         w = BabylonSeriesWorker(self.site["type"], self.item)
+        w.signals.cached.connect(self._on_cached)
         w.signals.finished.connect(self._on_loaded)
-        w.signals.error.connect(lambda e: self._lbl_info.setText(f"Error: {e[:80]}"))
+        w.signals.unchanged.connect(lambda: self._set_info())
+        w.signals.error.connect(self._on_load_error)
         self._pool.start(w)
 
-    def _on_loaded(self, series: Dict, chapters: List[Dict]) -> None:
-        self._series = series
-        self._chapters = chapters
+    def _set_info(self, note: str = "") -> None:
+        series = self._series
         self._lbl_title.setText(series.get("title", self.item.get("title", "?"))[:60])
         extras = [
             str(series.get(k, ""))[:30]
             for k in ("author", "autor", "status", "estado")
             if series.get(k)
         ]
-        info = f"{len(chapters)} capítulos"
+        info = f"{len(self._chapters)} capítulos"
+        if self._new_count:
+            info += f" ({self._new_count} nuevos desde la última visita)"
         if extras:
             info += "  —  " + "  ·  ".join(extras)
+        if note:
+            info += f"  ·  {note}"
         self._lbl_info.setText(info)
-        self._ch_list.clear()
-        for ch in chapters:
-            it = QListWidgetItem(ch.get("title", "?"))
-            it.setData(Qt.ItemDataRole.UserRole, ch)
-            self._ch_list.addItem(it)
+
+    def _on_cached(self, series: Dict, chapters: List[Dict]) -> None:
+        # Lista guardada al momento; el worker sigue revalidando
+        self._series = series
+        self._chapters = list(chapters)
+        self._from_cache = True
+        self._ch_model.set_chapters(chapters)
+        self._set_info("comprobando novedades…")
+
+    def _on_loaded(self, series: Dict, chapters: List[Dict]) -> None:
+        self._series = series
+        ordered = list(reversed(chapters)) if self._reversed else list(chapters)
+        if self._from_cache:
+            # Solo el delta: se conservan scroll y selección
+            added, _removed = chapter_cache.delta(self._chapters, chapters)
+            self._new_count = len(added)
+            self._ch_model.apply_delta(ordered, added)
+        else:
+            self._ch_model.set_chapters(ordered)
+        self._chapters = ordered
+        self._set_info()
+
+    def _on_load_error(self, e: str) -> None:
+        if self._from_cache:
+            self._set_info(f"sin conexión, lista guardada ({e[:40]})")
+        else:
+            self._lbl_info.setText(f"Error: {e[:80]}")
 
     def _update_btn(self) -> None:
-        n = len(self._ch_list.selectedItems())
+        n = self._ch_model.selected_count()
         self._lbl_count.setText(f"{n} seleccionados")
         self._btn_dl.setEnabled(n > 0 and bool(self._dest_dir))
 
-    def _invert(self) -> None:
-        self._ch_list.blockSignals(True)
-        for i in range(self._ch_list.count()):
-            it = self._ch_list.item(i)
-            if it:
-                it.setSelected(not it.isSelected())
-        self._ch_list.blockSignals(False)
-        self._update_btn()
-
     def _choose_dest(self) -> None:
         global _last_dest_dir
         folder = QFileDialog.getExistingDirectory(
@@ -1613,10 +2452,9 @@ class BabylonSeriesPanel(QWidget):
             self._update_btn()
 
     def _request_dl(self) -> None:
-        selected = self._ch_list.selectedItems()
-        if not selected or not self._dest_dir:
+        chapters = self._ch_model.selected_chapters()
+        if not chapters or not self._dest_dir:
             return
-        chapters = [it.data(Qt.ItemDataRole.UserRole) for it in selected]
         safe = re.sub(r'[\\/:*?"<>|]', "", self._series.get("title", "serie")).strip()[
             :50
         ]
@@ -1628,12 +2466,8 @@ class BabylonSeriesPanel(QWidget):
         if not self._chapters:
             return
         self._chapters.reverse()
-        self._ch_list.clear()
-        for ch in self._chapters:
-            it = QListWidgetItem(ch.get("title", "?"))
-            it.setData(Qt.ItemDataRole.UserRole, ch)
-            self._ch_list.addItem(it)
-        self._update_btn()
+        self._ch_model.reverse()
+        self._reversed = not self._reversed
 
     def _open_web(self) -> None:
         url = get_series_url(self.site["type"], self.item)
@@ -2331,7 +3165,8 @@ _SITE_HINTS: Dict[str, str] = {
     "picacomic": "Busca por nombre, o elige categoría/orden y pulsa Listar.",
     "pigmh": "Busca por nombre, o pulsa Listar para ver el catálogo.",
     "toonkor": "Busca por nombre, o pulsa Listar para ver todas las series.",
-    "wfwf": "Elige Webtoon/Manhwa/Ambos y pulsa Listar, o escribe un nombre.",
+    "wfwf": "Elige Webtoon/Manhwa/Ambos y pulsa Listar, o escribe un nombre. "
+    "El catálogo guardado se muestra al momento y se actualiza solo.",
     "yumanhua": "Busca por nombre, o pulsa Listar para ver el catálogo.",
 }
 
@@ -2374,8 +3209,21 @@ class BabylonSiteDetailPanel(QWidget):
         self._cur_filters: Dict = {}
         self._has_more: bool = False
         self._busy: bool = False
+        # Prefetch de la página siguiente. _gen cambia con cada búsqueda o
+        # cambio de filtro: lo que llegue de una generación anterior se tira.
+        self._gen: int = 0
+        self._page_cache: Dict[int, Tuple[List[Dict], bool, str]] = {}
+        self._prefetch_worker: Optional[BabylonSearchWorker] = None
+        self._load_worker: Optional[BabylonSearchWorker] = None
+        self._pending_page: Optional[int] = None
+        self._notice: str = ""
+        self._index_worker: Optional[BabylonIndexWorker] = None
         self._build_ui()
         self._load_dyn()
+        self._start_index_crawl()
+        catalog_events.updated.connect(self._on_catalog_updated)
+        if self.site.get("type") in AUTOLIST_SITES:
+            self._do_list()
 
     def _build_ui(self) -> None:
         self.setObjectName("BabylonSiteDetailPanel")
@@ -2439,6 +3287,7 @@ class BabylonSiteDetailPanel(QWidget):
                     cb.addItem(d, v)
                 if self.body_font:
                     cb.setFont(self.body_font)
+                cb.currentIndexChanged.connect(self._on_filter_changed)
                 self._filter_combos[fd["id"]] = cb
                 fr.addWidget(lbl)
                 fr.addWidget(cb)
@@ -2463,6 +3312,14 @@ class BabylonSiteDetailPanel(QWidget):
                 b.setFont(self.body_font)
             b.clicked.connect(slot)
             sr.addWidget(b)
+        self._chk_remote = QCheckBox("Remoto")
+        self._chk_remote.setToolTip(
+            "Buscar en la web aunque el índice local del sitio esté al día"
+        )
+        self._chk_remote.setStyleSheet("color:#ccc;background:transparent;border:none;")
+        if self.body_font:
+            self._chk_remote.setFont(self.body_font)
+        sr.addWidget(self._chk_remote)
         root.addLayout(sr)
 
         # ── Status + navegación ───────────────────────────────────────────────
@@ -2499,19 +3356,31 @@ class BabylonSiteDetailPanel(QWidget):
         root.addLayout(nav_row)
 
         # ── Resultados ────────────────────────────────────────────────────────
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setStyleSheet("background:transparent;border:none;")
-        self._res_container = QWidget()
-        self._res_container.setStyleSheet("background:transparent;")
-        self._res_layout = QVBoxLayout(self._res_container)
-        self._res_layout.setSpacing(5)
-        self._res_layout.setContentsMargins(0, 0, 4, 0)
-        self._res_layout.addStretch()
-        scroll.setWidget(self._res_container)
-        self._scroll = scroll
-        root.addWidget(scroll, 1)
+        # Vista virtual: modelo con los dicts + delegate que pinta las filas
+        # visibles. Miles de resultados cuestan lo mismo que veinte.
+        self._view = QListView()
+        self._model = _ResultsModel(self._view)
+        self._view.setModel(self._model)
+        self._thumbs = thumb_loader()
+        self._thumbs.ready.connect(self._on_thumb_ready)
+        self._view.setItemDelegate(
+            _ResultDelegate(self._view, self.body_font, self.site["type"], self._thumbs)
+        )
+        self._view.setUniformItemSizes(True)
+        self._view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self._view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self._view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self._view.setMouseTracking(True)
+        self._view.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._view.setFrameShape(QFrame.Shape.NoFrame)
+        self._view.setStyleSheet(
+            "QListView{background:transparent;border:none;outline:none;}"
+        )
+        self._view.clicked.connect(self._on_result_clicked)
+        self._view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self._view.customContextMenuRequested.connect(self._on_result_menu)
+        self._view.verticalScrollBar().valueChanged.connect(self._retain_thumbs)
+        root.addWidget(self._view, 1)
 
     # ── Opciones dinámicas ────────────────────────────────────────────────────
 
@@ -2543,13 +3412,30 @@ class BabylonSiteDetailPanel(QWidget):
         if q:
             self._cur_query = q
             self._cur_filters = self._get_filters()
+            if self._chk_remote.isChecked():
+                self._cur_filters[REMOTE_FLAG] = "1"
+            self._cancel_prefetch()
             self._load_page(1)
 
     def _do_list(self) -> None:
         self._cur_query = ""
         self._cur_filters = self._get_filters()
+        self._cancel_prefetch()
         self._load_page(1)
 
+    # ── Índice local ──────────────────────────────────────────────────────────
+
+    def _start_index_crawl(self) -> None:
+        t = self.site.get("type", "")
+        if t not in INDEX_CRAWL_SITES or get_index().is_fresh(t):
+            return
+        self._index_worker = BabylonIndexWorker(self.site)
+        self._pool.start(self._index_worker)
+
+    def stop_background(self) -> None:
+        if self._index_worker is not None:
+            self._index_worker.cancel()
+
     def _next_page(self) -> None:
         if self._has_more and not self._busy:
             self._load_page(self._cur_page + 1)
@@ -2568,99 +3454,431 @@ class BabylonSiteDetailPanel(QWidget):
         self._btn_next.setEnabled(False)
         self._clear()
 
+        cached = self._page_cache.get(page)
+        if cached is not None:
+            self._on_results(*cached)
+        elif self._prefetch_worker is not None:
+            # Ya hay una petición en vuelo (casi siempre esta misma página):
+            # se espera a ella en vez de pedir dos veces al mismo downloader
+            self._pending_page = page
+        else:
+            self._start_search(page)
+
+    def _start_search(self, page: int) -> None:
+        # La generación y la página viajan con la respuesta: una tardía de
+        # otra búsqueda/filtro no debe acabar en _page_cache de la actual
+        gen = self._gen
         w = BabylonSearchWorker(self.site, self._cur_query, self._cur_filters, page)
-        w.signals.finished.connect(self._on_results)
-        w.signals.error.connect(self._on_error)
+        w.signals.finished.connect(
+            lambda items, more, hint, g=gen, p=page: self._on_search_done(
+                g, p, (items, more, hint)
+            )
+        )
+        w.signals.error.connect(
+            lambda msg, g=gen: self._on_error(msg) if g == self._gen else None
+        )
+        self._load_worker = w
         self._pool.start(w)
 
+    def _on_search_done(self, gen: int, page: int, result: tuple) -> None:
+        if gen != self._gen:
+            return  # búsqueda anterior: _cancel_prefetch ya liberó el panel
+        self._load_worker = None
+        self._page_cache[page] = result
+        if page == self._cur_page:
+            self._on_results(*result)
+
     def _on_results(self, items: List[Dict], has_more: bool, total_hint: str) -> None:
         self._busy = False
         self._has_more = has_more
-        self._clear()
+        self._page_cache[self._cur_page] = (items, has_more, total_hint)
+        self._model.set_items(items)
+        self._retain_thumbs()
 
         if not items:
-            lbl = QLabel("Sin resultados.")
-            lbl.setStyleSheet("color:#555;background:transparent;border:none;")
-            if self.body_font:
-                lbl.setFont(self.body_font)
-            self._res_layout.insertWidget(0, lbl)
             self._lbl_status.setText("Sin resultados")
         else:
-            for item in items:
-                self._res_layout.insertWidget(
-                    self._res_layout.count() - 1, self._make_card(item)
-                )
             # Construir texto de estado con total si está disponible
             page_info = f"Página {self._cur_page}  •  {len(items)} en esta página"
             if total_hint:
                 page_info += f"  •  {total_hint}"
+            if self._notice:
+                page_info += f"  •  {self._notice}"
+                self._notice = ""
             if has_more:
                 page_info += "  →"
             self._lbl_status.setText(page_info)
 
         # Scroll al tope
-        self._scroll.verticalScrollBar().setValue(0)
+        self._view.scrollToTop()
 
         # Actualizar botones de navegación
         self._btn_prev.setEnabled(self._cur_page > 1)
         self._btn_next.setEnabled(has_more)
 
+        if has_more:
+            self._prefetch(self._cur_page + 1)
+
     def _on_error(self, msg: str) -> None:
         self._busy = False
+        self._load_worker = None
         self._lbl_status.setText(f"Error: {msg[:80]}")
         self._btn_prev.setEnabled(self._cur_page > 1)
         self._btn_next.setEnabled(False)
 
+    # ── Prefetch de la página siguiente ───────────────────────────────────────
+
+    def _prefetch(self, page: int) -> None:
+        """
+        Pide `page` en segundo plano con la búsqueda y filtros actuales. Pasa
+        por search_site como una carga normal, así que también calienta lo
+        que haga falta por sitio (metadatos de hitomi, buffers de catálogo).
+        """
+        if page in self._page_cache or self._prefetch_worker is not None:
+            return
+        gen = self._gen
+        w = BabylonSearchWorker(self.site, self._cur_query, self._cur_filters, page)
+        w.signals.finished.connect(
+            lambda items, more, hint, g=gen, p=page: self._on_prefetched(
+                g, p, (items, more, hint)
+            )
+        )
+        w.signals.error.connect(
+            lambda _msg, g=gen, p=page: self._on_prefetched(g, p, None)
+        )
+        self._prefetch_worker = w
+        self._pool.start(w)
+
+    def _on_prefetched(
+        self, gen: int, page: int, result: Optional[Tuple[List[Dict], bool, str]]
+    ) -> None:
+        self._prefetch_worker = None
+        if gen == self._gen and result is not None:
+            self._page_cache[page] = result
+        pending, self._pending_page = self._pending_page, None
+        if pending is None:
+            return
+        cached = self._page_cache.get(pending)
+        if cached is not None:
+            self._on_results(*cached)
+        else:
+            self._start_search(pending)
+
+    def _on_catalog_updated(self, site_type: str, mode: str, n_items: int) -> None:
+        """Catálogo renovado en segundo plano: se repinta el listado en curso."""
+        if site_type != self.site.get("type") or self._cur_query:
+            return
+        # Otro modo del mismo sitio (wfwf webtoon/manhwa): no es lo que se ve
+        if mode and mode != self._cur_filters.get("mode", "both"):
+            return
+        self._cancel_prefetch()
+        self._notice = f"catálogo actualizado ({n_items} series)"
+        self._load_page(self._cur_page)
+
+    def _cancel_prefetch(self) -> bool:
+        """
+        Nueva búsqueda o filtro cambiado: fuera páginas guardadas, prefetch y
+        la carga en vuelo. El panel queda libre para pedir la página nueva
+        al momento; lo que llegue de la carga anterior se ignora por _gen.
+        Devuelve True si había una carga a medias.
+        """
+        self._gen += 1
+        self._page_cache.clear()
+        aborted = self._busy
+        self._busy = False
+        self._pending_page = None  # página de la generación anterior
+        w = self._load_worker
+        if w is not None:
+            self._pool.tryTake(w)  # si ya corría, su respuesta se descarta
+            self._load_worker = None
+        w = self._prefetch_worker
+        if w is not None and self._pool.tryTake(w):
+            # Aún no había empezado: no llegará ninguna señal
+            self._prefetch_worker = None
+        return aborted
+
+    def _on_filter_changed(self, *_args) -> None:
+        if self._cancel_prefetch():
+            # La carga cortada era con los filtros anteriores: nada que pintar
+            self._lbl_status.setText("Filtros cambiados")
+            self._btn_prev.setEnabled(self._cur_page > 1)
+            self._btn_next.setEnabled(False)
+
+    def _clear(self) -> None:
+        self._model.set_items([])
+
+    def _on_thumb_ready(self, url: str) -> None:
+        for row in self._model.rows_for_cover(url):
+            self._view.update(self._model.index(row))
+
+    def _retain_thumbs(self, *_args) -> None:
+        # Portadas de filas que salieron de la vista: fuera de la cola
+        if not self._model.has_covers():
+            return
+        vp = self._view.viewport().rect()
+        first = self._view.indexAt(vp.topLeft()).row()
+        last = self._view.indexAt(vp.bottomLeft()).row()
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = self._model.rowCount() - 1
+        self._thumbs.retain(
+            self._view,
+            {self._model.cover(r) for r in range(first, last + 1)} - {""},
+        )
+
+    def _on_result_clicked(self, index: QModelIndex) -> None:
+        # Click en cualquier parte de la tarjeta (o en "VER SERIE") abre la serie
+        item = self._model.item(index.row())
+        if _can_open(item):
+            self.series_requested.emit(item)
+
+    def _on_result_menu(self, pos: QPoint) -> None:
+        # El título ya no es un QLabel seleccionable: copiar desde el menú
+        index = self._view.indexAt(pos)
+        if not index.isValid():
+            return
+        item = self._model.item(index.row())
+        menu = QMenu(self)
+        act_copy = menu.addAction("Copiar título")
+        act_open = menu.addAction("Ver serie")
+        act_open.setEnabled(_can_open(item))
+        chosen = menu.exec(self._view.viewport().mapToGlobal(pos))
+        if chosen is act_copy:
+            QApplication.clipboard().setText(item.get("title", ""))
+        elif chosen is act_open:
+            self.series_requested.emit(item)
+
+
+class BabylonFederatedPanel(QWidget):
+    """
+    Búsqueda en todos los sitios a la vez. Los resultados se pintan según
+    responde cada sitio; los títulos que parecen la misma serie (title_key)
+    se agrupan en una tarjeta con un botón por sitio.
+    """
+
+    back_requested = Signal()
+    series_requested = Signal(dict, dict)  # (site, item)
+
+    def __init__(
+        self,
+        parent: Optional[QWidget] = None,
+        title_font: Optional[QFont] = None,
+        body_font: Optional[QFont] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.title_font = title_font
+        self.body_font = body_font
+        self._pool = QThreadPool.globalInstance()
+        self._sites: Dict[str, Dict] = {s["type"]: s for s in federated_sites()}
+        self._search_id = 0
+        self._worker: Optional[BabylonFederatedWorker] = None
+        self._pending: set = set()
+        self._failed: List[str] = []
+        self._n_results = 0
+        # title_key → (layout de botones, sitios ya presentes)
+        self._groups: Dict[str, Tuple[QHBoxLayout, set]] = {}
+        self._build_ui()
+
+    def _build_ui(self) -> None:
+        self.setObjectName("BabylonFederatedPanel")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet(f"#BabylonFederatedPanel{{{_PANEL_BG}}}")
+        root = QVBoxLayout(self)
+        root.setContentsMargins(18, 14, 18, 14)
+        root.setSpacing(8)
+
+        # ── Header ───────────────────────────────────────────────────────────
+        hdr = QHBoxLayout()
+        btn_back = QPushButton("VOLVER")
+        btn_back.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_back.setStyleSheet(_BTN_BASE)
+        if self.body_font:
+            btn_back.setFont(self.body_font)
+        btn_back.clicked.connect(self._on_back)
+        hdr.addWidget(btn_back)
+        hdr.addStretch()
+        lt = QLabel("Búsqueda en todos los sitios")
+        lt.setStyleSheet(
+            "color:#bd7aff;font-size:13px;background:transparent;border:none;"
+        )
+        if self.title_font:
+            lt.setFont(self.title_font)
+        hdr.addWidget(lt)
+        root.addLayout(hdr)
+
+        # ── Búsqueda ─────────────────────────────────────────────────────────
+        sr = QHBoxLayout()
+        self._search = _ArrowLineEdit()
+        self._search.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._search.setPlaceholderText("Título en cualquier idioma…")
+        self._search.returnPressed.connect(self._do_search)
+        if self.body_font:
+            self._search.setFont(self.body_font)
+        sr.addWidget(self._search, 1)
+        b = QPushButton("Buscar")
+        b.setStyleSheet(_BTN_BASE)
+        b.setCursor(Qt.CursorShape.PointingHandCursor)
+        if self.body_font:
+            b.setFont(self.body_font)
+        b.clicked.connect(self._do_search)
+        sr.addWidget(b)
+        root.addLayout(sr)
+
+        self._lbl_status = QLabel("")
+        self._lbl_status.setStyleSheet(
+            "color:#888;font-size:11px;background:transparent;border:none;"
+        )
+        self._lbl_status.setWordWrap(True)
+        if self.body_font:
+            self._lbl_status.setFont(self.body_font)
+        root.addWidget(self._lbl_status)
+
+        # ── Resultados ────────────────────────────────────────────────────────
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setStyleSheet("background:transparent;border:none;")
+        self._res_container = QWidget()
+        self._res_container.setStyleSheet("background:transparent;")
+        self._res_layout = QVBoxLayout(self._res_container)
+        self._res_layout.setSpacing(5)
+        self._res_layout.setContentsMargins(0, 0, 4, 0)
+        self._res_layout.addStretch()
+        scroll.setWidget(self._res_container)
+        root.addWidget(scroll, 1)
+
+    # ── Búsqueda ──────────────────────────────────────────────────────────────
+
+    def search(self, query: str) -> None:
+        self._search.setText(query)
+        self._do_search()
+
+    def _do_search(self) -> None:
+        q = self._search.text().strip()
+        if not q:
+            return
+        self.stop()
+        self._search_id += 1
+        self._pending = set(self._sites)
+        self._failed = []
+        self._n_results = 0
+        self._groups.clear()
+        self._clear()
+        self._update_status()
+
+        w = BabylonFederatedWorker(self._search_id, list(self._sites.values()), q)
+        w.signals.site_done.connect(self._on_site)
+        w.signals.all_done.connect(self._on_all_done)
+        self._worker = w
+        self._pool.start(w)
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def _on_back(self) -> None:
+        self.stop()
+        self.back_requested.emit()
+
+    def _on_site(self, search_id: int, site_type: str, items: List[Dict], error: str) -> None:
+        if search_id != self._search_id:
+            return  # respuesta tardía de una búsqueda anterior
+        self._pending.discard(site_type)
+        name = self._sites.get(site_type, {}).get("name", site_type)
+        if error:
+            self._failed.append(f"{name} ({error})")
+        # La primera página de un sitio en memoria ya trae SLICE_PAGE_SIZE
+        # resultados; aquí son tarjetas reales, así que solo los primeros
+        for item in items[:PAGE_SIZE]:
+            self._add_result(site_type, item)
+        self._update_status()
+
+    def _on_all_done(self, search_id: int) -> None:
+        if search_id != self._search_id:
+            return
+        self._pending.clear()
+        self._worker = None
+        self._update_status()
+        if not self._groups:
+            lbl = QLabel("Sin resultados.")
+            lbl.setStyleSheet("color:#555;background:transparent;border:none;")
+            if self.body_font:
+                lbl.setFont(self.body_font)
+            self._res_layout.insertWidget(0, lbl)
+
+    def _update_status(self) -> None:
+        done = len(self._sites) - len(self._pending)
+        txt = (
+            f"{done}/{len(self._sites)} sitios  •  {self._n_results} resultados"
+            f"  •  {len(self._groups)} series"
+        )
+        if self._pending:
+            names = ", ".join(
+                self._sites[t].get("name", t) for t in sorted(self._pending)
+            )
+            txt += f"  •  esperando: {names}"
+        if self._failed:
+            txt += f"  •  sin resultados de: {', '.join(self._failed)}"
+        self._lbl_status.setText(txt)
+
+    # ── Resultados agrupados ──────────────────────────────────────────────────
+
     def _clear(self) -> None:
         while self._res_layout.count() > 1:
             it = self._res_layout.takeAt(0)
             if it and it.widget():
                 it.widget().deleteLater()
 
-    def _make_card(self, item: Dict) -> QFrame:
+    def _add_result(self, site_type: str, item: Dict) -> None:
+        self._n_results += 1
+        key = title_key(item.get("title", ""))
+        group = self._groups.get(key)
+        if group is None:
+            card, chips = self._make_group(item.get("title", "(sin título)"))
+            self._res_layout.insertWidget(self._res_layout.count() - 1, card)
+            group = self._groups[key] = (chips, set())
+        chips, present = group
+        if site_type in present:
+            return  # mismo sitio, misma serie con otra variante de título
+        present.add(site_type)
+        site = self._sites.get(site_type, {"type": site_type, "name": site_type})
+        btn = QPushButton(site.get("name", site_type))
+        btn.setStyleSheet(_BTN_PRIMARY)
+        btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn.setToolTip(item.get("title", ""))
+        if self.body_font:
+            btn.setFont(self.body_font)
+        btn.clicked.connect(
+            lambda _c=False, s=site, i=item: self.series_requested.emit(s, i)
+        )
+        chips.insertWidget(chips.count() - 1, btn)
+
+    def _make_group(self, title: str) -> Tuple[QFrame, QHBoxLayout]:
         card = QFrame()
         card.setFrameShape(QFrame.Shape.StyledPanel)
         card.setStyleSheet(
             "QFrame{background:rgba(25,28,38,140);"
             "border:1px solid rgba(157,70,255,0.2);border-radius:6px;}"
-            "QFrame:hover{border:1px solid rgba(157,70,255,0.5);}"
         )
-        card.setCursor(Qt.CursorShape.PointingHandCursor)
-        lay = QHBoxLayout(card)
+        lay = QVBoxLayout(card)
         lay.setContentsMargins(12, 7, 12, 7)
+        lay.setSpacing(5)
 
-        title_lbl = QLabel(item.get("title", "(sin título)"))
+        title_lbl = QLabel(title)
         title_lbl.setStyleSheet("color:#ddd;background:transparent;border:none;")
         title_lbl.setWordWrap(True)
         title_lbl.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        title_lbl.setCursor(Qt.CursorShape.IBeamCursor)
         if self.body_font:
             title_lbl.setFont(self.body_font)
-        lay.addWidget(title_lbl, 1)
-
-        btn_view = QPushButton("VER SERIE")
-        btn_view.setMinimumWidth(100)
-        btn_view.setStyleSheet(_BTN_PRIMARY)
-        btn_view.setCursor(Qt.CursorShape.PointingHandCursor)
-        if self.body_font:
-            btn_view.setFont(self.body_font)
-        can_open = bool(item.get("slug") and item.get("slug") != "__no_token__")
-        btn_view.setEnabled(can_open)
-
-        def _open_series(i=item):
-            self.series_requested.emit(i)
-
-        btn_view.clicked.connect(lambda _c=False, i=item: _open_series(i))
-        lay.addWidget(btn_view)
-
-        # Click en el fondo del card (no widgets hijos) abre la serie
-        if can_open:
-            def _card_press(ev, i=item):
-                if ev.button() == Qt.MouseButton.LeftButton:
-                    self.series_requested.emit(i)
-            card.mousePressEvent = _card_press  # type: ignore
+        lay.addWidget(title_lbl)
 
-        return card
+        chips = QHBoxLayout()
+        chips.setSpacing(6)
+        chips.addStretch()
+        lay.addLayout(chips)
+        return card, chips
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2685,8 +3903,12 @@ class BabylonPanel(QWidget):
         self._series_p: Optional[BabylonSeriesPanel] = None
         self._dl_p: Optional[BabylonDownloadPanel] = None
         self._cfg_p: Optional[BabylonConfigPanel] = None
+        self._fed_p: Optional[BabylonFederatedPanel] = None
         self._cur_site: Optional[str] = None
         self._cur_site_obj: Optional[Dict] = None
+        # Sitio de la ficha abierta y panel al que vuelve (sitio o federada)
+        self._series_site_obj: Optional[Dict] = None
+        self._series_origin: Optional[QWidget] = None
         self._root = QVBoxLayout(self)
         self._root.setContentsMargins(0, 0, 0, 0)
         self._build_grid()
@@ -2696,6 +3918,25 @@ class BabylonPanel(QWidget):
         self._grid.setStyleSheet("background:transparent;border:none;")
         gv = QVBoxLayout(self._grid)
         gv.setContentsMargins(0, 0, 0, 0)
+
+        sr = QHBoxLayout()
+        sr.setContentsMargins(8, 8, 8, 0)
+        self._fed_search = _ArrowLineEdit()
+        self._fed_search.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._fed_search.setPlaceholderText("Buscar en todos los sitios…")
+        self._fed_search.returnPressed.connect(self._open_federated)
+        if self.body_font:
+            self._fed_search.setFont(self.body_font)
+        sr.addWidget(self._fed_search, 1)
+        b = QPushButton("Buscar en todos")
+        b.setStyleSheet(_BTN_BASE)
+        b.setCursor(Qt.CursorShape.PointingHandCursor)
+        if self.body_font:
+            b.setFont(self.body_font)
+        b.clicked.connect(self._open_federated)
+        sr.addWidget(b)
+        gv.addLayout(sr)
+
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.Shape.NoFrame)
@@ -2797,21 +4038,48 @@ class BabylonPanel(QWidget):
                 logging.warning(f"[Babylon] Icono {site.get('name')}: {e}")
 
     def _show_grid(self) -> None:
-        for w in (self._site_p, self._series_p, self._dl_p, self._cfg_p):
+        for w in (self._site_p, self._series_p, self._dl_p, self._cfg_p, self._fed_p):
             if w:
                 w.hide()
         if self._grid:
             self._grid.show()
 
+    def _open_federated(self) -> None:
+        q = self._fed_search.text().strip()
+        if not q:
+            return
+        if self._grid:
+            self._grid.hide()
+        for w in (self._site_p, self._series_p, self._dl_p, self._cfg_p):
+            if w:
+                w.hide()
+        if self._fed_p is None:
+            self._fed_p = BabylonFederatedPanel(
+                parent=self,
+                title_font=self.title_font,
+                body_font=self.body_font,
+            )
+            self._fed_p.back_requested.connect(self._show_grid)
+            self._fed_p.series_requested.connect(self._open_federated_series)
+            self._root.addWidget(self._fed_p)
+        self._fed_p.show()
+        self._fed_p.search(q)
+
+    def _open_federated_series(self, site: Dict, item: Dict) -> None:
+        if self._fed_p:
+            self._fed_p.hide()
+        self._show_series(site, item, self._fed_p)
+
     def _open_site(self, site: Dict) -> None:
         if self._grid:
             self._grid.hide()
-        for w in (self._series_p, self._dl_p, self._cfg_p):
+        for w in (self._series_p, self._dl_p, self._cfg_p, self._fed_p):
             if w:
                 w.hide()
 
         if self._site_p is None or self._cur_site != site["type"]:
             if self._site_p:
+                self._site_p.stop_background()
                 self._root.removeWidget(self._site_p)
                 self._site_p.deleteLater()
             self._site_p = BabylonSiteDetailPanel(
@@ -2858,6 +4126,9 @@ class BabylonPanel(QWidget):
             return
         if self._site_p:
             self._site_p.hide()
+        self._show_series(self._cur_site_obj or {}, item, self._site_p)
+
+    def _show_series(self, site: Dict, item: Dict, origin: Optional[QWidget]) -> None:
         if self._dl_p:
             self._dl_p.hide()
 
@@ -2865,8 +4136,10 @@ class BabylonPanel(QWidget):
             self._root.removeWidget(self._series_p)
             self._series_p.deleteLater()
 
+        self._series_site_obj = site
+        self._series_origin = origin
         self._series_p = BabylonSeriesPanel(
-            site=self._cur_site_obj or {},
+            site=site,
             item=item,
             parent=self,
             body_font=self.body_font,
@@ -2880,8 +4153,8 @@ class BabylonPanel(QWidget):
     def _back_to_site(self) -> None:
         if self._series_p:
             self._series_p.hide()
-        if self._site_p:
-            self._site_p.show()
+        if self._series_origin:
+            self._series_origin.show()
 
     def _start_dl(self, series: Dict, chapters: List[Dict], output_dir: str) -> None:
         if self._series_p:
@@ -2891,7 +4164,7 @@ class BabylonPanel(QWidget):
             self._dl_p.deleteLater()
 
         self._dl_p = BabylonDownloadPanel(
-            site_type=self._cur_site or "",
+            site_type=(self._series_site_obj or {}).get("type", ""),
             series=series,
             chapters=chapters,
             output_dir=output_dir,
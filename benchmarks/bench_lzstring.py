@@ -0,0 +1,252 @@
+"""
+bench_lzstring.py — Micro-benchmark de d_manhuagui.lzstring_decompress_base64.
+
+Compara el decodificador actual contra el port directo del JS (referencia)
+sobre payloads de tamaño real:
+  - symtab de p.a.c.k.e.r  (~2-6 KB comprimido, una por capítulo)
+  - __VIEWSTATE de /comic/ID/ (~7-30 KB comprimido, 200-1200 capítulos)
+
+Verifica salida idéntica (incluidos streams truncados) y muestra el speedup.
+Referencia y nuevo se alternan ronda a ronda y el speedup es la mediana de
+los cocientes por ronda: con el mínimo de cada uno por separado, el ruido
+de la máquina (otro proceso, frecuencia de CPU) lo movía entre ~4x y ~7x.
+Así medido sale 5.5-6.3x en los dos casos.
+
+Uso:
+    python benchmarks/bench_lzstring.py
+    python benchmarks/bench_lzstring.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+_DL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "babylon_downloaders")
+if _DL_DIR not in sys.path:
+    sys.path.insert(0, _DL_DIR)
+
+from d_manhuagui import lzstring_decompress_base64  # noqa: E402
+
+_B64_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_B64_MAP = {ch: i for i, ch in enumerate(_B64_CHARS)}
+
+
+# ── Referencia: port directo del JS (implementación anterior) ────────────────
+
+
+def reference_decompress(compressed: str) -> str:
+    if not compressed:
+        return ""
+    safe = lambda i: _B64_MAP.get(compressed[i], 0) if i < len(compressed) else 0
+    dv, dp, di = safe(0), 32, 1
+    result: list[str] = []
+    dictionary: list = list(range(3))
+    enlargeIn, dictSize, numBits = 4, 4, 3
+
+    def rb(maxpower: int) -> int:
+        nonlocal dv, dp, di
+        bits, p = 0, 1
+        while p != maxpower:
+            resb = dv & dp
+            dp >>= 1
+            if dp == 0:
+                dp = 32
+                dv = safe(di)
+                di += 1
+            bits |= (1 if resb > 0 else 0) * p
+            p <<= 1
+        return bits
+
+    nxt = rb(4)
+    c = chr(rb(256) if nxt == 0 else rb(65536) if nxt == 1 else 0)
+    if nxt not in (0, 1):
+        return ""
+    dictionary.append(c)
+    w = c
+    result.append(c)
+
+    while True:
+        if di > len(compressed):
+            return ""
+        c = rb(1 << numBits)
+        if c == 0:
+            dictionary.append(chr(rb(256)))
+            c = dictSize
+            dictSize += 1
+            enlargeIn -= 1
+        elif c == 1:
+            dictionary.append(chr(rb(65536)))
+            c = dictSize
+            dictSize += 1
+            enlargeIn -= 1
+        elif c == 2:
+            return "".join(result)
+        if enlargeIn == 0:
+            enlargeIn = 1 << numBits
+            numBits += 1
+        entry = (
+            dictionary[c]
+            if c < len(dictionary)
+            else w + w[0]
+            if c == dictSize
+            else None
+        )
+        if entry is None:
+            return "".join(result)
+        result.append(entry)
+        dictionary.append(w + entry[0])
+        dictSize += 1
+        enlargeIn -= 1
+        if enlargeIn == 0:
+            enlargeIn = 1 << numBits
+            numBits += 1
+        w = entry
+
+
+# ── Compresor (LZString.compressToBase64) para generar payloads ─────────────
+
+
+def compress_base64(text: str) -> str:
+    out: list[str] = []
+    val, pos = 0, 0
+
+    def write(value: int, nbits: int) -> None:
+        nonlocal val, pos
+        for _ in range(nbits):
+            val = (val << 1) | (value & 1)
+            value >>= 1
+            pos += 1
+            if pos == 6:
+                out.append(_B64_CHARS[val])
+                val, pos = 0, 0
+
+    dictionary: dict[str, int] = {}
+    to_create: set[str] = set()
+    w = ""
+    enlarge_in, dict_size, num_bits = 2, 3, 2
+
+    def emit_w() -> None:
+        nonlocal enlarge_in, num_bits
+        if w in to_create:
+            code = ord(w[0])
+            if code < 256:
+                write(0, num_bits)
+                write(code, 8)
+            else:
+                write(1, num_bits)
+                write(code, 16)
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+            to_create.discard(w)
+        else:
+            write(dictionary[w], num_bits)
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+    for c in text:
+        if c not in dictionary:
+            dictionary[c] = dict_size
+            dict_size += 1
+            to_create.add(c)
+        wc = w + c
+        if wc in dictionary:
+            w = wc
+            continue
+        emit_w()
+        dictionary[wc] = dict_size
+        dict_size += 1
+        w = c
+    if w:
+        emit_w()
+    write(2, num_bits)
+    while pos:
+        write(0, 1)
+    while len(out) % 4:
+        out.append("=")
+    return "".join(out)
+
+
+# ── Payloads ─────────────────────────────────────────────────────────────────
+
+
+def _viewstate_html(n_chapters: int, rnd: random.Random) -> str:
+    rows = []
+    for i in range(n_chapters):
+        chid = 100000 + rnd.randrange(900000)
+        rows.append(
+            f'<li><a href="/comic/12345/{chid}.html" title="第{i + 1}话 {rnd.random():.6f}"'
+            f' class="status0" target="_blank"><span>第{i + 1}话<i>{rnd.randrange(40)}p</i>'
+            "</span></a></li>"
+        )
+    return '<div class="chapter-list cf mt10" id="chapter-list-0"><ul>' + "".join(rows) + "</ul></div>"
+
+
+def _symtab(n_words: int, rnd: random.Random) -> str:
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789_"
+    words = [
+        "".join(rnd.choice(alphabet) for _ in range(rnd.randrange(2, 12)))
+        for _ in range(n_words)
+    ]
+    return "|".join(words)
+
+
+def _check(payloads: list[str]) -> None:
+    for comp in payloads:
+        assert lzstring_decompress_base64(comp) == reference_decompress(comp)
+        # Streams truncados / corruptos deben fallar exactamente igual
+        for cut in (1, 2, 3, 7, len(comp) // 2, len(comp) - 1):
+            part = comp[:cut]
+            assert lzstring_decompress_base64(part) == reference_decompress(part), cut
+        noisy = comp[:10] + "\n@" + comp[10:]
+        assert lzstring_decompress_base64(noisy) == reference_decompress(noisy)
+
+
+def _run(fn, payloads: list[str]) -> float:
+    t0 = time.perf_counter()
+    for p in payloads:
+        fn(p)
+    return time.perf_counter() - t0
+
+
+def _time(payloads: list[str], rounds: int) -> tuple[float, float, float]:
+    """(mejor ref, mejor nuevo, mediana de ref/nuevo por ronda)."""
+    refs, news, ratios = [], [], []
+    for _ in range(rounds):
+        t_ref = _run(reference_decompress, payloads)
+        t_new = _run(lzstring_decompress_base64, payloads)
+        refs.append(t_ref)
+        news.append(t_new)
+        ratios.append(t_ref / t_new)
+    ratios.sort()
+    return min(refs), min(news), ratios[len(ratios) // 2]
+
+
+def main() -> None:
+    rounds = 15
+    if "--rounds" in sys.argv:
+        rounds = int(sys.argv[sys.argv.index("--rounds") + 1])
+    rnd = random.Random(1234)
+
+    cases = {
+        "symtab (p.a.c.k.e.r)": [compress_base64(_symtab(n, rnd)) for n in (300, 600, 900)],
+        "__VIEWSTATE": [compress_base64(_viewstate_html(n, rnd)) for n in (200, 600, 1200)],
+    }
+    for label, payloads in cases.items():
+        _check(payloads)
+        sizes = ", ".join(f"{len(p) / 1024:.1f}KB" for p in payloads)
+        t_ref, t_new, speedup = _time(payloads, rounds)
+        print(
+            f"{label:<22} [{sizes}]  ref={t_ref * 1000:8.2f}ms  "
+            f"nuevo={t_new * 1000:8.2f}ms  speedup={speedup:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
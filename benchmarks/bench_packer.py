@@ -0,0 +1,186 @@
+"""
+bench_packer.py — Micro-benchmark del decodificador p.a.c.k.e.r compartido.
+
+Compara packer.py contra las implementaciones anteriores de cada sitio:
+  - dumanwu/yumanhua: regex por llamada + _b62_int() por token (str.index)
+  - manhuagui:        _Unbaser por token (potencias de la base)
+
+sobre payloads sintéticos con el tamaño de los wrappers reales (symtab de
+200-2000 palabras, payload de 5-60 KB). Mide:
+  - frío:     primera resolución (tabla token→palabra + sustitución)
+  - memo:     mismo script otra vez (reintento / capítulo ya visto)
+
+Verifica salida idéntica antes de medir.
+
+Uso:
+    python benchmarks/bench_packer.py
+    python benchmarks/bench_packer.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import re
+import sys
+import time
+
+_DL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "babylon_downloaders")
+if _DL_DIR not in sys.path:
+    sys.path.insert(0, _DL_DIR)
+
+import packer  # noqa: E402
+
+_B62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+# ── Referencia: dumanwu / yumanhua ───────────────────────────────────────────
+
+
+def _b62_int(token: str, base: int = 62) -> int:
+    chars = _B62[:base] if base <= 62 else _B62
+    n = 0
+    try:
+        for ch in token:
+            n = n * base + chars.index(ch)
+    except ValueError:
+        return -1
+    return n
+
+
+def reference_decode(p: str, base: int, k_str: str) -> str:
+    keys = k_str.split("|")
+
+    def replace(m: re.Match) -> str:
+        idx = _b62_int(m.group(0), base)
+        return keys[idx] if 0 <= idx < len(keys) and keys[idx] else m.group(0)
+
+    return re.sub(r"\b[0-9A-Za-z]+\b", replace, p)
+
+
+def reference_extract_args(script: str):
+    try:
+        start = script.rindex("}(") + 2
+        parts = re.findall(r"'((?:[^'\\]|\\.)*)'|(\d+)", script[start:])
+        vals = [int(n) if n else s for s, n in parts]
+        if len(vals) >= 4:
+            return str(vals[0]), int(vals[1]), int(vals[2]), str(vals[3])
+    except (ValueError, IndexError):
+        pass
+    return None
+
+
+def reference_unpack(script: str):
+    args = reference_extract_args(script)
+    if not args:
+        return None
+    p, base, _count, k = args
+    return reference_decode(p, base, k)
+
+
+# ── Referencia: manhuagui (_Unbaser) ─────────────────────────────────────────
+
+
+def _unbase62(s: str, dictionary={c: i for i, c in enumerate(_B62)}) -> int:
+    ret = 0
+    for idx, ch in enumerate(s[::-1]):
+        ret += (62**idx) * dictionary.get(ch, 0)
+    return ret
+
+
+def reference_manhuagui_decode(payload: str, symtab: list[str]) -> str:
+    def lookup(mm: re.Match) -> str:
+        word = mm.group(0)
+        val = _unbase62(word)
+        if val < len(symtab) and symtab[val]:
+            return symtab[val]
+        return word
+
+    return re.sub(r"\b[0-9a-zA-Z]+\b", lookup, payload)
+
+
+# ── Payloads ─────────────────────────────────────────────────────────────────
+
+
+def _encode(n: int) -> str:
+    out = ""
+    while True:
+        n, r = divmod(n, 62)
+        out = _B62[r] + out
+        if not n:
+            return out
+
+
+def _packed_script(n_words: int, n_tokens: int, rnd: random.Random) -> tuple[str, str, list[str]]:
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789_"
+    symtab = [
+        "".join(rnd.choice(alphabet) for _ in range(rnd.randrange(2, 12)))
+        for _ in range(n_words)
+    ]
+    # Entradas vacías: el token se queda tal cual (igual que en el JS)
+    for i in rnd.sample(range(n_words), n_words // 20):
+        symtab[i] = ""
+    seps = ["(", ")", ".", "=", ";", "[", "]", ",", " ", "+"]
+    toks = []
+    for _ in range(n_tokens):
+        toks.append(_encode(rnd.randrange(n_words + n_words // 10)))
+        toks.append(rnd.choice(seps))
+    payload = "".join(toks)
+    script = (
+        "eval(function(p,a,c,k,e,d){e=function(c){return c};return p}"
+        f"('{payload}',62,{n_words},'{'|'.join(symtab)}'.split('|'),0,{{}}))"
+    )
+    return script, payload, symtab
+
+
+def _time(fn, items: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for it in items:
+            fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    rounds = 5
+    if "--rounds" in sys.argv:
+        rounds = int(sys.argv[sys.argv.index("--rounds") + 1])
+    rnd = random.Random(7)
+
+    cases = [_packed_script(w, t, rnd) for w, t in ((200, 1500), (800, 6000), (2000, 15000))]
+    scripts = [c[0] for c in cases]
+
+    for script, payload, symtab in cases:
+        assert packer.unpack_script(script) == reference_unpack(script)
+        assert packer.decode(payload, 62, symtab) == reference_manhuagui_decode(payload, symtab)
+    sizes = ", ".join(f"{len(s) / 1024:.1f}KB" for s in scripts)
+    print(f"scripts: [{sizes}]")
+
+    def cold(script: str) -> None:
+        packer.clear_memo()
+        packer.unpack_script(script)
+
+    t_ref = _time(reference_unpack, scripts, rounds)
+    t_cold = _time(cold, scripts, rounds)
+    packer.clear_memo()
+    for s in scripts:
+        packer.unpack_script(s)
+    t_memo = _time(packer.unpack_script, scripts, rounds)
+    print(
+        f"dumanwu/yumanhua  ref={t_ref * 1000:8.2f}ms  frío={t_cold * 1000:7.2f}ms "
+        f"({t_ref / t_cold:4.1f}x)  memo={t_memo * 1000:6.3f}ms ({t_ref / t_memo:6.0f}x)"
+    )
+
+    pairs = [(c[1], c[2]) for c in cases]
+    t_ref = _time(lambda ps: reference_manhuagui_decode(*ps), pairs, rounds)
+    t_new = _time(lambda ps: packer.decode(ps[0], 62, ps[1]), pairs, rounds)
+    print(
+        f"manhuagui decode  ref={t_ref * 1000:8.2f}ms  nuevo={t_new * 1000:6.2f}ms "
+        f"({t_ref / t_new:4.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+bench_parsers.py — CPU de los parsers HTML: lxml (htmlparse) vs BeautifulSoup.
+
+Casos:
+  - 18mh_cards         d_18mh._parse_cards            (listados / búsqueda)
+  - baozimh_chapters   d_baozimh._parse_com_chapters  (lista de capítulos)
+  - wfwf_series        d_wfwf._parse_series_from_html (categorías)
+  - mangafox_list      d_mangafox._parse_manga_list   (directorio / búsqueda)
+
+Fixtures: benchmarks/fixtures/<caso>/*.html, páginas reales guardadas con
+capture_fixtures.py (o a mano desde el navegador). Si la carpeta de un caso
+no existe o está vacía se generan páginas sintéticas con la misma maqueta y
+tamaño parecido; la columna final dice cuál de las dos se midió.
+
+Fuera de la comparación: d_bakamh (_parse_manga_cards, _chapters_from_html)
+y d_manhuagui (_browse_page, _parse_chapters) también parsean listados, pero
+reciben una sopa que quien llama reutiliza para otras cosas (meta, nonce,
+paginación) y siguen en BeautifulSoup.
+
+Cada caso corre dos veces: con lxml y forzando el fallback BeautifulSoup
+(htmlparse.document → None). Verifica resultados idénticos antes de medir.
+
+Uso:
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --rounds 10
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import random
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_DL_DIR = os.path.join(os.path.dirname(_HERE), "babylon_downloaders")
+if _DL_DIR not in sys.path:
+    sys.path.insert(0, _DL_DIR)
+
+import d_18mh  # noqa: E402
+import d_baozimh  # noqa: E402
+import d_mangafox  # noqa: E402
+import d_wfwf  # noqa: E402
+import htmlparse  # noqa: E402
+
+FIXTURES_DIR = os.path.join(_HERE, "fixtures")
+
+_rnd = random.Random(11)
+
+
+def _word(n: int = 8) -> str:
+    return "".join(_rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(n))
+
+
+def _chrome(body: str) -> str:
+    """Cabecera/pie con navegación y scripts, como las páginas reales."""
+    nav = "".join(f'<li><a href="/{_word()}">{_word(5)}</a></li>' for _ in range(40))
+    js = "<script>var x = {};</script>" * 10
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>t</title>{js}</head>"
+        f"<body><header><ul class='nav'>{nav}</ul></header>{body}"
+        f"<footer><p>Copyright {_word()}</p></footer></body></html>"
+    )
+
+
+# ── Páginas sintéticas ───────────────────────────────────────────────────────
+
+
+def _gen_18mh() -> str:
+    cards = "".join(
+        f'<div class="card"><a href="/manga/{_word()}"><img src="/c/{i}.jpg" alt="{_word()}">'
+        f"<h3>{_word(10)}</h3><span>連載中</span></a></div>"
+        for i in range(60)
+    )
+    reco = "".join(
+        f'<a href="/manga/{_word()}"><img alt="{_word()}"></a>' for _ in range(12)
+    )
+    return _chrome(f"<main>{cards}</main><div><h2>猜你喜歡</h2>{reco}</div>")
+
+
+def _gen_baozimh() -> str:
+    links = "".join(
+        f'<div class="comics-chapters"><a href="/user/page_direct?comic_id=x&amp;'
+        f'section_slot=0&amp;chapter_slot={i}" class="comics-chapters__item">'
+        f"<div><span>第{i + 1}話 {_word(4)}</span></div></a></div>"
+        for i in range(600)
+    )
+    return _chrome(f'<div class="l-box">{links}</div>')
+
+
+def _gen_wfwf() -> str:
+    cards = "".join(
+        f'<li><a href="/list?toon={1000 + i}&amp;title={_word()}">'
+        f'<div class="img"><img src="/t/{i}.jpg" alt="{_word(9)}"></div>'
+        f'<div class="txt"><p>{_word(9)}</p><p>{_word(4)}</p></div></a></li>'
+        for i in range(300)
+    )
+    return _chrome(f'<ul class="webtoon-list">{cards}</ul>')
+
+
+def _gen_mangafox() -> str:
+    items = "".join(
+        f'<li><a href="/manga/{_word()}/"><img src="/c/{i}.jpg"></a>'
+        f'<p class="manga-list-4-item-title"><a href="/manga/{_word()}/" title="t">'
+        f"{_word(12)}</a></p><p class=\"manga-list-4-item-tip\">{_word(20)}</p></li>"
+        for i in range(70)
+    )
+    return _chrome(f'<ul class="manga-list-4-list line">{items}</ul>')
+
+
+CASES = {
+    "18mh_cards": (d_18mh, lambda h: d_18mh._parse_cards(h), _gen_18mh),
+    "baozimh_chapters": (
+        d_baozimh,
+        lambda h: d_baozimh._parse_com_chapters(h, "x"),
+        _gen_baozimh,
+    ),
+    "wfwf_series": (
+        d_wfwf,
+        lambda h: d_wfwf._parse_series_from_html(h, d_wfwf.Mode(d_wfwf.Mode.WEBTOON)),
+        _gen_wfwf,
+    ),
+    "mangafox_list": (d_mangafox, lambda h: d_mangafox._parse_manga_list(h), _gen_mangafox),
+}
+
+
+def _fixtures(name: str, gen) -> tuple[list[str], str]:
+    files = sorted(glob.glob(os.path.join(FIXTURES_DIR, name, "*.html")))
+    if files:
+        pages = []
+        for path in files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+        return pages, f"{len(files)} fixtures"
+    return [gen() for _ in range(5)], "sintético"
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+
+def _time(fn, pages: list[str], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for h in pages:
+            fn(h)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    if not htmlparse.HAS_LXML:
+        sys.exit("lxml no está instalado: no hay nada que comparar")
+    rounds = 5
+    if "--rounds" in sys.argv:
+        rounds = int(sys.argv[sys.argv.index("--rounds") + 1])
+
+    for name, (mod, parse, gen) in CASES.items():
+        pages, source = _fixtures(name, gen)
+        lxml_doc = mod.document
+
+        def bs4_parse(h: str, parse=parse, mod=mod):
+            mod.document = lambda _h: None
+            try:
+                return parse(h)
+            finally:
+                mod.document = lxml_doc
+
+        n_items = 0
+        for h in pages:
+            fast, ref = parse(h), bs4_parse(h)
+            assert fast == ref, f"{name}: lxml y BS4 difieren"
+            n_items += len(fast)
+        t_bs4 = _time(bs4_parse, pages, rounds)
+        t_lxml = _time(parse, pages, rounds)
+        kb = sum(len(h) for h in pages) / 1024
+        print(
+            f"{name:17s} {len(pages):3d} págs {kb:7.0f}KB {n_items:6d} items  "
+            f"bs4={t_bs4 * 1000:8.1f}ms  lxml={t_lxml * 1000:7.1f}ms  "
+            f"speedup={t_bs4 / t_lxml:4.1f}x  ({source})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+bench_xor.py — Tiempo de resolución de un capítulo dumanwu/yumanhua.
+
+Genera un HTML de capítulo con el mismo formato que sirven los sitios
+(p.a.c.k.e.r → base64(xor(base64(json), seed))) más varios literales base64
+señuelo, y mide decrypt_images() con:
+  - antes:  XOR por byte con generador, todas las semillas se descifran enteras
+  - ahora:  xorcrypt (XOR con int.from_bytes + descarte por prefijo)
+
+La semilla correcta es la última de la lista (peor caso del bucle).
+
+Uso:
+    python benchmarks/bench_xor.py
+    python benchmarks/bench_xor.py --pages 120 --rounds 10
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import random
+import re
+import sys
+import time
+
+_DL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "babylon_downloaders")
+if _DL_DIR not in sys.path:
+    sys.path.insert(0, _DL_DIR)
+
+import d_dumanwu  # noqa: E402
+import packer  # noqa: E402
+from bench_packer import reference_unpack  # noqa: E402
+from xorcrypt import xor_bytes  # noqa: E402
+
+
+# ── Referencia: bucle anterior ───────────────────────────────────────────────
+
+
+def _xor_ref(data: bytes, key: bytes) -> bytes:
+    return bytes(data[i] ^ key[i % len(key)] for i in range(len(data)))
+
+
+def reference_decrypt_images(html: str, seeds: list[bytes]) -> list[str]:
+    scripts = re.findall(r"<script[^>]*>(.*?)</script>", html, re.DOTALL | re.IGNORECASE)
+    for script in scripts:
+        if "eval(function(p,a,c,k,e,d)" not in script:
+            continue
+        decoded = reference_unpack(script)
+        if decoded is None:
+            continue
+        matches = re.findall(r'["\']([A-Za-z0-9+/]{100,})["\']', decoded)
+        for match_val in matches:
+            try:
+                raw = base64.b64decode(match_val + "=" * ((4 - len(match_val) % 4) % 4))
+            except Exception:
+                continue
+            for seed in seeds:
+                try:
+                    xored = _xor_ref(raw, seed)
+                    pad2 = (4 - len(xored) % 4) % 4
+                    final = base64.b64decode(xored + b"=="[:pad2]).decode(
+                        "utf-8", errors="ignore"
+                    )
+                except Exception:
+                    continue
+                if "http" not in final:
+                    continue
+                try:
+                    data = json.loads(final)
+                    if isinstance(data, list):
+                        urls = [str(u) for u in data if "http" in str(u)]
+                        if urls:
+                            return urls
+                except ValueError:
+                    pass
+    return []
+
+
+# ── Payload sintético ────────────────────────────────────────────────────────
+
+
+def _chapter_html(n_pages: int, seed: bytes, rnd: random.Random) -> tuple[str, list[str]]:
+    urls = [
+        f"https://p3-ecombdimg.example.com/tos-cn-i-{rnd.randrange(10**8):08d}/"
+        f"{rnd.getrandbits(128):032x}~tplv-resize:800:0.webp"
+        for _ in range(n_pages)
+    ]
+    inner = base64.b64encode(json.dumps(urls).encode())
+    secret = base64.b64encode(xor_bytes(inner, seed)).decode().rstrip("=")
+    decoys = [
+        base64.b64encode(rnd.randbytes(rnd.randrange(600, 2000))).decode().rstrip("=")
+        for _ in range(3)
+    ]
+    body = ";".join(f'var d{i}="{d}"' for i, d in enumerate(decoys))
+    # Palabras fuera de la symtab → el decodificador las deja intactas
+    p = f'{body};var _0="{secret}";'
+    packed = f"eval(function(p,a,c,k,e,d){{return p}}('{p}',62,1,'',0,{{}}))"
+    html = (
+        "<html><head><script>var x=1;</script></head><body>"
+        f"<script>{packed}</script></body></html>"
+    )
+    return html, urls
+
+
+def _time(fn, html: str, seeds: list[bytes], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        packer.clear_memo()  # sin memo: se mide el capítulo en frío
+        t0 = time.perf_counter()
+        fn(html, seeds)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    rounds = int(sys.argv[sys.argv.index("--rounds") + 1]) if "--rounds" in sys.argv else 5
+    pages = int(sys.argv[sys.argv.index("--pages") + 1]) if "--pages" in sys.argv else 0
+    rnd = random.Random(42)
+    seeds = [bytes.fromhex(h) for h in d_dumanwu._SEEDS_FALLBACK_HEX]
+
+    for n in [pages] if pages else [30, 80, 200]:
+        html, urls = _chapter_html(n, seeds[-1], rnd)
+        assert reference_decrypt_images(html, seeds) == urls
+        assert d_dumanwu.decrypt_images(html, seeds) == urls
+        t_ref = _time(reference_decrypt_images, html, seeds, rounds)
+        t_new = _time(d_dumanwu.decrypt_images, html, seeds, rounds)
+        print(
+            f"capítulo {n:4d} págs  ({len(html) / 1024:6.1f}KB html)  "
+            f"antes={t_ref * 1000:8.2f}ms  ahora={t_new * 1000:7.2f}ms  "
+            f"speedup={t_ref / t_new:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+capture_fixtures.py — Guarda páginas reales para bench_parsers.py.
+
+Descarga con la sesión y las cabeceras de cada downloader y deja el HTML
+tal cual en benchmarks/fixtures/<caso>/*.html:
+
+  - 18mh_cards         secciones del catálogo de 18mh (páginas 1 y 2)
+  - baozimh_chapters   fichas de baozimh (slugs por argumento: sin ellos
+                       el caso se salta)
+  - wfwf_series        portada y categorías de webtoon de wfwf
+  - mangafox_list      páginas del directorio de fanfox
+
+Si una página no se puede bajar se avisa y se sigue con las demás; lo que
+ya esté en la carpeta no se borra.
+
+Uso:
+    python benchmarks/capture_fixtures.py
+    python benchmarks/capture_fixtures.py --baozimh slug1 slug2 ...
+    python benchmarks/capture_fixtures.py --only mangafox_list
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_DL_DIR = os.path.join(os.path.dirname(_HERE), "babylon_downloaders")
+if _DL_DIR not in sys.path:
+    sys.path.insert(0, _DL_DIR)
+
+import d_18mh  # noqa: E402
+import d_baozimh  # noqa: E402
+import d_mangafox  # noqa: E402
+import d_wfwf  # noqa: E402
+
+FIXTURES_DIR = os.path.join(_HERE, "fixtures")
+PAGES = (1, 2)
+MANGAFOX_PAGES = (1, 2, 3, 4, 5)
+WFWF_CATS = 4
+
+
+def _save(case: str, name: str, html: str | None) -> bool:
+    if not html:
+        print(f"  {case}/{name}: sin respuesta")
+        return False
+    folder = os.path.join(FIXTURES_DIR, case)
+    os.makedirs(folder, exist_ok=True)
+    safe = re.sub(r"[^\w\-]+", "_", name).strip("_") or "page"
+    path = os.path.join(folder, f"{safe}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"  {case}/{safe}.html: {len(html) // 1024}KB")
+    return True
+
+
+# ── Casos ────────────────────────────────────────────────────────────────────
+
+
+def _capture_18mh(_args: list[str]) -> int:
+    sess = d_18mh._make_session()
+    n = 0
+    for section in d_18mh.Downloader18mh.CATALOG_SECTIONS:
+        for page in PAGES:
+            url = f"{d_18mh.SITE_URL}/{section}"
+            if page > 1:
+                url += f"?page={page}"
+            n += _save("18mh_cards", f"{section}_{page}", d_18mh._fetch_html(sess, url))
+    return n
+
+
+def _capture_baozimh(args: list[str]) -> int:
+    if not args:
+        print("  sin slugs: usa --baozimh slug1 slug2 ...")
+        return 0
+    n = 0
+    for slug in args:
+        html = None
+        for mirror in d_baozimh.COM_MIRRORS:
+            sess = d_baozimh._make_session(mirror)
+            raw = d_baozimh._get_raw(sess, f"{mirror}/comic/{slug}", mirror + "/")
+            if raw:
+                html = raw.decode("utf-8", errors="replace")
+                break
+        n += _save("baozimh_chapters", slug, html)
+    return n
+
+
+def _capture_wfwf(_args: list[str]) -> int:
+    sess = d_wfwf._make_session()  # fija d_wfwf.BASE_URL al dominio vivo
+    main = d_wfwf.Mode(d_wfwf.Mode.WEBTOON).main_path
+    cats = [""] + d_wfwf._WEBTOON_CATS[:WFWF_CATS]
+    n = 0
+    for i, cat in enumerate(cats):
+        html = d_wfwf._fetch_html(sess, f"{d_wfwf.BASE_URL}{main}{cat}")
+        n += _save("wfwf_series", f"webtoon_{i}", html)
+    return n
+
+
+def _capture_mangafox(_args: list[str]) -> int:
+    sess = d_mangafox._make_session()
+    n = 0
+    for page in MANGAFOX_PAGES:
+        html = d_mangafox._fetch_html(sess, f"{d_mangafox.BASE_URL}/directory/{page}.html")
+        n += _save("mangafox_list", f"directory_{page}", html)
+    return n
+
+
+CASES = {
+    "18mh_cards": _capture_18mh,
+    "baozimh_chapters": _capture_baozimh,
+    "wfwf_series": _capture_wfwf,
+    "mangafox_list": _capture_mangafox,
+}
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    only = None
+    if "--only" in argv:
+        i = argv.index("--only")
+        only = argv[i + 1]
+        del argv[i : i + 2]
+        if only not in CASES:
+            sys.exit(f"caso desconocido: {only} (hay {', '.join(CASES)})")
+    slugs: list[str] = []
+    if "--baozimh" in argv:
+        i = argv.index("--baozimh")
+        slugs = argv[i + 1 :]
+        del argv[i:]
+
+    total = 0
+    for name, capture in CASES.items():
+        if only and name != only:
+            continue
+        print(name)
+        total += capture(slugs if name == "baozimh_chapters" else [])
+    print(f"{total} páginas guardadas en {FIXTURES_DIR}")
+    if not total:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()